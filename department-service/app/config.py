@@ -14,16 +14,43 @@ class Settings(BaseSettings):
         "MONGODB_URI", "mongodb://localhost:27017/as-local-department"
     )
     database_name: Optional[str] = os.getenv("DATABASE_NAME")
+    mongodb_ensure_indexes: bool = os.getenv("MONGODB_ENSURE_INDEXES", "true").lower() == "true"
     jwt_secret: str = os.getenv("JWT_SECRET", "your-secret-key-change-in-production")
     jwt_expires_in: str = os.getenv("JWT_EXPIRES_IN", "24h")
     admin_reg_number: str = os.getenv("ADMIN_REG_NUMBER", "admin")
     app_env: str = os.getenv("APP_ENV", "development")
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
     redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    redis_max_connections: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+    redis_socket_timeout: float = float(os.getenv("REDIS_SOCKET_TIMEOUT", "5"))
+    cache_local_max_entries: int = int(os.getenv("CACHE_LOCAL_MAX_ENTRIES", "1000"))
+    cache_local_max_bytes: int = int(os.getenv("CACHE_LOCAL_MAX_BYTES", str(32 * 1024 * 1024)))
+    cache_local_ttl_ms: int = int(os.getenv("CACHE_LOCAL_TTL_MS", "2000"))
+    cache_stale_ttl_ms: int = int(os.getenv("CACHE_STALE_TTL_MS", "10000"))
+    cache_ttl_jitter: float = float(os.getenv("CACHE_TTL_JITTER", "0.1"))
+    cache_lock_ttl_ms: int = int(os.getenv("CACHE_LOCK_TTL_MS", "0"))
+    cache_lock_wait_ms: int = int(os.getenv("CACHE_LOCK_WAIT_MS", "2000"))
+    etag_max_age_ms: int = int(os.getenv("ETAG_MAX_AGE_MS", "60000"))
+    cache_codec: str = os.getenv("CACHE_CODEC", "orjson")
+    cache_compression_threshold: int = int(os.getenv("CACHE_COMPRESSION_THRESHOLD", "16384"))
+    cache_compression_level: int = int(os.getenv("CACHE_COMPRESSION_LEVEL", "3"))
+    cache_invalidation_channel: str = os.getenv(
+        "CACHE_INVALIDATION_CHANNEL", "department-service:cache-invalidate"
+    )
+    event_bus_backend: str = os.getenv("EVENT_BUS_BACKEND", "redis")
+    event_bus_channel: str = os.getenv("EVENT_BUS_CHANNEL", "annual-sports:events")
 
     event_configuration_url: str = os.getenv("EVENT_CONFIGURATION_URL", "").rstrip("/")
     identity_url: str = os.getenv("IDENTITY_URL", "").rstrip("/")
 
+    http_max_connections: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    http_max_keepalive_connections: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    http_keepalive_expiry: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    http_timeout: float = float(os.getenv("HTTP_TIMEOUT", "30"))
+    http_connect_timeout: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    http_upstream_timeouts: str = os.getenv("HTTP_UPSTREAM_TIMEOUTS", "")
+    http_http2: bool = os.getenv("HTTP_HTTP2", "false").lower() == "true"
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
     @model_validator(mode="after")
@@ -1,4 +1,5 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, IndexModel
 
 from .config import get_settings
 
@@ -10,3 +11,11 @@ db = client[settings.database_name]
 
 def departments_collection():
     return db["departments"]
+
+
+INDEXES = {
+    "departments": [
+        IndexModel([("name", ASCENDING)], name="name_unique", unique=True),
+        IndexModel([("display_order", ASCENDING), ("name", ASCENDING)], name="display_order_name"),
+    ],
+}
@@ -1,11 +1,10 @@
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-
-import httpx
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from .cache import cache
 from .config import get_settings
+from .http_client import request_json, stream_ndjson
 
 
 logger = logging.getLogger("department-service.external")
@@ -22,12 +21,11 @@ async def _get_json(
     url: str,
     params: Optional[Dict[str, Any]] = None,
     token: str = "",
-    timeout: float = 30.0,
+    timeout: Optional[float] = None,
 ) -> Any:
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        response = await client.get(url, params=params, headers=_auth_headers(token))
-        response.raise_for_status()
-        return response.json()
+    return await request_json(
+        "GET", url, params=params, headers=_auth_headers(token), timeout=timeout
+    )
 
 
 def _parse_date(value: Any) -> Optional[datetime]:
@@ -55,11 +53,11 @@ def should_event_year_be_active(event_year_doc: Dict[str, Any]) -> bool:
 
 
 async def get_active_event_year() -> Optional[Dict[str, Any]]:
-    cached = cache.get("/event-configurations/event-years/active")
+    cached = await cache.get("/event-configurations/event-years/active")
     if cached and should_event_year_be_active(cached):
         return cached
     if cached:
-        cache.clear("/event-configurations/event-years/active")
+        await cache.clear("/event-configurations/event-years/active")
     if not settings.event_configuration_url:
         return None
     data = await _get_json(
@@ -67,7 +65,7 @@ async def get_active_event_year() -> Optional[Dict[str, Any]]:
     )
     event_year = data.get("eventYear")
     if event_year:
-        cache.set("/event-configurations/event-years/active", event_year)
+        await cache.set("/event-configurations/event-years/active", event_year)
     return event_year
 
 
@@ -120,14 +118,15 @@ async def get_event_year(
     )
 
 
-async def fetch_players(token: str = "") -> List[Dict[str, Any]]:
+async def iter_players(token: str = "") -> AsyncIterator[Dict[str, Any]]:
     if not settings.identity_url:
         raise RuntimeError("IDENTITY_URL is not configured")
-    data = await _get_json(
+    async for player in stream_ndjson(
         f"{settings.identity_url}/identities/players",
-        token=token,
-    )
-    return data.get("players", [])
+        params={"format": "ndjson"},
+        headers=_auth_headers(token),
+    ):
+        yield player
 
 
 async def get_identity_profile(token: str) -> Dict[str, Any]:
@@ -0,0 +1,149 @@
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from .config import get_settings
+
+
+logger = logging.getLogger("department-service.http-client")
+settings = get_settings()
+
+
+def _parse_upstream_timeouts(value: str) -> Dict[str, float]:
+    timeouts: Dict[str, float] = {}
+    for item in (value or "").split(","):
+        host, _, seconds = item.partition("=")
+        if not host.strip() or not seconds.strip():
+            continue
+        try:
+            timeouts[host.strip().lower()] = float(seconds)
+        except ValueError:
+            logger.warning("Ignoring invalid upstream timeout entry: %s", item)
+    return timeouts
+
+
+UPSTREAM_TIMEOUTS = _parse_upstream_timeouts(settings.http_upstream_timeouts)
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _upstream_host(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+def _build_client(host: str) -> httpx.AsyncClient:
+    timeout = httpx.Timeout(
+        UPSTREAM_TIMEOUTS.get(host, settings.http_timeout),
+        connect=settings.http_connect_timeout,
+    )
+    limits = httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry,
+    )
+    return httpx.AsyncClient(timeout=timeout, limits=limits, http2=settings.http_http2)
+
+
+def get_http_client(url: str) -> httpx.AsyncClient:
+    host = _upstream_host(url)
+    client = _clients.get(host)
+    if client is None or client.is_closed:
+        client = _build_client(host)
+        _clients[host] = client
+        _stats.setdefault(host, {"requests": 0, "errors": 0, "in_flight": 0})
+    return client
+
+
+async def request_json(
+    method: str,
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    json: Optional[Any] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> Any:
+    client = get_http_client(url)
+    stats = _stats[_upstream_host(url)]
+    stats["requests"] += 1
+    stats["in_flight"] += 1
+    try:
+        response = await client.request(
+            method,
+            url,
+            params=params,
+            json=json,
+            headers=headers,
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+        )
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPError:
+        stats["errors"] += 1
+        raise
+    finally:
+        stats["in_flight"] -= 1
+
+
+async def stream_ndjson(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> AsyncIterator[Any]:
+    client = get_http_client(url)
+    stats = _stats[_upstream_host(url)]
+    stats["requests"] += 1
+    stats["in_flight"] += 1
+    try:
+        async with client.stream(
+            "GET",
+            url,
+            params=params,
+            headers={**(headers or {}), "Accept": "application/x-ndjson"},
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line.strip():
+                    yield json.loads(line)
+    except httpx.HTTPError:
+        stats["errors"] += 1
+        raise
+    finally:
+        stats["in_flight"] -= 1
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    pools: Dict[str, Dict[str, Any]] = {}
+    for host, client in _clients.items():
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = 0
+        for connection in connections:
+            try:
+                if connection.is_idle():
+                    idle += 1
+            except Exception:
+                continue
+        pools[host] = {
+            **_stats.get(host, {}),
+            "connections": len(connections),
+            "idle_connections": idle,
+            "max_connections": settings.http_max_connections,
+            "max_keepalive_connections": settings.http_max_keepalive_connections,
+            "closed": client.is_closed,
+        }
+    return pools
+
+
+async def close_http_clients() -> None:
+    for host, client in list(_clients.items()):
+        try:
+            await client.aclose()
+        except Exception as exc:
+            logger.warning("Error closing HTTP client for %s: %s", host, exc)
+    _clients.clear()
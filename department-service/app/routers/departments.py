@@ -1,6 +1,6 @@
 import logging
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Optional
 
 from bson import ObjectId
 from bson.errors import InvalidId
@@ -10,7 +10,9 @@ from ..auth import admin_dependency, auth_dependency
 from ..cache import cache
 from ..db import departments_collection
 from ..errors import handle_not_found_error, send_error_response, send_success_response
-from ..external_services import fetch_players
+from ..event_bus import DEPARTMENT_CHANGED, event_bus
+from ..external_services import iter_players
+from ..http_cache import conditional_etag, with_etag
 from ..validators import normalize_department_code, normalize_department_name, trim_object_fields
 
 
@@ -48,9 +50,9 @@ def _serialize_department(department: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def _count_players_by_department(players: List[Dict[str, Any]]) -> Dict[str, int]:
+async def _count_players_by_department(players: AsyncIterator[Dict[str, Any]]) -> Dict[str, int]:
     counts: Dict[str, int] = {}
-    for player in players:
+    async for player in players:
         department = player.get("department_branch")
         if not department:
             continue
@@ -66,27 +68,16 @@ def _get_request_token(request: Request) -> str:
     return ""
 
 
-@router.get("")
-@router.get("/")
-async def get_departments(request: Request):
-    cached = cache.get("/departments")
-    if cached:
-        return send_success_response(cached)
-
+async def _load_departments(token: str) -> Optional[Dict[str, Any]]:
     cursor = departments_collection().find({}).sort([("display_order", 1), ("name", 1)])
     departments = await cursor.to_list(length=None)
 
-    token = _get_request_token(request)
     if token:
         try:
-            players = await fetch_players(token=token)
+            counts = await _count_players_by_department(iter_players(token=token))
         except Exception as exc:
             logger.exception("Failed to fetch players for department counts: %s", exc)
-            return send_error_response(
-                500,
-                "Failed to fetch department player counts. Please try again.",
-            )
-        counts = _count_players_by_department(players)
+            return None
     else:
         counts = {}
 
@@ -96,9 +87,23 @@ async def get_departments(request: Request):
         serialized["player_count"] = counts.get(serialized.get("name"), 0)
         departments_with_counts.append(serialized)
 
-    result = {"departments": departments_with_counts}
-    cache.set("/departments", result)
-    return send_success_response(result)
+    return {"departments": departments_with_counts}
+
+
+@router.get("")
+@router.get("/")
+async def get_departments(request: Request):
+    token = _get_request_token(request)
+    etag, not_modified = await conditional_etag(request, "/departments")
+    if not_modified is not None:
+        return not_modified
+    result = await cache.get_or_load("/departments", lambda: _load_departments(token))
+    if result is None:
+        return send_error_response(
+            500,
+            "Failed to fetch department player counts. Please try again.",
+        )
+    return with_etag(send_success_response(result), etag)
 
 
 @router.post("")
@@ -143,7 +148,8 @@ async def create_department(
     insert_result = await departments_collection().insert_one(department_doc)
     department_doc["_id"] = insert_result.inserted_id
 
-    cache.clear("/departments")
+    await cache.clear("/departments")
+    await event_bus.publish(DEPARTMENT_CHANGED)
 
     return send_success_response(
         _serialize_department(department_doc),
@@ -193,7 +199,8 @@ async def update_department(
     await departments_collection().update_one({"_id": object_id}, {"$set": update_fields})
     updated = await departments_collection().find_one({"_id": object_id})
 
-    cache.clear("/departments")
+    await cache.clear("/departments")
+    await event_bus.publish(DEPARTMENT_CHANGED)
 
     return send_success_response(
         _serialize_department(updated),
@@ -218,12 +225,11 @@ async def delete_department(
 
     try:
         token = _get_request_token(request)
-        players = await fetch_players(token=token)
+        counts = await _count_players_by_department(iter_players(token=token))
     except Exception as exc:
         logger.exception("Failed to fetch players for department delete: %s", exc)
         return send_error_response(500, "Failed to fetch department player counts. Please try again.")
 
-    counts = _count_players_by_department(players)
     players_count = counts.get(department.get("name"), 0)
     if players_count > 0:
         return send_error_response(
@@ -233,6 +239,7 @@ async def delete_department(
 
     await departments_collection().delete_one({"_id": object_id})
 
-    cache.clear("/departments")
+    await cache.clear("/departments")
+    await event_bus.publish(DEPARTMENT_CHANGED)
 
     return send_success_response({}, "Department deleted successfully")
@@ -1,14 +1,28 @@
-import pickle
-from typing import Any, Dict, Optional
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import struct
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+from urllib.parse import parse_qs
+from uuid import uuid4
 
-from redis import Redis
+from redis.asyncio import BlockingConnectionPool, Redis
 from redis.exceptions import RedisError
 
+from .cache_codec import CacheCodec
 from .config import get_settings
 
 
+logger = logging.getLogger("enrollment-service.cache")
+
+
 CACHE_TTL: Dict[str, int] = {
     "/departments": 10000,
+    "/enrollments/batches": 10000,
     "/event-configurations/event-years/active": 10000,
     "/sports-participations/sports": 10000,
     "/sports-participations/sports-counts": 10000,
@@ -16,48 +30,423 @@ CACHE_TTL: Dict[str, int] = {
 }
 
 
+TAG_KEY_PREFIX = "tag:"
+VERSION_KEY_PREFIX = "ver:"
+EPOCH_KEY = "ver:epoch"
+LOCK_KEY_PREFIX = "lock:"
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+ENTRY_HEADER = struct.Struct(">d")
+
+
+def cache_tags(url: str) -> Set[str]:
+    path, _, query = url.partition("?")
+    parts = path.split("/")
+    tags = {"/".join(parts[:index]) for index in range(2, len(parts) + 1)}
+    event_ids = parse_qs(query).get("event_id")
+    if event_ids:
+        tags |= {event_tag(tag, event_ids[0]) for tag in list(tags)}
+    return tags
+
+
+def event_tag(path: str, event_id: Any) -> str:
+    return f"{path}?event_id={event_id}"
+
+
+def version_tag(url: str) -> str:
+    path, _, query = url.partition("?")
+    event_ids = parse_qs(query).get("event_id")
+    return event_tag(path, event_ids[0]) if event_ids else path
+
+
+class LocalCache:
+    def __init__(self, max_entries: int, max_bytes: int, ttl_ms: int) -> None:
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl_ms = ttl_ms
+        self._bytes = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at <= time.monotonic():
+            self.pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return payload
+
+    def set(self, key: str, payload: bytes, ttl_ms: int) -> None:
+        self.pop(key)
+        if self._max_entries <= 0 or len(payload) > self._max_bytes:
+            return
+        expires_at = time.monotonic() + min(ttl_ms, self._ttl_ms) / 1000
+        self._entries[key] = (expires_at, payload)
+        self._bytes += len(payload)
+        while self._entries and (
+            len(self._entries) > self._max_entries or self._bytes > self._max_bytes
+        ):
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+    def pop_tagged(self, tags: Set[str]) -> None:
+        for key in [key for key in self._entries if not tags.isdisjoint(cache_tags(key))]:
+            self.pop(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self._max_entries,
+            "max_bytes": self._max_bytes,
+            "evictions": self.evictions,
+        }
+
+
 class RedisCache:
-    def __init__(self, redis_url: str) -> None:
-        self._client = Redis.from_url(redis_url, decode_responses=False)
+    def __init__(
+        self,
+        redis_url: str,
+        max_connections: int,
+        socket_timeout: float,
+        local: LocalCache,
+        invalidation_channel: str,
+        codec: CacheCodec,
+        stale_ttl_ms: int,
+        ttl_jitter: float,
+        lock_ttl_ms: int,
+        lock_wait_ms: int,
+        etag_max_age_ms: int,
+    ) -> None:
+        self._pool = BlockingConnectionPool.from_url(
+            redis_url,
+            max_connections=max_connections,
+            timeout=socket_timeout,
+            socket_timeout=socket_timeout,
+            socket_connect_timeout=socket_timeout,
+            decode_responses=False,
+        )
+        self._client = Redis(connection_pool=self._pool)
+        self._local = local
+        self._codec = codec
+        self._stale_ttl_ms = stale_ttl_ms
+        self._ttl_jitter = ttl_jitter
+        self._lock_ttl_ms = lock_ttl_ms
+        self._lock_wait_ms = lock_wait_ms
+        self._etag_max_age_ms = etag_max_age_ms
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._channel = invalidation_channel
+        self._instance_id = uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        self._stats: Dict[str, int] = {
+            "l1_hits": 0,
+            "l1_misses": 0,
+            "l2_hits": 0,
+            "l2_misses": 0,
+            "stale_hits": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "coalesced": 0,
+            "lock_waits": 0,
+        }
 
     def _ttl_ms(self, url: str) -> int:
-        return CACHE_TTL.get(url, CACHE_TTL["default"])
+        parts = url.partition("?")[0].split("/")
+        for index in range(len(parts), 1, -1):
+            ttl_ms = CACHE_TTL.get("/".join(parts[:index]))
+            if ttl_ms is not None:
+                return ttl_ms
+        return CACHE_TTL["default"]
 
-    def get(self, url: str) -> Optional[Any]:
+    async def _read(self, url: str) -> Optional[Tuple[float, Any]]:
+        payload = self._local.get(url)
+        if payload is not None:
+            self._stats["l1_hits"] += 1
+        else:
+            self._stats["l1_misses"] += 1
+            try:
+                async with self._client.pipeline(transaction=False) as pipe:
+                    pipe.get(url)
+                    pipe.pttl(url)
+                    payload, remaining_ms = await pipe.execute()
+            except RedisError:
+                return None
+            if payload is None:
+                self._stats["l2_misses"] += 1
+                return None
+            self._stats["l2_hits"] += 1
+            if remaining_ms > 0:
+                self._local.set(url, payload, remaining_ms)
         try:
-            data = self._client.get(url)
-        except RedisError:
+            (soft_expires_at,) = ENTRY_HEADER.unpack_from(payload)
+            return soft_expires_at, self._codec.decode(payload[ENTRY_HEADER.size :])
+        except Exception:
+            self._local.pop(url)
             return None
-        if data is None:
+
+    async def get(self, url: str) -> Optional[Any]:
+        entry = await self._read(url)
+        if entry is None or entry[0] <= time.time():
             return None
+        return entry[1]
+
+    async def get_or_load(self, url: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = await self._read(url)
+        if entry is not None:
+            soft_expires_at, data = entry
+            if soft_expires_at <= time.time():
+                self._stats["stale_hits"] += 1
+                if url not in self._refreshing:
+                    self._refreshing[url] = asyncio.create_task(self._refresh(url, loader))
+            return data
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.create_task(self._load(url, loader))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+        else:
+            self._stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    async def _load(self, url: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        lock_token: Optional[str] = None
+        if self._lock_ttl_ms > 0:
+            lock_token = uuid4().hex
+            try:
+                acquired = await self._client.set(
+                    LOCK_KEY_PREFIX + url, lock_token, nx=True, px=self._lock_ttl_ms
+                )
+            except RedisError:
+                acquired = True
+            if not acquired:
+                lock_token = None
+                self._stats["lock_waits"] += 1
+                data = await self._wait_for_fill(url)
+                if data is not None:
+                    return data
         try:
-            return pickle.loads(data)
-        except Exception:
+            data = await loader()
+            if data is not None:
+                await self.set(url, data)
+            return data
+        finally:
+            if lock_token is not None:
+                try:
+                    await self._client.eval(RELEASE_LOCK_SCRIPT, 1, LOCK_KEY_PREFIX + url, lock_token)
+                except RedisError:
+                    pass
+
+    async def _wait_for_fill(self, url: str) -> Optional[Any]:
+        deadline = time.monotonic() + self._lock_wait_ms / 1000
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            self._local.pop(url)
+            data = await self.get(url)
+            if data is not None:
+                return data
+        return None
+
+    async def _refresh(self, url: str, loader: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await self._load(url, loader)
+            self._stats["refreshes"] += 1
+        except Exception as exc:
+            self._stats["refresh_errors"] += 1
+            logger.warning("Background refresh of %s failed: %s", url, exc)
+        finally:
+            self._refreshing.pop(url, None)
+
+    async def set(self, url: str, data: Any) -> None:
+        ttl_ms = self._ttl_ms(url)
+        ttl_ms += random.randint(0, int(ttl_ms * self._ttl_jitter))
+        hard_ttl_ms = ttl_ms + self._stale_ttl_ms
+        try:
+            payload = ENTRY_HEADER.pack(time.time() + ttl_ms / 1000) + self._codec.encode(data)
+        except Exception as exc:
+            logger.warning("Failed to encode cache value for %s: %s", url, exc)
+            return None
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                pipe.set(url, payload, px=hard_ttl_ms)
+                for tag in cache_tags(url):
+                    tag_key = TAG_KEY_PREFIX + tag
+                    pipe.sadd(tag_key, url)
+                    pipe.pexpire(tag_key, hard_ttl_ms, nx=True)
+                    pipe.pexpire(tag_key, hard_ttl_ms, gt=True)
+                await pipe.execute()
+        except RedisError:
             return None
+        self._local.set(url, payload, hard_ttl_ms)
 
-    def set(self, url: str, data: Any) -> None:
+    async def clear(self, url: Optional[str] = None) -> None:
+        if url:
+            self._local.pop(url)
+        else:
+            self._local.clear()
         try:
-            payload = pickle.dumps(data)
-            self._client.set(url, payload, px=self._ttl_ms(url))
+            async with self._client.pipeline(transaction=True) as pipe:
+                if url:
+                    pipe.delete(url)
+                    pipe.incr(VERSION_KEY_PREFIX + version_tag(url))
+                else:
+                    pipe.flushdb()
+                    pipe.set(EPOCH_KEY, uuid4().hex)
+                await pipe.execute()
         except RedisError:
             return None
+        await self._publish_invalidation("key" if url else "flush", url)
 
-    def clear(self, url: Optional[str] = None) -> None:
+    async def invalidate_tags(self, *tags: str) -> None:
+        tag_set = set(tags)
+        if not tag_set:
+            return None
+        self._local.pop_tagged(tag_set)
+        tag_keys = [TAG_KEY_PREFIX + tag for tag in tag_set]
         try:
-            if url:
-                self._client.delete(url)
-            else:
-                self._client.flushdb()
+            async with self._client.pipeline(transaction=True) as pipe:
+                for tag_key in tag_keys:
+                    pipe.smembers(tag_key)
+                pipe.unlink(*tag_keys)
+                for tag in tag_set:
+                    pipe.incr(VERSION_KEY_PREFIX + tag)
+                results = await pipe.execute()
+            keys: Set[bytes] = set()
+            for members in results[: len(tag_keys)]:
+                keys.update(members)
+            if keys:
+                await self._client.unlink(*keys)
         except RedisError:
             return None
+        await self._publish_invalidation("tags", sorted(tag_set))
 
-    def clear_pattern(self, pattern: str) -> None:
+    async def etag(self, url: str) -> Optional[str]:
+        version_keys = [VERSION_KEY_PREFIX + tag for tag in sorted(cache_tags(url))]
         try:
-            for key in self._client.scan_iter(match=f"*{pattern}*"):
-                self._client.delete(key)
+            versions = await self._client.mget(EPOCH_KEY, *version_keys)
         except RedisError:
             return None
+        if versions[0] is None:
+            return None
+        max_age_ms = self._ttl_ms(url)
+        if self._etag_max_age_ms > 0:
+            max_age_ms = min(max_age_ms, self._etag_max_age_ms)
+        window = int(time.time() * 1000 // max_age_ms)
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(url.encode())
+        for version in versions:
+            digest.update(b"|" + (version or b"0"))
+        digest.update(f"|{window}".encode())
+        return f'"{digest.hexdigest()}"'
+
+    async def _publish_invalidation(self, op: str, value: Optional[Any]) -> None:
+        message = json.dumps({"op": op, "value": value, "origin": self._instance_id})
+        try:
+            await self._client.publish(self._channel, message)
+        except RedisError as exc:
+            logger.warning("Failed to publish cache invalidation: %s", exc)
+
+    def _apply_invalidation(self, data: Any) -> None:
+        try:
+            message = json.loads(data)
+        except Exception:
+            return
+        if message.get("origin") == self._instance_id:
+            return
+        op = message.get("op")
+        value = message.get("value")
+        if op == "key" and value:
+            self._local.pop(value)
+        elif op == "tags" and value:
+            self._local.pop_tagged(set(value))
+        else:
+            self._local.clear()
+
+    async def _ensure_epoch(self) -> None:
+        try:
+            await self._client.set(EPOCH_KEY, uuid4().hex, nx=True)
+        except RedisError as exc:
+            logger.warning("Failed to set cache epoch: %s", exc)
+
+    async def _listen_for_invalidations(self) -> None:
+        while True:
+            pubsub = self._client.pubsub()
+            try:
+                await pubsub.subscribe(self._channel)
+                self._local.clear()
+                await self._ensure_epoch()
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._apply_invalidation(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Cache invalidation listener disconnected: %s", exc)
+                self._local.clear()
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen_for_invalidations())
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "l1": self._local.stats()}
+
+    async def close(self) -> None:
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self._client.aclose()
+        await self._pool.disconnect()
 
 
 settings = get_settings()
-cache = RedisCache(settings.redis_url)
+cache = RedisCache(
+    settings.redis_url,
+    settings.redis_max_connections,
+    settings.redis_socket_timeout,
+    LocalCache(
+        settings.cache_local_max_entries,
+        settings.cache_local_max_bytes,
+        settings.cache_local_ttl_ms,
+    ),
+    settings.cache_invalidation_channel,
+    CacheCodec(
+        settings.cache_codec,
+        settings.cache_compression_threshold,
+        settings.cache_compression_level,
+    ),
+    settings.cache_stale_ttl_ms,
+    settings.cache_ttl_jitter,
+    settings.cache_lock_ttl_ms,
+    settings.cache_lock_wait_ms,
+    settings.etag_max_age_ms,
+)
@@ -0,0 +1,12 @@
+from typing import Any, Dict
+
+from .cache import cache
+from .event_bus import EVENT_YEAR_CHANGED, event_bus
+
+
+async def _evict_active_event_year(_: Dict[str, Any]) -> None:
+    await cache.clear("/event-configurations/event-years/active")
+
+
+def register_cache_event_handlers() -> None:
+    event_bus.subscribe(EVENT_YEAR_CHANGED, _evict_active_event_year)
@@ -1,4 +1,5 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, IndexModel
 
 from .config import get_settings
 
@@ -10,3 +11,15 @@ db = client[settings.database_name]
 
 def batches_collection():
     return db["batches"]
+
+
+INDEXES = {
+    "batches": [
+        IndexModel(
+            [("event_id", ASCENDING), ("name", ASCENDING)],
+            name="event_id_name_unique",
+            unique=True,
+        ),
+        IndexModel([("event_id", ASCENDING), ("players", ASCENDING)], name="event_id_players"),
+    ],
+}
@@ -2,10 +2,9 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-import httpx
-
 from .cache import cache
 from .config import get_settings
+from .http_client import request_json
 
 
 logger = logging.getLogger("enrollment-service.external")
@@ -22,12 +21,11 @@ async def _get_json(
     url: str,
     params: Optional[Dict[str, Any]] = None,
     token: str = "",
-    timeout: float = 30.0,
+    timeout: Optional[float] = None,
 ) -> Any:
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        response = await client.get(url, params=params, headers=_auth_headers(token))
-        response.raise_for_status()
-        return response.json()
+    return await request_json(
+        "GET", url, params=params, headers=_auth_headers(token), timeout=timeout
+    )
 
 
 def _parse_date(value: Any) -> Optional[datetime]:
@@ -55,11 +53,11 @@ def should_event_year_be_active(event_year_doc: Dict[str, Any]) -> bool:
 
 
 async def get_active_event_year() -> Optional[Dict[str, Any]]:
-    cached = cache.get("/event-configurations/event-years/active")
+    cached = await cache.get("/event-configurations/event-years/active")
     if cached and should_event_year_be_active(cached):
         return cached
     if cached:
-        cache.clear("/event-configurations/event-years/active")
+        await cache.clear("/event-configurations/event-years/active")
     if not settings.event_configuration_url:
         return None
     data = await _get_json(
@@ -67,7 +65,7 @@ async def get_active_event_year() -> Optional[Dict[str, Any]]:
     )
     event_year = data.get("eventYear")
     if event_year:
-        cache.set("/event-configurations/event-years/active", event_year)
+        await cache.set("/event-configurations/event-years/active", event_year)
     return event_year
 
 
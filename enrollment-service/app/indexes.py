@@ -0,0 +1,94 @@
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from typing import Any, Dict, List
+
+from pymongo.errors import OperationFailure
+
+from .db import INDEXES, db
+
+
+logger = logging.getLogger("enrollment-service.indexes")
+
+
+def _normalize_key(key: Any) -> List[List[Any]]:
+    items = key.items() if hasattr(key, "items") else key
+    return [
+        [field, int(direction) if isinstance(direction, (int, float)) else direction]
+        for field, direction in items
+    ]
+
+
+async def ensure_indexes() -> Dict[str, List[str]]:
+    created: Dict[str, List[str]] = {}
+    for collection_name, models in INDEXES.items():
+        for model in models:
+            try:
+                names = await db[collection_name].create_indexes([model])
+            except OperationFailure as exc:
+                logger.error(
+                    "Failed to build index %s on %s: %s",
+                    model.document["name"],
+                    collection_name,
+                    exc,
+                )
+                continue
+            created.setdefault(collection_name, []).extend(names)
+    return created
+
+
+async def _index_usage(collection_name: str) -> Dict[str, int]:
+    try:
+        stats = await db[collection_name].aggregate([{"$indexStats": {}}]).to_list(length=None)
+    except OperationFailure as exc:
+        logger.warning("Index usage unavailable for %s: %s", collection_name, exc)
+        return {}
+    return {stat.get("name"): int((stat.get("accesses") or {}).get("ops", 0)) for stat in stats}
+
+
+async def index_report() -> Dict[str, Any]:
+    report: Dict[str, Any] = {}
+    for collection_name, models in INDEXES.items():
+        existing = await db[collection_name].index_information()
+        declared = {model.document["name"]: model for model in models}
+        missing = [
+            name
+            for name, model in declared.items()
+            if name not in existing
+            or _normalize_key(existing[name].get("key", [])) != _normalize_key(model.document["key"])
+            or bool(existing[name].get("unique")) != bool(model.document.get("unique"))
+        ]
+        undeclared = sorted(name for name in existing if name not in declared and name != "_id_")
+        usage = await _index_usage(collection_name)
+        unused = sorted(name for name, ops in usage.items() if ops == 0 and name != "_id_")
+        report[collection_name] = {
+            "missing": missing,
+            "undeclared": undeclared,
+            "unused": unused,
+            "usage": usage,
+        }
+    return report
+
+
+async def _run(command: str) -> int:
+    if command == "build":
+        created = await ensure_indexes()
+        print(json.dumps({"created": created}, indent=2))
+    report = await index_report()
+    print(json.dumps(report, indent=2))
+    if command == "verify" and any(entry["missing"] for entry in report.values()):
+        return 1
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build and verify MongoDB indexes")
+    parser.add_argument("command", choices=["build", "verify", "report"])
+    args = parser.parse_args()
+    sys.exit(asyncio.run(_run(args.command)))
+
+
+if __name__ == "__main__":
+    main()
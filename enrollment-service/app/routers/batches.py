@@ -3,13 +3,16 @@ from typing import Any, Dict, List
 from urllib.parse import quote
 
 from fastapi import APIRouter, Depends, Request
+from pymongo import UpdateOne
 
 from ..auth import admin_dependency, auth_dependency
 from ..cache import cache
 from ..date_restrictions import require_registration_period
 from ..db import batches_collection
 from ..errors import handle_not_found_error, send_error_response, send_success_response
+from ..event_bus import BATCH_CHANGED, event_bus
 from ..external_services import get_event_year
+from ..http_cache import conditional_etag, with_etag
 from ..validators import trim_object_fields, validate_batch_assignment
 
 
@@ -55,6 +58,23 @@ def _validate_bulk_batch_unassign(body: Dict[str, Any]) -> List[str]:
     return errors
 
 
+def _validate_bulk_batch_assign(body: Dict[str, Any]) -> List[str]:
+    errors: List[str] = []
+    if not body.get("event_id") or not str(body.get("event_id")).strip():
+        errors.append("Event ID is required")
+    assignments = body.get("assignments")
+    if not isinstance(assignments, list) or len(assignments) == 0:
+        errors.append("assignments must be a non-empty array")
+    elif any(
+        not isinstance(item, dict)
+        or not str(item.get("name") or "").strip()
+        or not str(item.get("reg_number") or "").strip()
+        for item in assignments
+    ):
+        errors.append("Each assignment requires a batch name and registration number")
+    return errors
+
+
 @router.post("/add-batch")
 async def add_batch(
     request: Request,
@@ -113,7 +133,7 @@ async def add_batch(
     batch_doc["_id"] = insert_result.inserted_id
 
     cache_key = f"/enrollments/batches?event_id={quote(str(resolved_event_id))}"
-    cache.clear(cache_key)
+    await cache.clear(cache_key)
 
     return send_success_response(
         {"batch": _serialize_batch(batch_doc)},
@@ -162,12 +182,19 @@ async def remove_batch(
     await batches_collection().delete_one({"name": str(name).strip(), "event_id": resolved_event_id})
 
     cache_key = f"/enrollments/batches?event_id={quote(str(resolved_event_id))}"
-    cache.clear(cache_key)
-    cache.clear_pattern("/identities/players")
+    await cache.clear(cache_key)
+    await event_bus.publish(BATCH_CHANGED, {"event_id": resolved_event_id})
 
     return send_success_response({}, f'Batch "{name}" deleted successfully')
 
 
+async def _load_batches(event_id: Any) -> Dict[str, Any]:
+    cursor = batches_collection().find({"event_id": event_id}).sort("name", 1)
+    batches = await cursor.to_list(length=None)
+    batches_list: List[Dict[str, Any]] = [_serialize_batch(batch) for batch in batches]
+    return {"batches": batches_list}
+
+
 @router.get("/batches")
 async def get_batches(request: Request):
     event_id_query = request.query_params.get("event_id")
@@ -184,17 +211,11 @@ async def get_batches(request: Request):
     resolved_event_id = event_doc.get("event_id")
 
     cache_key = f"/enrollments/batches?event_id={quote(str(resolved_event_id))}"
-    cached = cache.get(cache_key)
-    if cached:
-        return send_success_response(cached)
-
-    cursor = batches_collection().find({"event_id": resolved_event_id}).sort("name", 1)
-    batches = await cursor.to_list(length=None)
-
-    batches_list: List[Dict[str, Any]] = [_serialize_batch(batch) for batch in batches]
-    result = {"batches": batches_list}
-    cache.set(cache_key, result)
-    return send_success_response(result)
+    etag, not_modified = await conditional_etag(request, cache_key)
+    if not_modified is not None:
+        return not_modified
+    result = await cache.get_or_load(cache_key, lambda: _load_batches(resolved_event_id))
+    return with_etag(send_success_response(result), etag)
 
 
 @router.post("/batches/assign-player")
@@ -232,7 +253,8 @@ async def assign_player_to_batch(
     )
 
     cache_key = f"/enrollments/batches?event_id={quote(str(resolved_event_id))}"
-    cache.clear(cache_key)
+    await cache.clear(cache_key)
+    await event_bus.publish(BATCH_CHANGED, {"event_id": resolved_event_id})
 
     return send_success_response(
         {"batch": _serialize_batch({**batch, "players": list(set((batch.get("players") or []) + [reg_number]))})},
@@ -240,6 +262,59 @@ async def assign_player_to_batch(
     )
 
 
+@router.post("/batches/assign-players")
+async def assign_players_to_batches(
+    request: Request,
+    _: None = Depends(require_registration_period),
+):
+    body = trim_object_fields(await request.json())
+    errors = _validate_bulk_batch_assign(body)
+    if errors:
+        return send_error_response(400, "; ".join(errors))
+
+    token = _get_request_token(request)
+    event_id = body.get("event_id")
+    reg_numbers_by_batch: Dict[str, List[str]] = {}
+    for item in body.get("assignments") or []:
+        reg_numbers_by_batch.setdefault(str(item["name"]).strip(), []).append(
+            str(item["reg_number"]).strip()
+        )
+
+    event_year_data = await get_event_year(
+        str(event_id).strip(),
+        require_id=True,
+        return_doc=True,
+        token=token,
+    )
+    resolved_event_id = event_year_data.get("doc", {}).get("event_id")
+
+    batches = await batches_collection().find(
+        {"name": {"$in": list(reg_numbers_by_batch)}, "event_id": resolved_event_id},
+        {"name": 1},
+    ).to_list(length=None)
+    batch_ids = {batch.get("name"): batch.get("_id") for batch in batches}
+    missing = [name for name in reg_numbers_by_batch if name not in batch_ids]
+    if missing:
+        return send_error_response(404, f"Batch not found: {', '.join(missing)}")
+
+    await batches_collection().bulk_write(
+        [
+            UpdateOne({"_id": batch_ids[name]}, {"$addToSet": {"players": {"$each": reg_numbers}}})
+            for name, reg_numbers in reg_numbers_by_batch.items()
+        ],
+        ordered=False,
+    )
+
+    cache_key = f"/enrollments/batches?event_id={quote(str(resolved_event_id))}"
+    await cache.clear(cache_key)
+    await event_bus.publish(BATCH_CHANGED, {"event_id": resolved_event_id})
+
+    return send_success_response(
+        {"assigned": sum(len(reg_numbers) for reg_numbers in reg_numbers_by_batch.values())},
+        "Players assigned to batches successfully",
+    )
+
+
 @router.post("/batches/unassign-player")
 async def unassign_player_from_batch(
     request: Request,
@@ -275,7 +350,8 @@ async def unassign_player_from_batch(
     )
 
     cache_key = f"/enrollments/batches?event_id={quote(str(resolved_event_id))}"
-    cache.clear(cache_key)
+    await cache.clear(cache_key)
+    await event_bus.publish(BATCH_CHANGED, {"event_id": resolved_event_id})
 
     updated_players = [player for player in (batch.get("players") or []) if player != reg_number]
     return send_success_response(
@@ -312,7 +388,8 @@ async def unassign_players_from_batches(
     )
 
     cache_key = f"/enrollments/batches?event_id={quote(str(resolved_event_id))}"
-    cache.clear(cache_key)
+    await cache.clear(cache_key)
+    await event_bus.publish(BATCH_CHANGED, {"event_id": resolved_event_id})
 
     return send_success_response(
         {"removed": len(reg_numbers)}, "Players removed from batches successfully"
@@ -1,6 +1,7 @@
 import logging
 import logging.config
 import time
+from contextlib import asynccontextmanager
 from pathlib import Path
 from uuid import uuid4
 
@@ -11,9 +12,15 @@ from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.responses import FileResponse, HTMLResponse, Response
 
 from app.auth import _ResponseException
+from app.cache import cache
+from app.cache_events import register_cache_event_handlers
 from app.config import get_settings
 from app.date_restrictions import check_registration_deadline
 from app.errors import send_error_response
+from app.event_bus import event_bus
+from app.http_cache import apply_cache_headers
+from app.http_client import close_http_clients, get_pool_stats
+from app.indexes import ensure_indexes
 from app.routers import batches as batches_router
 
 
@@ -58,7 +65,27 @@ structlog.configure(
     cache_logger_on_first_use=True,
 )
 
-app = FastAPI(title="Enrollment Service", version="0.1.0", docs_url=None, redoc_url=None)
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    if settings.mongodb_ensure_indexes:
+        await ensure_indexes()
+    register_cache_event_handlers()
+    await cache.start()
+    await event_bus.start()
+    yield
+    await close_http_clients()
+    await event_bus.close()
+    await cache.close()
+
+
+app = FastAPI(
+    title="Enrollment Service",
+    version="0.1.0",
+    docs_url=None,
+    redoc_url=None,
+    lifespan=lifespan,
+)
 logger = structlog.get_logger("enrollment-service")
 swagger_path = Path(__file__).with_name("swagger.yaml")
 app.add_middleware(
@@ -76,12 +103,9 @@ async def response_exception_handler(_: Request, exc: _ResponseException):
 
 
 @app.middleware("http")
-async def no_cache_headers(request: Request, call_next):
+async def cache_headers(request: Request, call_next):
     response = await call_next(request)
-    response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, private"
-    response.headers["Pragma"] = "no-cache"
-    response.headers["Expires"] = "0"
-    return response
+    return apply_cache_headers(request, response)
 
 
 @app.middleware("http")
@@ -173,6 +197,16 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/health/http-pool")
+async def health_http_pool():
+    return {"pools": get_pool_stats()}
+
+
+@app.get("/health/cache")
+async def health_cache():
+    return {"cache": cache.get_stats()}
+
+
 @app.exception_handler(Exception)
 async def unhandled_exception_handler(_: Request, exc: Exception):
     logging.exception("Unhandled error: %s", exc)
@@ -1,4 +1,5 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from .config import get_settings
 
@@ -10,3 +11,14 @@ db = client[settings.database_name]
 
 def event_years_collection():
     return db["eventyears"]
+
+
+INDEXES = {
+    "eventyears": [
+        IndexModel([("event_id", ASCENDING)], name="event_id_unique", unique=True),
+        IndexModel(
+            [("event_year", DESCENDING), ("event_name", ASCENDING)],
+            name="event_year_event_name",
+        ),
+    ],
+}
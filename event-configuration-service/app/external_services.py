@@ -2,9 +2,8 @@ import logging
 from typing import Any, Dict, List, Optional
 from urllib.parse import quote
 
-import httpx
-
 from .config import get_settings
+from .http_client import request_json
 
 
 logger = logging.getLogger("event-configuration.external")
@@ -21,12 +20,11 @@ async def _get_json(
     url: str,
     params: Optional[Dict[str, Any]] = None,
     token: str = "",
-    timeout: float = 30.0,
+    timeout: Optional[float] = None,
 ) -> Any:
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        response = await client.get(url, params=params, headers=_auth_headers(token))
-        response.raise_for_status()
-        return response.json()
+    return await request_json(
+        "GET", url, params=params, headers=_auth_headers(token), timeout=timeout
+    )
 
 
 async def get_identity_profile(token: str) -> Dict[str, Any]:
@@ -9,6 +9,7 @@ from ..auth import admin_dependency, auth_dependency
 from ..cache import cache
 from ..db import event_years_collection
 from ..errors import handle_not_found_error, send_error_response, send_success_response
+from ..event_bus import EVENT_YEAR_CHANGED, event_bus
 from ..external_services import count_points_entries, count_schedules, count_sports
 from ..validators import normalize_event_name, trim_object_fields
 from ..year_helpers import (
@@ -124,11 +125,11 @@ async def get_event_years(_: None = Depends(auth_dependency)):
 
 @router.get("/event-years/active")
 async def get_active_event_year():
-    cached = cache.get("/event-configurations/event-years/active")
+    cached = await cache.get("/event-configurations/event-years/active")
     if cached and should_event_year_be_active(cached):
         return JSONResponse(content={"success": True, "eventYear": _serialize_event_year(cached)})
     if cached:
-        cache.clear("/event-configurations/event-years/active")
+        await cache.clear("/event-configurations/event-years/active")
 
     active_year = await find_active_event_year()
     if not active_year:
@@ -140,7 +141,7 @@ async def get_active_event_year():
             }
         )
 
-    cache.set("/event-configurations/event-years/active", active_year)
+    await cache.set("/event-configurations/event-years/active", active_year)
     return JSONResponse(content={"success": True, "eventYear": _serialize_event_year(active_year)})
 
 
@@ -236,7 +237,8 @@ async def create_event_year(
     insert_result = await event_years_collection().insert_one(event_doc)
     event_doc["_id"] = insert_result.inserted_id
 
-    cache.clear("/event-configurations/event-years/active")
+    await cache.clear("/event-configurations/event-years/active")
+    await event_bus.publish(EVENT_YEAR_CHANGED)
 
     response_event_year = {
         "_id": str(event_doc.get("_id")),
@@ -412,7 +414,8 @@ async def update_event_year(
     )
     updated = await event_years_collection().find_one({"_id": event_year_doc.get("_id")})
 
-    cache.clear("/event-configurations/event-years/active")
+    await cache.clear("/event-configurations/event-years/active")
+    await event_bus.publish(EVENT_YEAR_CHANGED)
 
     return send_success_response(
         _serialize_event_year(updated), "Event year updated successfully"
@@ -485,6 +488,7 @@ async def delete_event_year(
 
     await event_years_collection().delete_one({"_id": year_doc.get("_id")})
 
-    cache.clear("/event-configurations/event-years/active")
+    await cache.clear("/event-configurations/event-years/active")
+    await event_bus.publish(EVENT_YEAR_CHANGED)
 
     return send_success_response({}, "Event year deleted successfully")
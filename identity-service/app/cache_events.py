@@ -0,0 +1,38 @@
+from typing import Any, Dict
+
+from .cache import cache, event_tag
+from .event_bus import (
+    BATCH_CHANGED,
+    DEPARTMENT_CHANGED,
+    EVENT_YEAR_CHANGED,
+    PARTICIPATION_CHANGED,
+    SPORT_CHANGED,
+    event_bus,
+)
+
+
+async def _evict_active_event_year(_: Dict[str, Any]) -> None:
+    await cache.clear("/event-configurations/event-years/active")
+
+
+async def _evict_departments(_: Dict[str, Any]) -> None:
+    await cache.clear("/departments")
+
+
+async def _evict_player_views(payload: Dict[str, Any]) -> None:
+    event_id = payload.get("event_id")
+    if event_id:
+        await cache.invalidate_tags(
+            event_tag("/identities/players", event_id),
+            event_tag("/identities/me", event_id),
+        )
+    else:
+        await cache.invalidate_tags("/identities/players", "/identities/me")
+
+
+def register_cache_event_handlers() -> None:
+    event_bus.subscribe(EVENT_YEAR_CHANGED, _evict_active_event_year)
+    event_bus.subscribe(DEPARTMENT_CHANGED, _evict_departments)
+    event_bus.subscribe(PARTICIPATION_CHANGED, _evict_player_views)
+    event_bus.subscribe(SPORT_CHANGED, _evict_player_views)
+    event_bus.subscribe(BATCH_CHANGED, _evict_player_views)
@@ -105,6 +105,7 @@ async def check_registration_deadline(request: Request) -> Optional[Any]:
         "/identities/login",
         "/identities/change-password",
         "/identities/reset-password",
+        "/identities/players/lookup",
     }:
         return None
     try:
@@ -1,4 +1,5 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, IndexModel
 
 from .config import get_settings
 
@@ -10,3 +11,11 @@ db = client[settings.database_name]
 
 def players_collection():
     return db["players"]
+
+
+INDEXES = {
+    "players": [
+        IndexModel([("reg_number", ASCENDING)], name="reg_number_unique", unique=True),
+        IndexModel([("search_keys", ASCENDING)], name="search_keys"),
+    ],
+}
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import uuid4
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from .config import get_settings
+
+
+logger = logging.getLogger("identity-service.event-bus")
+
+Handler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+PARTICIPATION_CHANGED = "sports-participation.participation-changed"
+SPORT_CHANGED = "sports-participation.sport-changed"
+BATCH_CHANGED = "enrollment.batch-changed"
+PLAYER_CHANGED = "identity.player-changed"
+DEPARTMENT_CHANGED = "department.department-changed"
+EVENT_YEAR_CHANGED = "event-configuration.event-year-changed"
+
+
+class InMemoryEventBus:
+    def __init__(self, source: str) -> None:
+        self._source = source
+        self._handlers: Dict[str, List[Handler]] = {}
+
+    def subscribe(self, event_type: str, handler: Handler) -> None:
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    async def publish(self, event_type: str, payload: Optional[Dict[str, Any]] = None) -> None:
+        await self._dispatch({"type": event_type, "payload": payload or {}, "source": self._source})
+
+    async def _dispatch(self, event: Dict[str, Any]) -> None:
+        for handler in self._handlers.get(event.get("type"), []):
+            try:
+                await handler(event.get("payload") or {})
+            except Exception as exc:
+                logger.warning("Event handler for %s failed: %s", event.get("type"), exc)
+
+    async def start(self) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+
+class RedisEventBus(InMemoryEventBus):
+    def __init__(self, source: str, redis_url: str, channel: str) -> None:
+        super().__init__(source)
+        self._client = Redis.from_url(redis_url, decode_responses=True)
+        self._channel = channel
+        self._listener: Optional[asyncio.Task] = None
+
+    async def publish(self, event_type: str, payload: Optional[Dict[str, Any]] = None) -> None:
+        message = json.dumps(
+            {"id": uuid4().hex, "type": event_type, "payload": payload or {}, "source": self._source},
+            default=str,
+        )
+        try:
+            await self._client.publish(self._channel, message)
+        except RedisError as exc:
+            logger.warning("Failed to publish %s: %s", event_type, exc)
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self._client.pubsub()
+            try:
+                await pubsub.subscribe(self._channel)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        event = json.loads(message.get("data"))
+                    except Exception:
+                        continue
+                    if event.get("type") in self._handlers:
+                        await self._dispatch(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Event bus listener disconnected: %s", exc)
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    async def start(self) -> None:
+        if self._listener is None and self._handlers:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self._client.aclose()
+
+
+settings = get_settings()
+event_bus: InMemoryEventBus = (
+    RedisEventBus("identity-service", settings.redis_url, settings.event_bus_channel)
+    if settings.event_bus_backend == "redis"
+    else InMemoryEventBus("identity-service")
+)
@@ -1,16 +1,31 @@
+import asyncio
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-
-import httpx
+from typing import Any, Awaitable, Dict, List, Optional, TypeVar
 
 from .cache import cache
 from .config import get_settings
+from .http_client import request_json
 
 
 logger = logging.getLogger("identity-service.external")
 settings = get_settings()
 
+PARTICIPATION_LOOKUP_CHUNK_SIZE = 1000
+MAX_CONCURRENT_REQUESTS = 4
+
+T = TypeVar("T")
+
+
+async def gather_limited(awaitables: List[Awaitable[T]], limit: int = MAX_CONCURRENT_REQUESTS) -> List[T]:
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _run(awaitable: Awaitable[T]) -> T:
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(*(_run(awaitable) for awaitable in awaitables))
+
 
 def _auth_headers(token: str) -> Dict[str, str]:
     if token:
@@ -22,24 +37,22 @@ async def _get_json(
     url: str,
     params: Optional[Dict[str, Any]] = None,
     token: str = "",
-    timeout: float = 30.0,
+    timeout: Optional[float] = None,
 ) -> Any:
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        response = await client.get(url, params=params, headers=_auth_headers(token))
-        response.raise_for_status()
-        return response.json()
+    return await request_json(
+        "GET", url, params=params, headers=_auth_headers(token), timeout=timeout
+    )
 
 
 async def _post_json(
     url: str,
     payload: Dict[str, Any],
     token: str = "",
-    timeout: float = 30.0,
+    timeout: Optional[float] = None,
 ) -> Any:
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        response = await client.post(url, json=payload, headers=_auth_headers(token))
-        response.raise_for_status()
-        return response.json()
+    return await request_json(
+        "POST", url, json=payload, headers=_auth_headers(token), timeout=timeout
+    )
 
 
 def _parse_date(value: Any) -> Optional[datetime]:
@@ -67,11 +80,11 @@ def should_event_year_be_active(event_year_doc: Dict[str, Any]) -> bool:
 
 
 async def get_active_event_year() -> Optional[Dict[str, Any]]:
-    cached = cache.get("/event-configurations/event-years/active")
+    cached = await cache.get("/event-configurations/event-years/active")
     if cached and should_event_year_be_active(cached):
         return cached
     if cached:
-        cache.clear("/event-configurations/event-years/active")
+        await cache.clear("/event-configurations/event-years/active")
     if not settings.event_configuration_url:
         return None
     data = await _get_json(
@@ -79,7 +92,7 @@ async def get_active_event_year() -> Optional[Dict[str, Any]]:
     )
     event_year = data.get("eventYear")
     if event_year:
-        cache.set("/event-configurations/event-years/active", event_year)
+        await cache.set("/event-configurations/event-years/active", event_year)
     return event_year
 
 
@@ -130,18 +143,22 @@ async def get_event_year(
     return {"event_id": active_event.get("event_id"), "doc": active_event} if return_doc else active_event.get("event_id")
 
 
-async def validate_department_exists(department_name: str) -> Dict[str, Any]:
+async def fetch_departments() -> List[Dict[str, Any]]:
     if not settings.department_url:
-        return {"exists": False, "department": None}
-    cached = cache.get("/departments")
+        return []
+    cached = await cache.get("/departments")
     departments = None
     if cached:
         departments = cached.get("departments")
     if departments is None:
         data = await _get_json(f"{settings.department_url}/departments")
-        cache.set("/departments", data)
+        await cache.set("/departments", data)
         departments = data.get("departments", [])
-    for dept in departments:
+    return departments
+
+
+async def validate_department_exists(department_name: str) -> Dict[str, Any]:
+    for dept in await fetch_departments():
         if dept.get("name") == department_name:
             return {"exists": True, "department": dept}
     return {"exists": False, "department": None}
@@ -158,6 +175,37 @@ async def get_sports(event_id: str, token: str = "") -> List[Dict[str, Any]]:
     return data if isinstance(data, list) else []
 
 
+async def fetch_participations(
+    reg_numbers: List[str],
+    event_id: str,
+    token: str = "",
+    rule: Optional[str] = None,
+) -> Dict[str, Dict[str, List[Any]]]:
+    if not reg_numbers:
+        return {}
+    if not settings.sports_participation_url:
+        raise RuntimeError("SPORTS_PARTICIPATION_URL is not configured")
+    unique_reg_numbers = list(dict.fromkeys(reg_numbers))
+    responses = await gather_limited(
+        [
+            _post_json(
+                f"{settings.sports_participation_url}/sports-participations/participations/lookup",
+                {
+                    "reg_numbers": unique_reg_numbers[start : start + PARTICIPATION_LOOKUP_CHUNK_SIZE],
+                    "event_id": event_id,
+                    "rule": rule,
+                },
+                token=token,
+            )
+            for start in range(0, len(unique_reg_numbers), PARTICIPATION_LOOKUP_CHUNK_SIZE)
+        ]
+    )
+    participations: Dict[str, Dict[str, List[Any]]] = {}
+    for data in responses:
+        participations.update(data.get("participations") or {})
+    return participations
+
+
 async def get_batches(event_id: str, token: str = "") -> List[Dict[str, Any]]:
     if not settings.enrollment_url:
         raise RuntimeError("ENROLLMENT_URL is not configured")
@@ -185,6 +233,21 @@ async def assign_player_to_batch(
     )
 
 
+async def assign_players_to_batches(
+    assignments: List[Dict[str, str]],
+    event_id: str,
+    token: str = "",
+) -> Any:
+    if not settings.enrollment_url:
+        raise RuntimeError("ENROLLMENT_URL is not configured")
+    payload = {"assignments": assignments, "event_id": event_id}
+    return await _post_json(
+        f"{settings.enrollment_url}/enrollments/batches/assign-players",
+        payload,
+        token=token,
+    )
+
+
 async def unassign_player_from_batch(
     batch_name: str,
     reg_number: str,
@@ -216,33 +279,38 @@ async def unassign_players_from_batches(
     )
 
 
-async def get_matches_for_sport(
-    sport_name: str,
+async def get_matches_for_sports(
+    sport_names: List[str],
     event_id: str,
+    reg_numbers: Optional[List[str]] = None,
     token: str = "",
 ) -> List[Dict[str, Any]]:
+    if not sport_names:
+        return []
     if not settings.scheduling_url:
         raise RuntimeError("SCHEDULING_URL is not configured")
-    data = await _get_json(
-        f"{settings.scheduling_url}/schedulings/event-schedule/{sport_name}",
-        params={"event_id": event_id},
+    payload: Dict[str, Any] = {"sports": sport_names, "event_id": event_id}
+    if reg_numbers:
+        payload["reg_numbers"] = reg_numbers
+    data = await _post_json(
+        f"{settings.scheduling_url}/schedulings/event-schedule/lookup",
+        payload,
         token=token,
     )
     return data.get("matches", [])
 
 
-async def remove_participation(
-    reg_number: str,
-    sport_name: str,
+async def remove_participations(
+    removals: List[Dict[str, str]],
     event_id: str,
     token: str = "",
 ) -> None:
+    if not removals:
+        return None
     if not settings.sports_participation_url:
         raise RuntimeError("SPORTS_PARTICIPATION_URL is not configured")
     await _post_json(
-        f"{settings.sports_participation_url}/sports-participations/remove-participation",
-        {"reg_number": reg_number, "sport": sport_name, "event_id": event_id},
+        f"{settings.sports_participation_url}/sports-participations/bulk-remove-participation",
+        {"removals": removals, "event_id": event_id},
         token=token,
     )
-
-
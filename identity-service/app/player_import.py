@@ -0,0 +1,215 @@
+import asyncio
+import csv
+import io
+import logging
+import re
+from contextlib import closing
+from itertools import islice
+from typing import IO, Any, Dict, Iterator, List, Optional, Set, Tuple
+from zipfile import BadZipFile
+
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError
+
+from .db import players_collection
+from .external_services import assign_players_to_batches, fetch_departments, get_batches
+from .player_search import search_keys
+from .validators import check_player_data
+
+
+logger = logging.getLogger("identity-service.player-import")
+
+IMPORT_CHUNK_SIZE = 500
+DUPLICATE_KEY_ERROR = 11000
+IMPORT_FIELDS = (
+    "reg_number",
+    "full_name",
+    "gender",
+    "department_branch",
+    "mobile_number",
+    "email_id",
+    "password",
+    "batch_name",
+)
+HEADER_ALIASES = {
+    "registration_number": "reg_number",
+    "name": "full_name",
+    "department": "department_branch",
+    "mobile": "mobile_number",
+    "email": "email_id",
+    "batch": "batch_name",
+}
+
+ImportRecord = Tuple[int, Dict[str, str]]
+
+
+def _column_name(value: Any) -> Optional[str]:
+    name = re.sub(r"[^a-z0-9]+", "_", str(value or "").strip().lower()).strip("_")
+    name = HEADER_ALIASES.get(name, name)
+    return name if name in IMPORT_FIELDS else None
+
+
+def _cell_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _csv_rows(file: IO[bytes]) -> Iterator[Tuple[Any, ...]]:
+    try:
+        yield from csv.reader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    except csv.Error as exc:
+        raise ValueError(f"Invalid CSV file: {exc}") from exc
+
+
+def _xlsx_rows(file: IO[bytes]) -> Iterator[Tuple[Any, ...]]:
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except (BadZipFile, InvalidFileException, KeyError) as exc:
+        raise ValueError("The uploaded file is not a valid XLSX workbook") from exc
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _records(rows: Iterator[Tuple[Any, ...]]) -> Iterator[ImportRecord]:
+    header = next(rows, None)
+    if header is None:
+        raise ValueError("The uploaded file is empty")
+    columns = [_column_name(value) for value in header]
+    missing = [field for field in IMPORT_FIELDS if field not in columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    for row_number, values in enumerate(rows, start=2):
+        record = {column: _cell_text(value) for column, value in zip(columns, values) if column}
+        if any(record.values()):
+            yield row_number, record
+
+
+def read_import_records(file: IO[bytes], filename: str) -> Iterator[ImportRecord]:
+    reader = _xlsx_rows if filename.lower().endswith(".xlsx") else _csv_rows
+    return _records(reader(file))
+
+
+def _next_chunk(records: Iterator[ImportRecord]) -> List[ImportRecord]:
+    return list(islice(records, IMPORT_CHUNK_SIZE))
+
+
+def _add_error(report: Dict[str, Any], row_number: int, reg_number: Optional[str], errors: List[str]) -> None:
+    report["failed"] += 1
+    report["errors"].append({"row": row_number, "reg_number": reg_number or None, "errors": errors})
+
+
+async def _import_chunk(
+    chunk: List[ImportRecord],
+    event_id: str,
+    token: str,
+    seen: Set[str],
+    report: Dict[str, Any],
+) -> List[str]:
+    department_names = {dept.get("name") for dept in await fetch_departments()}
+    batch_names = {batch.get("name") for batch in await get_batches(event_id, token=token)}
+    chunk_reg_numbers = [record["reg_number"] for _, record in chunk if record.get("reg_number")]
+    existing = {
+        player["reg_number"]
+        for player in await players_collection()
+        .find({"reg_number": {"$in": chunk_reg_numbers}}, {"_id": 0, "reg_number": 1})
+        .to_list(length=None)
+    }
+
+    pending: List[Tuple[int, Dict[str, str], str]] = []
+    for row_number, record in chunk:
+        report["total_rows"] += 1
+        batch_name = record.pop("batch_name", "")
+        reg_number = record.get("reg_number")
+        errors = check_player_data(record, department_names)
+        if not batch_name:
+            errors.append("Batch name is required")
+        elif batch_name not in batch_names:
+            errors.append(f'Batch "{batch_name}" does not exist')
+        if reg_number in seen:
+            errors.append("Duplicate registration number in file")
+        elif reg_number in existing:
+            errors.append("Registration number already exists")
+        if reg_number:
+            seen.add(reg_number)
+        if errors:
+            _add_error(report, row_number, reg_number, errors)
+        else:
+            pending.append((row_number, record, batch_name))
+    if not pending:
+        return []
+
+    write_errors: Dict[int, str] = {}
+    try:
+        await players_collection().bulk_write(
+            [
+                InsertOne(
+                    {
+                        **record,
+                        "search_keys": search_keys(record["reg_number"], record.get("full_name")),
+                        "createdBy": None,
+                        "updatedBy": None,
+                        "change_password_required": False,
+                    }
+                )
+                for _, record, _ in pending
+            ],
+            ordered=False,
+        )
+    except BulkWriteError as exc:
+        for error in exc.details.get("writeErrors", []):
+            write_errors[error["index"]] = (
+                "Registration number already exists"
+                if error.get("code") == DUPLICATE_KEY_ERROR
+                else error.get("errmsg") or "Failed to save player"
+            )
+
+    inserted: List[Tuple[int, Dict[str, str], str]] = []
+    for index, (row_number, record, batch_name) in enumerate(pending):
+        if index in write_errors:
+            _add_error(report, row_number, record["reg_number"], [write_errors[index]])
+        else:
+            inserted.append((row_number, record, batch_name))
+    if not inserted:
+        return []
+
+    reg_numbers = [record["reg_number"] for _, record, _ in inserted]
+    try:
+        await assign_players_to_batches(
+            [{"name": batch_name, "reg_number": record["reg_number"]} for _, record, batch_name in inserted],
+            event_id,
+            token=token,
+        )
+    except Exception as exc:
+        logger.warning("Failed to assign imported players to batches: %s", exc)
+        await players_collection().delete_many({"reg_number": {"$in": reg_numbers}})
+        for row_number, record, _ in inserted:
+            _add_error(report, row_number, record["reg_number"], ["Failed to assign player to batch"])
+        return []
+
+    report["inserted"] += len(inserted)
+    return reg_numbers
+
+
+async def import_players(
+    records: Iterator[ImportRecord],
+    event_id: str,
+    token: str = "",
+) -> Tuple[Dict[str, Any], List[str]]:
+    report: Dict[str, Any] = {"total_rows": 0, "inserted": 0, "failed": 0, "errors": []}
+    imported: List[str] = []
+    seen: Set[str] = set()
+    with closing(records):
+        while True:
+            chunk = await asyncio.to_thread(_next_chunk, records)
+            if not chunk:
+                break
+            imported.extend(await _import_chunk(chunk, event_id, token, seen, report))
+    report["errors"].sort(key=lambda error: error["row"])
+    return report, imported
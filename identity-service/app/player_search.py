@@ -0,0 +1,101 @@
+import argparse
+import asyncio
+import json
+import re
+import sys
+from typing import Any, Dict, List, Optional
+
+from pymongo import UpdateOne
+
+from .config import get_settings
+from .db import players_collection
+
+
+settings = get_settings()
+
+SEARCH_RESULT_FIELDS = {"_id": 0, "reg_number": 1, "full_name": 1, "department_branch": 1, "gender": 1}
+SEARCH_CANDIDATE_FACTOR = 5
+BACKFILL_BATCH_SIZE = 1000
+
+
+def normalize_search_text(value: Any) -> str:
+    return " ".join(str(value or "").lower().split())
+
+
+def search_keys(reg_number: Any, full_name: Any) -> List[str]:
+    name = normalize_search_text(full_name)
+    keys = [normalize_search_text(reg_number), name, *name.split(" ")]
+    return [key for key in dict.fromkeys(keys) if key]
+
+
+def _rank(player: Dict[str, Any], term: str) -> int:
+    reg_number = normalize_search_text(player.get("reg_number"))
+    name = normalize_search_text(player.get("full_name"))
+    if reg_number == term or name == term:
+        return 0
+    if reg_number.startswith(term):
+        return 1
+    if name.startswith(term):
+        return 2
+    return 3
+
+
+async def _find_candidates(key_filter: Any, limit: int) -> List[Dict[str, Any]]:
+    return (
+        await players_collection()
+        .find(
+            {"search_keys": key_filter, "reg_number": {"$ne": settings.admin_reg_number}},
+            SEARCH_RESULT_FIELDS,
+        )
+        .limit(limit)
+        .to_list(length=limit)
+    )
+
+
+async def search_players(term: str, limit: int) -> List[Dict[str, Any]]:
+    term = normalize_search_text(term)
+    if not term:
+        return []
+    candidate_limit = limit * SEARCH_CANDIDATE_FACTOR
+    exact, prefixed = await asyncio.gather(
+        _find_candidates(term, candidate_limit),
+        _find_candidates({"$regex": f"^{re.escape(term)}"}, candidate_limit),
+    )
+    candidates = list({player.get("reg_number"): player for player in [*prefixed, *exact]}.values())
+    candidates.sort(
+        key=lambda player: (_rank(player, term), normalize_search_text(player.get("full_name")))
+    )
+    return candidates[:limit]
+
+
+async def backfill_search_keys(only_missing: bool = True) -> Dict[str, int]:
+    query: Optional[Dict[str, Any]] = {"search_keys": {"$exists": False}} if only_missing else {}
+    cursor = players_collection().find(query, {"reg_number": 1, "full_name": 1})
+    operations: List[UpdateOne] = []
+    updated = 0
+    async for player in cursor:
+        operations.append(
+            UpdateOne(
+                {"_id": player["_id"]},
+                {"$set": {"search_keys": search_keys(player.get("reg_number"), player.get("full_name"))}},
+            )
+        )
+        if len(operations) >= BACKFILL_BATCH_SIZE:
+            updated += (await players_collection().bulk_write(operations, ordered=False)).modified_count
+            operations = []
+    if operations:
+        updated += (await players_collection().bulk_write(operations, ordered=False)).modified_count
+    return {"updated": updated}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Populate the players search_keys field")
+    parser.add_argument("--all", action="store_true", help="recompute keys for every player")
+    args = parser.parse_args()
+    result = asyncio.run(backfill_search_keys(only_missing=not args.all))
+    print(json.dumps(result, indent=2))
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,8 +12,8 @@ from ..config import get_settings
 from ..db import players_collection
 from ..email_service import send_password_reset_email
 from ..errors import send_error_response, send_success_response
-from ..external_services import get_active_event_year, get_event_year, get_batches, get_sports
-from ..player_utils import compute_player_participation, serialize_player
+from ..external_services import fetch_participations, get_active_event_year, get_event_year, get_batches
+from ..player_utils import serialize_player
 from ..validators import trim_object_fields
 
 
@@ -50,21 +50,23 @@ async def login(request: Request):
         return send_error_response(401, "Invalid registration number or password")
 
     event_id = None
-    cached_active = cache.get("/event-configurations/event-years/active")
+    cached_active = await cache.get("/event-configurations/event-years/active")
     if cached_active:
         event_id = cached_active.get("event_id")
     else:
         active_year = await get_active_event_year()
         if active_year:
             event_id = active_year.get("event_id")
-            cache.set("/event-configurations/event-years/active", active_year)
+            await cache.set("/event-configurations/event-years/active", active_year)
 
     participation = {"participated_in": [], "captain_in": [], "coordinator_in": []}
     request_token = get_request_token(request)
     if event_id:
         try:
-            sports = await get_sports(event_id, token=request_token)
-            participation = compute_player_participation(reg_number, sports)
+            participations = await fetch_participations(
+                [reg_number], event_id, token=request_token, rule="player"
+            )
+            participation = participations.get(reg_number) or participation
         except Exception as exc:
             if "No active event year found" in str(exc):
                 participation = {"participated_in": [], "captain_in": [], "coordinator_in": []}
@@ -1,30 +1,35 @@
+import asyncio
+import base64
+import binascii
+import json
 import logging
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, Request
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, File, Request, UploadFile
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from ..auth import admin_dependency, auth_dependency, get_request_token
 from ..cache import cache
 from ..config import get_settings
-from ..date_restrictions import require_registration_period
+from ..date_restrictions import check_registration_date_range, require_registration_period
 from ..db import players_collection
 from ..errors import handle_not_found_error, send_error_response, send_success_response
+from ..event_bus import PLAYER_CHANGED, event_bus
 from ..external_services import (
     assign_player_to_batch,
+    fetch_participations,
     get_event_year,
-    get_matches_for_sport,
+    get_matches_for_sports,
     get_batches,
     get_sports,
-    remove_participation,
+    remove_participations,
     unassign_players_from_batches,
 )
-from ..player_utils import (
-    compute_player_participation,
-    compute_players_participation_batch,
-    serialize_player,
-)
+from ..http_cache import conditional_etag, with_etag
+from ..player_import import import_players, read_import_records
+from ..player_search import search_keys, search_players
+from ..player_utils import serialize_player
 from ..validators import trim_object_fields, validate_player_data, validate_update_player_data
 
 
@@ -32,6 +37,20 @@ logger = logging.getLogger("identity-service.players")
 router = APIRouter()
 settings = get_settings()
 DEFAULT_PLAYERS_PAGE_SIZE = 25
+MAX_LOOKUP_REG_NUMBERS = 1000
+MIN_SEARCH_TERM_LENGTH = 1
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 25
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+PLAYERS_STREAM_BATCH_SIZE = 500
+
+
+async def _get_batch_name_map(event_id: str, token: str) -> Dict[str, Optional[str]]:
+    try:
+        batches = await get_batches(event_id, token=token)
+    except Exception:
+        return {}
+    return {reg: batch.get("name") for batch in batches for reg in batch.get("players") or []}
 
 
 async def _get_players_batch_names(
@@ -39,16 +58,8 @@ async def _get_players_batch_names(
     event_id: str,
     token: str,
 ) -> Dict[str, Optional[str]]:
-    batch_names: Dict[str, Optional[str]] = {reg: None for reg in reg_numbers}
-    try:
-        batches = await get_batches(event_id, token=token)
-        for batch in batches:
-            for reg in batch.get("players") or []:
-                if reg in batch_names:
-                    batch_names[reg] = batch.get("name")
-    except Exception:
-        return batch_names
-    return batch_names
+    batch_name_map = await _get_batch_name_map(event_id, token)
+    return {reg: batch_name_map.get(reg) for reg in reg_numbers}
 
 
 @router.get("/me")
@@ -68,7 +79,7 @@ async def get_me(request: Request, _: None = Depends(auth_dependency)):
 
     if event_id:
         cache_key = f"/identities/me?event_id={event_id}"
-        cached = cache.get(cache_key)
+        cached = await cache.get(cache_key)
         if cached and cached.get("reg_number") == request.state.user.get("reg_number"):
             return send_success_response({"player": cached})
 
@@ -80,10 +91,14 @@ async def get_me(request: Request, _: None = Depends(auth_dependency)):
 
     token = get_request_token(request)
     if event_id:
-        sports = await get_sports(event_id, token=token)
-        participation = compute_player_participation(user.get("reg_number"), sports)
+        participations = await fetch_participations(
+            [user.get("reg_number")], event_id, token=token, rule="player"
+        )
         user_with_computed = serialize_player(user)
-        user_with_computed.update(participation)
+        user_with_computed.update(
+            participations.get(user.get("reg_number"))
+            or {"participated_in": [], "captain_in": [], "coordinator_in": []}
+        )
         batch_name = await _get_players_batch_names([user.get("reg_number")], event_id, token)
         user_with_computed["batch_name"] = batch_name.get(user.get("reg_number"))
     else:
@@ -94,16 +109,169 @@ async def get_me(request: Request, _: None = Depends(auth_dependency)):
 
     if event_id:
         cache_key = f"/identities/me?event_id={event_id}"
-        cache.set(cache_key, user_with_computed)
+        await cache.set(cache_key, user_with_computed)
 
     return send_success_response({"player": user_with_computed})
 
 
+async def _with_computed_fields(
+    players: List[Dict[str, Any]],
+    event_id: Optional[str],
+    token: str,
+    batch_name_map: Optional[Dict[str, Optional[str]]] = None,
+) -> List[Dict[str, Any]]:
+    reg_numbers = [player.get("reg_number") for player in players]
+    participation_map = (
+        await fetch_participations(reg_numbers, event_id, token=token) if event_id else {}
+    )
+    if not event_id:
+        batch_names: Dict[str, Optional[str]] = {}
+    elif batch_name_map is not None:
+        batch_names = batch_name_map
+    else:
+        batch_names = await _get_players_batch_names(reg_numbers, event_id, token)
+
+    players_with_computed = []
+    for player in players:
+        data = serialize_player(player)
+        participation = participation_map.get(
+            player.get("reg_number"),
+            {"participated_in": [], "captain_in": [], "coordinator_in": []},
+        )
+        data.update(participation)
+        data["batch_name"] = batch_names.get(player.get("reg_number")) if event_id else None
+        players_with_computed.append(data)
+    return players_with_computed
+
+
+async def _load_players(
+    query: Dict[str, Any],
+    event_id: Optional[str],
+    token: str,
+    page: int,
+    limit: Optional[int],
+    skip: int,
+    has_page_param: bool,
+) -> Dict[str, Any]:
+    total_count = await players_collection().count_documents(query)
+    cursor = players_collection().find(query, {"password": 0})
+    if has_page_param and limit:
+        cursor = cursor.skip(skip).limit(limit)
+    players = await cursor.to_list(length=None)
+    players_with_computed = await _with_computed_fields(players, event_id, token)
+
+    result: Dict[str, Any] = {"players": players_with_computed}
+    if has_page_param and limit:
+        total_pages = (total_count + limit - 1) // limit
+        result["pagination"] = {
+            "currentPage": page,
+            "totalPages": total_pages,
+            "totalCount": total_count,
+            "limit": limit,
+            "hasNextPage": page < total_pages,
+            "hasPreviousPage": page > 1,
+        }
+    else:
+        result["totalCount"] = total_count
+
+    return result
+
+
+def _wants_ndjson(request: Request) -> bool:
+    return request.query_params.get("format") == "ndjson" or NDJSON_MEDIA_TYPE in (
+        request.headers.get("accept") or ""
+    )
+
+
+async def _stream_players(
+    query: Dict[str, Any],
+    event_id: Optional[str],
+    token: str,
+) -> AsyncIterator[bytes]:
+    batch_name_map = await _get_batch_name_map(event_id, token) if event_id else {}
+
+    async def _encode(players: List[Dict[str, Any]]) -> bytes:
+        rows = await _with_computed_fields(players, event_id, token, batch_name_map)
+        return "".join(json.dumps(row, default=str) + "\n" for row in rows).encode()
+
+    cursor = players_collection().find(query, {"password": 0}).batch_size(PLAYERS_STREAM_BATCH_SIZE)
+    chunk: List[Dict[str, Any]] = []
+    try:
+        async for player in cursor:
+            chunk.append(player)
+            if len(chunk) >= PLAYERS_STREAM_BATCH_SIZE:
+                yield await _encode(chunk)
+                chunk = []
+        if chunk:
+            yield await _encode(chunk)
+    except Exception as exc:
+        logger.exception("Player stream aborted: %s", exc)
+        raise
+    finally:
+        await cursor.close()
+
+
+def _encode_cursor(reg_number: str) -> str:
+    raw = json.dumps({"after": reg_number}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[str]:
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        after = json.loads(raw).get("after")
+    except (binascii.Error, ValueError, AttributeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(after, str):
+        raise ValueError("Invalid cursor")
+    return after
+
+
+async def _load_players_page(
+    query: Dict[str, Any],
+    event_id: Optional[str],
+    token: str,
+    limit: int,
+    after: Optional[str],
+    include_total: bool,
+) -> Dict[str, Any]:
+    page_query = dict(query)
+    if after is not None:
+        page_query["reg_number"] = {**query.get("reg_number", {}), "$gt": after}
+    players = (
+        await players_collection()
+        .find(page_query, {"password": 0})
+        .sort("reg_number", 1)
+        .limit(limit + 1)
+        .to_list(length=limit + 1)
+    )
+    has_next_page = len(players) > limit
+    players = players[:limit]
+    players_with_computed = await _with_computed_fields(players, event_id, token)
+
+    pagination: Dict[str, Any] = {
+        "limit": limit,
+        "hasNextPage": has_next_page,
+        "nextCursor": _encode_cursor(players[-1]["reg_number"]) if has_next_page else None,
+    }
+    if include_total:
+        if "$or" in query:
+            pagination["totalCount"] = await players_collection().count_documents(query)
+            pagination["totalCountApproximate"] = False
+        else:
+            pagination["totalCount"] = max(await players_collection().estimated_document_count() - 1, 0)
+            pagination["totalCountApproximate"] = True
+    return {"players": players_with_computed, "pagination": pagination}
+
+
 @router.get("/players")
 async def get_players(request: Request, _: None = Depends(auth_dependency)):
     event_id_query = request.query_params.get("event_id")
     search_query = request.query_params.get("search")
     has_page_param = request.query_params.get("page") not in {None, ""}
+    has_cursor_param = "cursor" in request.query_params
 
     page = 1
     if has_page_param:
@@ -114,7 +282,7 @@ async def get_players(request: Request, _: None = Depends(auth_dependency)):
             page = 1
 
     limit = None
-    if has_page_param:
+    if has_page_param or has_cursor_param:
         if request.query_params.get("limit") not in {None, ""}:
             try:
                 parsed_limit = int(request.query_params.get("limit", str(DEFAULT_PLAYERS_PAGE_SIZE)))
@@ -146,60 +314,113 @@ async def get_players(request: Request, _: None = Depends(auth_dependency)):
         regex = {"$regex": escaped, "$options": "i"}
         query["$or"] = [{"reg_number": regex}, {"full_name": regex}]
 
+    token = get_request_token(request)
+    if has_cursor_param and not has_page_param:
+        try:
+            after = _decode_cursor(request.query_params.get("cursor"))
+        except ValueError as exc:
+            return send_error_response(400, str(exc))
+        include_total = (request.query_params.get("include_total") or "").lower() == "true"
+        result = await _load_players_page(
+            query, event_id, token, limit or DEFAULT_PLAYERS_PAGE_SIZE, after, include_total
+        )
+        return send_success_response(result)
+
+    if not has_page_param and _wants_ndjson(request):
+        return StreamingResponse(
+            _stream_players(query, event_id, token), media_type=NDJSON_MEDIA_TYPE
+        )
+
     if not search_query and not has_page_param and event_id:
         cache_key = f"/identities/players?event_id={event_id}"
-        cached = cache.get(cache_key)
-        if cached:
-            return send_success_response(cached)
+        etag, not_modified = await conditional_etag(request, cache_key)
+        if not_modified is not None:
+            return not_modified
+        result = await cache.get_or_load(
+            cache_key, lambda: _load_players(query, event_id, token, page, limit, skip, False)
+        )
+        return with_etag(send_success_response(result), etag)
 
-    total_count = await players_collection().count_documents(query)
-    cursor = players_collection().find(query, {"password": 0})
-    if has_page_param and limit:
-        cursor = cursor.skip(skip).limit(limit)
-    players = await cursor.to_list(length=None)
+    result = await _load_players(query, event_id, token, page, limit, skip, has_page_param)
+    return send_success_response(result)
 
-    token = get_request_token(request)
-    sports = await get_sports(event_id, token=token) if event_id else []
-    reg_numbers = [player.get("reg_number") for player in players]
-    participation_map = (
-        compute_players_participation_batch(reg_numbers, sports) if event_id else {}
-    )
-    batch_names = (
-        await _get_players_batch_names(reg_numbers, event_id, token)
-        if event_id
-        else {}
-    )
 
-    players_with_computed = []
-    for player in players:
-        data = serialize_player(player)
-        participation = participation_map.get(
-            player.get("reg_number"),
-            {"participated_in": [], "captain_in": [], "coordinator_in": []},
+@router.get("/players/search")
+async def search_players_endpoint(request: Request, _: None = Depends(auth_dependency)):
+    term = (request.query_params.get("q") or "").strip()
+    if len(term) < MIN_SEARCH_TERM_LENGTH:
+        return send_success_response({"players": []})
+    try:
+        limit = int(request.query_params.get("limit") or DEFAULT_SEARCH_LIMIT)
+    except ValueError:
+        limit = DEFAULT_SEARCH_LIMIT
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+
+    players = await search_players(term, limit)
+    return send_success_response({"players": players})
+
+
+@router.post("/players/lookup")
+async def lookup_players(request: Request, _: None = Depends(auth_dependency)):
+    body = await request.json()
+    reg_numbers = body.get("reg_numbers")
+    if not isinstance(reg_numbers, list):
+        return send_error_response(400, "reg_numbers must be an array")
+    reg_numbers = list(
+        dict.fromkeys(str(reg).strip() for reg in reg_numbers if str(reg or "").strip())
+    )
+    if len(reg_numbers) > MAX_LOOKUP_REG_NUMBERS:
+        return send_error_response(
+            400, f"reg_numbers cannot contain more than {MAX_LOOKUP_REG_NUMBERS} entries"
         )
-        data.update(participation)
-        data["batch_name"] = batch_names.get(player.get("reg_number")) if event_id else None
-        players_with_computed.append(data)
 
-    result: Dict[str, Any] = {"players": players_with_computed}
-    if has_page_param and limit:
-        total_pages = (total_count + limit - 1) // limit
-        result["pagination"] = {
-            "currentPage": page,
-            "totalPages": total_pages,
-            "totalCount": total_count,
-            "limit": limit,
-            "hasNextPage": page < total_pages,
-            "hasPreviousPage": page > 1,
-        }
-    else:
-        result["totalCount"] = total_count
+    fields = body.get("fields")
+    if fields is not None and (
+        not isinstance(fields, list) or not all(isinstance(field, str) for field in fields)
+    ):
+        return send_error_response(400, "fields must be an array of field names")
+    include_participation = body.get("include_participation") is True
 
-    if not search_query and not has_page_param and event_id:
-        cache_key = f"/identities/players?event_id={event_id}"
-        cache.set(cache_key, result)
+    if not reg_numbers:
+        return send_success_response({"players": []})
 
-    return send_success_response(result)
+    projection: Dict[str, Any] = {"password": 0}
+    if fields and not include_participation:
+        projection = {field: 1 for field in fields if field != "password"}
+        projection["reg_number"] = 1
+
+    players = await players_collection().find(
+        {"reg_number": {"$in": reg_numbers, "$ne": settings.admin_reg_number}},
+        projection,
+    ).to_list(length=None)
+
+    if not include_participation:
+        return send_success_response({"players": [serialize_player(player) for player in players]})
+
+    event_id = None
+    try:
+        event_year_data = await get_event_year(
+            body.get("event_id"), return_doc=True, token=request.state.token
+        )
+        event_id = event_year_data.get("doc", {}).get("event_id")
+    except Exception as exc:
+        if str(exc) == "No active event year found" and not body.get("event_id"):
+            event_id = None
+        elif str(exc) == "Event year not found":
+            return send_error_response(400, str(exc))
+        else:
+            raise
+
+    players_with_computed = await _with_computed_fields(
+        players, event_id, get_request_token(request)
+    )
+    if fields:
+        keep = set(fields) | {"reg_number"}
+        players_with_computed = [
+            {key: value for key, value in player.items() if key in keep}
+            for player in players_with_computed
+        ]
+    return send_success_response({"players": players_with_computed})
 
 
 @router.post("/save-player")
@@ -257,7 +478,13 @@ async def save_player(
         )
 
     await players_collection().insert_one(
-        {**body, "createdBy": None, "updatedBy": None, "change_password_required": False}
+        {
+            **body,
+            "search_keys": search_keys(reg_number, body.get("full_name")),
+            "createdBy": None,
+            "updatedBy": None,
+            "change_password_required": False,
+        }
     )
 
     try:
@@ -269,14 +496,51 @@ async def save_player(
     saved_player = await players_collection().find_one({"reg_number": reg_number})
     player_data = serialize_player(saved_player)
 
-    cache.clear_pattern("/identities/players")
-    cache.clear(f"/enrollments/batches?event_id={event_id}")
+    await cache.invalidate_tags("/identities/players")
 
     return send_success_response(
         {"player": player_data}, "Player data saved successfully"
     )
 
 
+@router.post("/import-players")
+async def import_players_file(
+    request: Request,
+    file: UploadFile = File(...),
+    _: None = Depends(auth_dependency),
+    __: None = Depends(admin_dependency),
+):
+    token = get_request_token(request)
+    filename = file.filename or ""
+    if not filename.lower().endswith((".csv", ".xlsx")):
+        return send_error_response(400, "Only .csv and .xlsx files are supported")
+
+    registration = await check_registration_date_range(None, token=token)
+    if not registration["isWithin"]:
+        return send_error_response(400, registration["message"])
+    event_id = registration["eventYearDoc"].get("event_id")
+    if not event_id or not str(event_id).strip():
+        return send_error_response(
+            400,
+            "Active event is missing event_id. Please configure the event ID for the active event.",
+        )
+
+    try:
+        report, imported = await import_players(read_import_records(file.file, filename), event_id, token=token)
+    except ValueError as exc:
+        return send_error_response(400, str(exc))
+    finally:
+        await file.close()
+
+    if imported:
+        await cache.invalidate_tags("/identities/players")
+        await event_bus.publish(PLAYER_CHANGED, {"event_id": event_id, "reg_numbers": imported})
+
+    return send_success_response(
+        report, f"Imported {report['inserted']} of {report['total_rows']} players"
+    )
+
+
 @router.put("/update-player")
 async def update_player(
     request: Request,
@@ -316,6 +580,7 @@ async def update_player(
 
     update_fields = {
         "full_name": body.get("full_name"),
+        "search_keys": search_keys(reg_number, body.get("full_name")),
         "department_branch": body.get("department_branch"),
         "mobile_number": body.get("mobile_number"),
         "email_id": body.get("email_id"),
@@ -326,8 +591,8 @@ async def update_player(
     updated_player = await players_collection().find_one({"reg_number": reg_number})
     player_data = serialize_player(updated_player)
 
-    cache.clear_pattern("/identities/players")
-    cache.clear_pattern("/identities/me")
+    await cache.invalidate_tags("/identities/players", "/identities/me")
+    await event_bus.publish(PLAYER_CHANGED, {"reg_numbers": [reg_number]})
 
     return send_success_response({"player": player_data}, "Player data updated successfully")
 
@@ -349,15 +614,17 @@ async def bulk_player_enrollments(
     event_year_data = await get_event_year(event_id_query, return_doc=True, token=token)
     event_id = event_year_data.get("doc", {}).get("event_id")
 
-    players = await players_collection().find(
-        {"reg_number": {"$in": reg_numbers}}, {"reg_number": 1, "full_name": 1}
-    ).to_list(length=None)
+    players, sports = await asyncio.gather(
+        players_collection()
+        .find({"reg_number": {"$in": reg_numbers}}, {"reg_number": 1, "full_name": 1})
+        .to_list(length=None),
+        get_sports(event_id, token=token),
+    )
     found_reg_numbers = [p.get("reg_number") for p in players]
     not_found = [reg for reg in reg_numbers if reg not in found_reg_numbers]
     if not_found:
         return send_error_response(404, f"Players not found: {', '.join(not_found)}", {"notFound": not_found})
 
-    sports = await get_sports(event_id, token=token)
     enrollments_map: Dict[str, Dict[str, Any]] = {
         reg: {"nonTeamEvents": [], "teams": [], "matches": [], "hasMatches": False}
         for reg in reg_numbers
@@ -402,23 +669,24 @@ async def bulk_player_enrollments(
         for reg in reg_numbers
         for event in enrollments_map[reg]["nonTeamEvents"]
     }
-    for sport_name in all_non_team_event_names:
-        matches = await get_matches_for_sport(sport_name, event_id, token=token)
-        for match in matches:
-            if match.get("players") and isinstance(match.get("players"), list):
-                for player_reg in match["players"]:
-                    if player_reg in reg_numbers:
-                        enrollments_map[player_reg]["matches"].append(
-                            {
-                                "sport": match.get("sports_name"),
-                                "match_number": match.get("match_number"),
-                                "match_type": match.get("match_type"),
-                                "match_date": match.get("match_date"),
-                                "status": match.get("status"),
-                                "type": "individual",
-                            }
-                        )
-                        enrollments_map[player_reg]["hasMatches"] = True
+    matches = await get_matches_for_sports(
+        sorted(all_non_team_event_names), event_id, reg_numbers=reg_numbers, token=token
+    )
+    for match in matches:
+        if match.get("players") and isinstance(match.get("players"), list):
+            for player_reg in match["players"]:
+                if player_reg in reg_numbers:
+                    enrollments_map[player_reg]["matches"].append(
+                        {
+                            "sport": match.get("sports_name"),
+                            "match_number": match.get("match_number"),
+                            "match_type": match.get("match_type"),
+                            "match_date": match.get("match_date"),
+                            "status": match.get("status"),
+                            "type": "individual",
+                        }
+                    )
+                    enrollments_map[player_reg]["hasMatches"] = True
 
     result = {}
     for reg in reg_numbers:
@@ -479,21 +747,20 @@ async def delete_player(
             {"teams": teams},
         )
 
-    match_details = []
-    for event in non_team_events:
-        sport_name = event["sport"]
-        matches = await get_matches_for_sport(sport_name, event_id, token=token)
-        for match in matches:
-            if reg_number in (match.get("players") or []):
-                match_details.append(
-                    {
-                        "sport": match.get("sports_name"),
-                        "match_number": match.get("match_number"),
-                        "match_type": match.get("match_type"),
-                        "match_date": match.get("match_date"),
-                        "status": match.get("status"),
-                    }
-                )
+    matches = await get_matches_for_sports(
+        [event["sport"] for event in non_team_events], event_id, reg_numbers=[reg_number], token=token
+    )
+    match_details = [
+        {
+            "sport": match.get("sports_name"),
+            "match_number": match.get("match_number"),
+            "match_type": match.get("match_type"),
+            "match_date": match.get("match_date"),
+            "status": match.get("status"),
+        }
+        for match in matches
+        if reg_number in (match.get("players") or [])
+    ]
 
     if match_details:
         return send_error_response(
@@ -502,15 +769,17 @@ async def delete_player(
             {"matches": match_details},
         )
 
-    for event in non_team_events:
-        await remove_participation(reg_number, event["sport"], event_id, token=token)
-
+    await remove_participations(
+        [{"reg_number": reg_number, "sport": event["sport"]} for event in non_team_events],
+        event_id,
+        token=token,
+    )
     await unassign_players_from_batches([reg_number], event_id, token=token)
     await players_collection().delete_one({"reg_number": reg_number})
 
-    cache.clear_pattern("/identities/players")
-    cache.clear(f"/identities/me?event_id={event_id}")
-    cache.clear(f"/enrollments/batches?event_id={event_id}")
+    await cache.invalidate_tags("/identities/players")
+    await cache.clear(f"/identities/me?event_id={event_id}")
+    await event_bus.publish(PLAYER_CHANGED, {"event_id": event_id, "reg_numbers": [reg_number]})
 
     return send_success_response(
         {"deleted_events": len(non_team_events), "events": [e["sport"] for e in non_team_events]},
@@ -544,13 +813,15 @@ async def bulk_delete_players(
     )
     event_id = event_year_data.get("doc", {}).get("event_id")
 
-    players = await players_collection().find({"reg_number": {"$in": reg_numbers}}).to_list(length=None)
+    players, sports = await asyncio.gather(
+        players_collection().find({"reg_number": {"$in": reg_numbers}}).to_list(length=None),
+        get_sports(event_id, token=token),
+    )
     found = [p.get("reg_number") for p in players]
     not_found = [reg for reg in reg_numbers if reg not in found]
     if not_found:
         return send_error_response(404, f"Players not found: {', '.join(not_found)}", {"notFound": not_found})
 
-    sports = await get_sports(event_id, token=token)
     enrollments_map: Dict[str, Dict[str, Any]] = {reg: {"teams": [], "nonTeamEvents": []} for reg in reg_numbers}
 
     for sport in sports:
@@ -590,20 +861,22 @@ async def bulk_delete_players(
         for event in enrollments_map[reg]["nonTeamEvents"]
     }
     matches_by_player_and_sport: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
-    for sport_name in all_non_team_event_names:
-        matches = await get_matches_for_sport(sport_name, event_id, token=request.state.token)
-        for match in matches:
-            for player_reg in match.get("players") or []:
-                if player_reg in reg_numbers:
-                    matches_by_player_and_sport.setdefault(player_reg, {}).setdefault(sport_name, []).append(
-                        {
-                            "sport": match.get("sports_name"),
-                            "match_number": match.get("match_number"),
-                            "match_type": match.get("match_type"),
-                            "match_date": match.get("match_date"),
-                            "status": match.get("status"),
-                        }
-                    )
+    matches = await get_matches_for_sports(
+        sorted(all_non_team_event_names), event_id, reg_numbers=reg_numbers, token=request.state.token
+    )
+    for match in matches:
+        sport_name = match.get("sports_name")
+        for player_reg in match.get("players") or []:
+            if player_reg in reg_numbers:
+                matches_by_player_and_sport.setdefault(player_reg, {}).setdefault(sport_name, []).append(
+                    {
+                        "sport": sport_name,
+                        "match_number": match.get("match_number"),
+                        "match_type": match.get("match_type"),
+                        "match_date": match.get("match_date"),
+                        "status": match.get("status"),
+                    }
+                )
 
     players_with_teams = []
     players_with_matches = []
@@ -650,24 +923,25 @@ async def bulk_delete_players(
 
     deleted_events_count: Dict[str, List[str]] = {}
     reg_numbers_to_delete = []
+    removals = []
     for player_data in players_to_delete:
         reg_numbers_to_delete.append(player_data["reg_number"])
         deleted_events_count[player_data["reg_number"]] = [e["sport"] for e in player_data["nonTeamEvents"]]
-        for event in player_data["nonTeamEvents"]:
-            await remove_participation(
-                player_data["reg_number"],
-                event["sport"],
-                event_id,
-                token=request.state.token,
-            )
+        removals.extend(
+            {"reg_number": player_data["reg_number"], "sport": event["sport"]}
+            for event in player_data["nonTeamEvents"]
+        )
 
     if reg_numbers_to_delete:
+        await remove_participations(removals, event_id, token=request.state.token)
         await unassign_players_from_batches(reg_numbers_to_delete, event_id, token=request.state.token)
         await players_collection().delete_many({"reg_number": {"$in": reg_numbers_to_delete}})
 
-    cache.clear_pattern("/identities/players")
-    cache.clear(f"/identities/me?event_id={event_id}")
-    cache.clear(f"/enrollments/batches?event_id={event_id}")
+    await cache.invalidate_tags("/identities/players")
+    await cache.clear(f"/identities/me?event_id={event_id}")
+    await event_bus.publish(
+        PLAYER_CHANGED, {"event_id": event_id, "reg_numbers": reg_numbers_to_delete}
+    )
 
     return send_success_response(
         {
@@ -1,5 +1,5 @@
 import re
-from typing import Any, Dict, List, Tuple
+from typing import Any, Collection, Dict, List, Tuple
 
 from .external_services import validate_department_exists
 
@@ -15,7 +15,7 @@ def is_valid_phone(phone: str) -> bool:
     return bool(re.match(r"^[0-9]{10}$", phone or ""))
 
 
-async def validate_player_data(data: Dict[str, Any]) -> Tuple[bool, List[str]]:
+def check_player_data(data: Dict[str, Any], department_names: Collection[str]) -> List[str]:
     errors: List[str] = []
 
     if not (data.get("reg_number") or "").strip():
@@ -33,10 +33,8 @@ async def validate_player_data(data: Dict[str, Any]) -> Tuple[bool, List[str]]:
     department = (data.get("department_branch") or "").strip()
     if not department:
         errors.append("Department/branch is required")
-    else:
-        validation = await validate_department_exists(department)
-        if not validation["exists"]:
-            errors.append(f'Department "{department}" does not exist')
+    elif department not in department_names:
+        errors.append(f'Department "{department}" does not exist')
 
     mobile = (data.get("mobile_number") or "").strip()
     if not mobile:
@@ -53,6 +51,17 @@ async def validate_player_data(data: Dict[str, Any]) -> Tuple[bool, List[str]]:
     if not (data.get("password") or "").strip():
         errors.append("Password is required")
 
+    return errors
+
+
+async def validate_player_data(data: Dict[str, Any]) -> Tuple[bool, List[str]]:
+    department = (data.get("department_branch") or "").strip()
+    department_names = set()
+    if department:
+        validation = await validate_department_exists(department)
+        if validation["exists"]:
+            department_names.add(department)
+    errors = check_player_data(data, department_names)
     return len(errors) == 0, errors
 
 
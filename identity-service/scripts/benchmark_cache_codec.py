@@ -0,0 +1,111 @@
+import argparse
+import pickle
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.cache_codec import CacheCodec, msgpack, zstandard  # noqa: E402
+
+
+DEPARTMENTS = ["Computer Science", "Mechanical", "Electrical", "Civil", "Electronics", "MBA"]
+SPORTS = ["Cricket", "Football", "Volleyball", "Badminton", "Chess", "Table Tennis", "Athletics"]
+
+
+def _player(index: int, rng: random.Random) -> Dict[str, Any]:
+    reg_number = f"REG{index:06d}"
+    created_at = datetime(2025, 1, 1) + timedelta(minutes=index)
+    sports = rng.sample(SPORTS, rng.randint(0, 3))
+    return {
+        "_id": f"{index:024x}",
+        "reg_number": reg_number,
+        "full_name": f"Player {index} {rng.choice(['Kumar', 'Sharma', 'Singh', 'Das'])}",
+        "gender": rng.choice(["Male", "Female"]),
+        "department_branch": rng.choice(DEPARTMENTS),
+        "mobile_number": f"9{rng.randint(0, 999999999):09d}",
+        "email_id": f"player{index}@your-domain.com",
+        "createdBy": "admin",
+        "updatedBy": None,
+        "createdAt": created_at.isoformat(),
+        "updatedAt": created_at.isoformat(),
+        "participated_in": [
+            {"sport": sport, "team_name": rng.choice([None, f"{sport} Team {index % 7}"])}
+            for sport in sports
+        ],
+        "captain_in": sports[:1] if rng.random() < 0.1 else [],
+        "coordinator_in": [],
+        "batch_name": f"{rng.randint(1, 4)} Year (2025)",
+    }
+
+
+def players_payload(count: int, page_size: int, seed: int = 7) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    players = [_player(index, rng) for index in range(count)]
+    if not page_size:
+        return {"success": True, "players": players}
+    return {
+        "success": True,
+        "players": players[:page_size],
+        "pagination": {
+            "currentPage": 1,
+            "totalPages": (count + page_size - 1) // page_size,
+            "totalCount": count,
+            "limit": page_size,
+            "hasNextPage": count > page_size,
+            "hasPreviousPage": False,
+        },
+    }
+
+
+def _time(func: Callable[[], Any], rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - started) / rounds * 1_000_000
+
+
+def _codecs(threshold: int, level: int) -> List[Tuple[str, Callable[[Any], bytes], Callable[[bytes], Any]]]:
+    codecs = [("pickle", pickle.dumps, pickle.loads)]
+    names = ["orjson"] + (["msgpack"] if msgpack is not None else [])
+    for name in names:
+        plain = CacheCodec(name)
+        codecs.append((name, plain.encode, plain.decode))
+        if zstandard is not None:
+            compressed = CacheCodec(name, threshold, level)
+            codecs.append((f"{name}+zstd", compressed.encode, compressed.decode))
+    return codecs
+
+
+def run(count: int, page_size: int, rounds: int, threshold: int, level: int) -> None:
+    payload = players_payload(count, page_size)
+    label = f"page of {page_size}" if page_size else "full list"
+    print(f"/identities/players payload: {count} players, {label}, {rounds} rounds")
+    print(f"{'codec':<16}{'encode us':>12}{'decode us':>12}{'bytes':>12}")
+    for name, encode, decode in _codecs(threshold, level):
+        encoded = encode(payload)
+        encode_us = _time(lambda: encode(payload), rounds)
+        decode_us = _time(lambda: decode(encoded), rounds)
+        print(f"{name:<16}{encode_us:>12.1f}{decode_us:>12.1f}{len(encoded):>12}")
+    if msgpack is None:
+        print("msgpack not installed, skipped")
+    if zstandard is None:
+        print("zstandard not installed, compressed variants skipped")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare cache codecs on /identities/players payloads")
+    parser.add_argument("--players", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=0, help="0 benchmarks the unpaginated list")
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--threshold", type=int, default=16384)
+    parser.add_argument("--level", type=int, default=3)
+    args = parser.parse_args()
+    run(args.players, args.page_size, args.rounds, args.threshold, args.level)
+
+
+if __name__ == "__main__":
+    main()
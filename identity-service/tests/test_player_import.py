@@ -0,0 +1,69 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.auth import admin_dependency, auth_dependency
+from app.routers import players
+
+
+CSV = (
+    b"reg_number,full_name,gender,department_branch,mobile_number,email_id,password,batch_name\n"
+    b"REG001,Asha Rao,Female,CSE,9876543210,asha@example.com,secret,2026\n"
+)
+REGISTRATION = {"isWithin": True, "eventYearDoc": {"event_id": "2026-sports"}, "message": ""}
+
+
+async def _fake_import(records, event_id, token=""):
+    rows = list(records)
+    report = {"total_rows": len(rows), "inserted": len(rows), "failed": 0, "errors": []}
+    return report, [record["reg_number"] for _, record in rows]
+
+
+class ImportPlayersFileTest(unittest.TestCase):
+    def setUp(self) -> None:
+        app = FastAPI()
+        app.include_router(players.router, prefix="/identities")
+        app.dependency_overrides[auth_dependency] = lambda: None
+        app.dependency_overrides[admin_dependency] = lambda: None
+        self.client = TestClient(app)
+
+    def test_multipart_import_without_event_id(self) -> None:
+        import_mock = AsyncMock(side_effect=_fake_import)
+        with patch.object(
+            players, "check_registration_date_range", AsyncMock(return_value=REGISTRATION)
+        ) as registration, patch.object(players, "import_players", import_mock), patch.object(
+            players.cache, "invalidate_tags", AsyncMock()
+        ), patch.object(players.event_bus, "publish", AsyncMock()) as publish:
+            response = self.client.post(
+                "/identities/import-players",
+                files={"file": ("players.csv", CSV, "text/csv")},
+            )
+
+        self.assertEqual(response.status_code, 200, response.text)
+        self.assertEqual(response.json()["inserted"], 1)
+        registration.assert_awaited_once_with(None, token="")
+        self.assertEqual(import_mock.await_args.args[1], "2026-sports")
+        publish.assert_awaited_once_with(
+            players.PLAYER_CHANGED, {"event_id": "2026-sports", "reg_numbers": ["REG001"]}
+        )
+
+    def test_import_outside_registration_period(self) -> None:
+        closed = {"isWithin": False, "eventYearDoc": None, "message": "Registration closed"}
+        import_mock = AsyncMock(side_effect=_fake_import)
+        with patch.object(
+            players, "check_registration_date_range", AsyncMock(return_value=closed)
+        ), patch.object(players, "import_players", import_mock):
+            response = self.client.post(
+                "/identities/import-players",
+                files={"file": ("players.csv", CSV, "text/csv")},
+            )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "Registration closed")
+        import_mock.assert_not_awaited()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -26,6 +26,14 @@ class Settings(BaseSettings):
     enrollment_url: str = os.getenv("ENROLLMENT_URL", "").rstrip("/")
     identity_url: str = os.getenv("IDENTITY_URL", "").rstrip("/")
 
+    http_max_connections: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    http_max_keepalive_connections: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    http_keepalive_expiry: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    http_timeout: float = float(os.getenv("HTTP_TIMEOUT", "30"))
+    http_connect_timeout: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    http_upstream_timeouts: str = os.getenv("HTTP_UPSTREAM_TIMEOUTS", "")
+    http_http2: bool = os.getenv("HTTP_HTTP2", "false").lower() == "true"
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
     @model_validator(mode="after")
@@ -2,9 +2,8 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-import httpx
-
 from .config import get_settings
+from .http_client import request_json, stream_ndjson
 
 
 logger = logging.getLogger("reporting-service.external")
@@ -21,12 +20,11 @@ async def _get_json(
     url: str,
     params: Optional[Dict[str, Any]] = None,
     token: str = "",
-    timeout: float = 30.0,
+    timeout: Optional[float] = None,
 ) -> Any:
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        response = await client.get(url, params=params, headers=_auth_headers(token))
-        response.raise_for_status()
-        return response.json()
+    return await request_json(
+        "GET", url, params=params, headers=_auth_headers(token), timeout=timeout
+    )
 
 
 def _parse_date(value: Any) -> Optional[datetime]:
@@ -132,12 +130,15 @@ async def fetch_players(event_id: Optional[str], token: str = "") -> List[Dict[s
     params: Dict[str, Any] = {}
     if event_id:
         params["event_id"] = event_id
-    data = await _get_json(
-        f"{settings.identity_url}/identities/players",
-        params=params or None,
-        token=token,
-    )
-    return data.get("players", [])
+    params["format"] = "ndjson"
+    return [
+        player
+        async for player in stream_ndjson(
+            f"{settings.identity_url}/identities/players",
+            params=params,
+            headers=_auth_headers(token),
+        )
+    ]
 
 
 async def fetch_batches(event_id: str, token: str = "") -> List[Dict[str, Any]]:
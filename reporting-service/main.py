@@ -1,6 +1,7 @@
 import logging
 import logging.config
 import time
+from contextlib import asynccontextmanager
 from pathlib import Path
 from uuid import uuid4
 
@@ -14,6 +15,7 @@ from app.auth import _ResponseException
 from app.config import get_settings
 from app.date_restrictions import check_registration_deadline
 from app.errors import send_error_response
+from app.http_client import close_http_clients, get_pool_stats
 from app.routers import export as export_router
 
 
@@ -46,7 +48,20 @@ structlog.configure(
     cache_logger_on_first_use=True,
 )
 
-app = FastAPI(title="Reporting Service", version="0.1.0", docs_url=None, redoc_url=None)
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    yield
+    await close_http_clients()
+
+
+app = FastAPI(
+    title="Reporting Service",
+    version="0.1.0",
+    docs_url=None,
+    redoc_url=None,
+    lifespan=lifespan,
+)
 logger = structlog.get_logger("reporting-service")
 swagger_path = Path(__file__).with_name("swagger.yaml")
 app.add_middleware(
@@ -161,6 +176,11 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/health/http-pool")
+async def health_http_pool():
+    return {"pools": get_pool_stats()}
+
+
 @app.exception_handler(Exception)
 async def unhandled_exception_handler(_: Request, exc: Exception):
     logging.exception("Unhandled error: %s", exc)
@@ -0,0 +1,85 @@
+from datetime import datetime
+from typing import Any, Callable, Dict
+
+import orjson
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+FORMAT_VERSION = 1
+CODEC_ORJSON = 0x01
+CODEC_MSGPACK = 0x02
+FLAG_ZSTD = 0x80
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _orjson_dumps(data: Any) -> bytes:
+    return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _msgpack_dumps(data: Any) -> bytes:
+    return msgpack.packb(data, default=_default, use_bin_type=True)
+
+
+def _msgpack_loads(body: bytes) -> Any:
+    return msgpack.unpackb(body, raw=False, strict_map_key=False)
+
+
+_DUMPERS: Dict[str, Callable[[Any], bytes]] = {"orjson": _orjson_dumps, "msgpack": _msgpack_dumps}
+_CODEC_IDS: Dict[str, int] = {"orjson": CODEC_ORJSON, "msgpack": CODEC_MSGPACK}
+_LOADERS: Dict[int, Callable[[bytes], Any]] = {CODEC_ORJSON: orjson.loads, CODEC_MSGPACK: _msgpack_loads}
+
+
+class CacheCodec:
+    def __init__(
+        self,
+        codec: str = "orjson",
+        compression_threshold: int = 0,
+        compression_level: int = 3,
+    ) -> None:
+        codec = (codec or "orjson").lower()
+        if codec not in _DUMPERS:
+            raise ValueError(f"Unsupported cache codec: {codec}")
+        if codec == "msgpack" and msgpack is None:
+            raise RuntimeError("CACHE_CODEC=msgpack requires the msgpack package")
+        self.codec = codec
+        self._dumps = _DUMPERS[codec]
+        self._codec_id = _CODEC_IDS[codec]
+        self._compression_threshold = compression_threshold if zstandard is not None else 0
+        self._compressor = zstandard.ZstdCompressor(level=compression_level) if zstandard else None
+        self._decompressor = zstandard.ZstdDecompressor() if zstandard else None
+
+    def encode(self, data: Any) -> bytes:
+        body = self._dumps(data)
+        flags = self._codec_id
+        if self._compression_threshold > 0 and len(body) >= self._compression_threshold:
+            body = self._compressor.compress(body)
+            flags |= FLAG_ZSTD
+        return bytes((FORMAT_VERSION, flags)) + body
+
+    def decode(self, payload: bytes) -> Any:
+        if len(payload) < 2 or payload[0] != FORMAT_VERSION:
+            raise ValueError("Unsupported cache payload version")
+        flags = payload[1]
+        body = payload[2:]
+        if flags & FLAG_ZSTD:
+            if self._decompressor is None:
+                raise RuntimeError("Compressed cache payload requires the zstandard package")
+            body = self._decompressor.decompress(body)
+        loads = _LOADERS.get(flags & ~FLAG_ZSTD)
+        if loads is None or (loads is _msgpack_loads and msgpack is None):
+            raise ValueError("Unsupported cache payload codec")
+        return loads(body)
@@ -0,0 +1,33 @@
+from typing import Any, Dict
+
+from .cache import cache
+from .event_bus import (
+    EVENT_YEAR_CHANGED,
+    PARTICIPATION_CHANGED,
+    PLAYER_CHANGED,
+    SPORT_CHANGED,
+    event_bus,
+)
+from .gender_helpers import clear_player_gender_cache, clear_sport_gender_cache
+
+
+async def _evict_active_event_year(_: Dict[str, Any]) -> None:
+    await cache.clear("/event-configurations/event-years/active")
+
+
+async def _evict_team_genders(payload: Dict[str, Any]) -> None:
+    if payload.get("event_id"):
+        await clear_sport_gender_cache(payload.get("sport"), payload["event_id"])
+
+
+async def _evict_player_genders(payload: Dict[str, Any]) -> None:
+    await clear_player_gender_cache(payload.get("reg_numbers") or [])
+    if payload.get("event_id"):
+        await clear_sport_gender_cache(None, payload["event_id"])
+
+
+def register_cache_event_handlers() -> None:
+    event_bus.subscribe(EVENT_YEAR_CHANGED, _evict_active_event_year)
+    event_bus.subscribe(PARTICIPATION_CHANGED, _evict_team_genders)
+    event_bus.subscribe(SPORT_CHANGED, _evict_team_genders)
+    event_bus.subscribe(PLAYER_CHANGED, _evict_player_genders)
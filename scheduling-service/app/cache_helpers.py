@@ -10,21 +10,21 @@ async def clear_match_caches(match: dict, gender: Optional[str] = None, sport_do
     event_id = match.get("event_id")
     if not event_id:
         return
-    cache.clear(f"/schedulings/event-schedule/{normalized_sport}?event_id={event_id}")
+    await cache.clear(f"/schedulings/event-schedule/{normalized_sport}?event_id={event_id}")
 
     match_gender = gender
     if not match_gender:
         match_gender = await get_match_gender(match, sport_doc, token="")
     if match_gender:
-        cache.clear(
+        await cache.clear(
             f"/schedulings/event-schedule/{normalized_sport}?event_id={event_id}&gender={match_gender}"
         )
-        cache.clear(
+        await cache.clear(
             f"/schedulings/event-schedule/{normalized_sport}/teams-players?event_id={event_id}&gender={match_gender}"
         )
 
 
-def clear_new_match_caches(
+async def clear_new_match_caches(
     sport_name: str,
     event_id: str,
     gender: str,
@@ -32,13 +32,13 @@ def clear_new_match_caches(
 ) -> None:
     normalized_sport = normalize_sport_name(sport_name)
     normalized_event_id = str(event_id).strip().lower()
-    cache.clear(
+    await cache.clear(
         f"/schedulings/event-schedule/{normalized_sport}?event_id={normalized_event_id}"
     )
     if gender:
-        cache.clear(
+        await cache.clear(
             f"/schedulings/event-schedule/{normalized_sport}?event_id={normalized_event_id}&gender={gender}"
         )
-        cache.clear(
+        await cache.clear(
             f"/schedulings/event-schedule/{normalized_sport}/teams-players?event_id={normalized_event_id}&gender={gender}"
         )
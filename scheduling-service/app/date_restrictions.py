@@ -258,6 +258,7 @@ async def check_registration_deadline(request: Request) -> Optional[Any]:
         "/identities/login",
         "/identities/change-password",
         "/identities/reset-password",
+        "/schedulings/event-schedule/lookup",
     }:
         return None
     try:
@@ -1,4 +1,6 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import PyMongoError
 
 from .config import get_settings
 
@@ -8,5 +10,61 @@ client = AsyncIOMotorClient(settings.mongodb_uri)
 db = client[settings.database_name]
 
 
+async def supports_transactions() -> bool:
+    try:
+        hello = await client.admin.command("hello")
+    except PyMongoError:
+        return False
+    return bool(hello.get("setName")) or hello.get("msg") == "isdbgrid"
+
+
 def event_schedule_collection():
     return db["event_schedules"]
+
+
+def points_outbox_collection():
+    return db["points_outbox"]
+
+
+INDEXES = {
+    "event_schedules": [
+        IndexModel(
+            [("event_id", ASCENDING), ("sports_name", ASCENDING), ("match_number", ASCENDING)],
+            name="event_id_sports_name_match_number",
+        ),
+        IndexModel(
+            [
+                ("event_id", ASCENDING),
+                ("sports_name", ASCENDING),
+                ("gender", ASCENDING),
+                ("match_number", ASCENDING),
+            ],
+            name="event_id_sports_name_gender_match_number",
+        ),
+        IndexModel(
+            [
+                ("event_id", ASCENDING),
+                ("sports_name", ASCENDING),
+                ("gender", ASCENDING),
+                ("match_type", ASCENDING),
+                ("status", ASCENDING),
+            ],
+            name="event_id_sports_name_gender_match_type_status",
+        ),
+    ],
+    "points_outbox": [
+        IndexModel(
+            [("status", ASCENDING), ("_id", ASCENDING)],
+            name="status_id",
+        ),
+        IndexModel(
+            [("status", ASCENDING), ("next_attempt_at", ASCENDING), ("_id", ASCENDING)],
+            name="status_next_attempt_at",
+        ),
+        IndexModel(
+            [("publishedAt", ASCENDING)],
+            name="published_at_ttl",
+            expireAfterSeconds=7 * 24 * 60 * 60,
+        ),
+    ],
+}
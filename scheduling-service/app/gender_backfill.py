@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from typing import Any, Dict, List, Tuple
+
+from pymongo import UpdateOne
+
+from .auth import create_access_token
+from .cache import cache
+from .config import get_settings
+from .db import event_schedule_collection
+from .external_services import fetch_sport
+from .gender_helpers import get_matches_gender
+from .http_client import close_http_clients
+
+
+logger = logging.getLogger("scheduling-service.gender-backfill")
+settings = get_settings()
+
+
+async def backfill_match_genders(event_ids: List[str], token: str) -> Dict[str, int]:
+    query: Dict[str, Any] = {"$or": [{"gender": {"$exists": False}}, {"gender": None}]}
+    if event_ids:
+        query["event_id"] = {"$in": [str(event_id).strip().lower() for event_id in event_ids]}
+    matches = await event_schedule_collection().find(query).to_list(length=None)
+
+    groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for match in matches:
+        groups.setdefault((match.get("event_id"), match.get("sports_name")), []).append(match)
+
+    updated = 0
+    unresolved = 0
+    for (event_id, sports_name), group in groups.items():
+        try:
+            sport_doc = await fetch_sport(sports_name, event_id=event_id, token=token)
+            genders = await get_matches_gender(group, sport_doc, token=token)
+        except Exception as exc:
+            logger.error("Could not derive genders for %s (%s): %s", sports_name, event_id, exc)
+            unresolved += len(group)
+            continue
+        operations = [
+            UpdateOne({"_id": match["_id"]}, {"$set": {"gender": gender}})
+            for match, gender in zip(group, genders)
+            if gender
+        ]
+        unresolved += len(group) - len(operations)
+        if operations:
+            result = await event_schedule_collection().bulk_write(operations, ordered=False)
+            updated += result.modified_count
+
+    if updated:
+        await cache.invalidate_tags("/schedulings/event-schedule")
+    return {"matched": len(matches), "updated": updated, "unresolved": unresolved}
+
+
+async def _run(event_ids: List[str]) -> int:
+    token = create_access_token({"reg_number": settings.admin_reg_number})
+    try:
+        result = await backfill_match_genders(event_ids, token)
+    finally:
+        await close_http_clients()
+        await cache.close()
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Store the derived gender on existing matches")
+    parser.add_argument("event_ids", nargs="*", help="event ids to backfill (default: all)")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(_run(args.event_ids)))
+
+
+if __name__ == "__main__":
+    main()
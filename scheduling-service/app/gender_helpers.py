@@ -1,24 +1,49 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
 
+from .cache import cache, event_tag
 from .external_services import fetch_player, fetch_players_by_reg_numbers
 
 
-_gender_cache: Dict[str, Dict[str, Any]] = {}
+GENDER_CACHE_PREFIX = "/genders"
 
 
-def _cache_key(prefix: str, *parts: str) -> str:
-    return f"{prefix}:{':'.join(parts)}"
+def _player_key(reg_number: str) -> str:
+    return f"{GENDER_CACHE_PREFIX}/players/{quote(reg_number.strip(), safe='')}"
 
 
-def _get_cached(key: str) -> Optional[str]:
-    entry = _gender_cache.get(key)
-    if not entry:
-        return None
-    return entry.get("value")
+def _teams_path(sport_name: Optional[str] = None) -> str:
+    if not sport_name:
+        return f"{GENDER_CACHE_PREFIX}/teams"
+    return f"{GENDER_CACHE_PREFIX}/teams/{quote(sport_name.strip().lower(), safe='')}"
+
+
+def _event_key(event_id: Any) -> str:
+    return str(event_id).strip().lower()
+
+
+def _team_key(team_name: str, sport_name: str, event_id: Any) -> str:
+    path = f"{_teams_path(sport_name)}/{quote(team_name.strip(), safe='')}"
+    return event_tag(path, _event_key(event_id))
 
 
-def _set_cached(key: str, value: str) -> None:
-    _gender_cache[key] = {"value": value}
+async def _get_many_cached(keys: List[str]) -> List[Optional[str]]:
+    return list(await asyncio.gather(*(cache.get(key) for key in keys)))
+
+
+def _team_first_player(team_name: str, sport_doc: Dict[str, Any]) -> Optional[str]:
+    team = next(
+        (
+            entry
+            for entry in (sport_doc.get("teams_participated") or [])
+            if entry.get("team_name") and entry.get("team_name").strip() == team_name.strip()
+        ),
+        None,
+    )
+    if not team or not team.get("players"):
+        return None
+    return team.get("players")[0]
 
 
 async def get_team_gender(
@@ -29,27 +54,18 @@ async def get_team_gender(
 ) -> Optional[str]:
     if not sport_doc or not team_name or not event_id:
         return None
-    normalized_event_id = str(event_id).strip().lower()
-    key = _cache_key("team", sport_doc.get("name", ""), normalized_event_id, team_name.strip())
-    cached = _get_cached(key)
+    key = _team_key(team_name, sport_doc.get("name", ""), event_id)
+    cached = await cache.get(key)
     if cached:
         return cached
 
-    team = next(
-        (
-            entry
-            for entry in (sport_doc.get("teams_participated") or [])
-            if entry.get("team_name") and entry.get("team_name").strip() == team_name.strip()
-        ),
-        None,
-    )
-    if not team or not team.get("players"):
+    first_player = _team_first_player(team_name, sport_doc)
+    if not first_player:
         return None
-    first_player = team.get("players")[0]
-    player = await fetch_player(first_player, event_id=event_id, token=token)
+    player = await fetch_player(first_player, event_id=event_id, token=token, fields=["gender"])
     gender = player.get("gender") if player else None
     if gender:
-        _set_cached(key, gender)
+        await cache.set(key, gender)
     return gender
 
 
@@ -60,14 +76,14 @@ async def get_player_gender(
 ) -> Optional[str]:
     if not reg_number:
         return None
-    key = _cache_key("player", reg_number.strip())
-    cached = _get_cached(key)
+    key = _player_key(reg_number)
+    cached = await cache.get(key)
     if cached:
         return cached
-    player = await fetch_player(reg_number, event_id=event_id, token=token)
+    player = await fetch_player(reg_number, event_id=event_id, token=token, fields=["gender"])
     gender = player.get("gender") if player else None
     if gender:
-        _set_cached(key, gender)
+        await cache.set(key, gender)
     return gender
 
 
@@ -76,6 +92,8 @@ async def get_match_gender(
     sport_doc: Optional[Dict[str, Any]],
     token: str = "",
 ) -> Optional[str]:
+    if match.get("gender"):
+        return match.get("gender")
     if not sport_doc:
         return None
     if sport_doc.get("type") in {"dual_team", "multi_team"}:
@@ -89,52 +107,113 @@ async def get_match_gender(
     return await get_player_gender(players[0].strip(), event_id=match.get("event_id"), token=token)
 
 
-async def get_points_entry_gender(
-    points_entry: Dict[str, Any],
-    sport_doc: Optional[Dict[str, Any]],
-    token: str = "",
-) -> Optional[str]:
-    if not sport_doc:
-        return None
-    participant = points_entry.get("participant")
+def _participant_lookup(
+    participant: Optional[str],
+    is_team: bool,
+    sport_doc: Dict[str, Any],
+    event_id: Any,
+) -> Optional[Tuple[str, Optional[str]]]:
+    participant = (participant or "").strip()
     if not participant:
         return None
-    if points_entry.get("participant_type") == "team":
-        return await get_team_gender(participant, sport_doc, points_entry.get("event_id"), token=token)
-    return await get_player_gender(participant, event_id=points_entry.get("event_id"), token=token)
+    if is_team:
+        if not event_id:
+            return None
+        return (
+            _team_key(participant, sport_doc.get("name", ""), event_id),
+            _team_first_player(participant, sport_doc),
+        )
+    return _player_key(participant), participant
 
 
-async def get_participants_gender(
-    participants: List[str],
-    participant_type: str,
+async def _resolve_genders(
+    lookups: List[Optional[Tuple[str, Optional[str]]]],
+    event_id: Any,
+    token: str = "",
+) -> List[Optional[str]]:
+    reg_numbers: Dict[str, Optional[str]] = {}
+    for lookup in lookups:
+        if lookup is not None:
+            reg_numbers.setdefault(lookup[0], (lookup[1] or "").strip() or None)
+    keys = list(reg_numbers)
+    resolved: Dict[str, Optional[str]] = dict(zip(keys, await _get_many_cached(keys)))
+
+    pending = {key: reg for key, reg in reg_numbers.items() if not resolved.get(key) and reg}
+    regs = list(dict.fromkeys(pending.values()))
+    player_genders = dict(zip(regs, await _get_many_cached([_player_key(reg) for reg in regs])))
+    missing = [reg for reg, gender in player_genders.items() if not gender]
+    if missing:
+        players = await fetch_players_by_reg_numbers(
+            missing, event_id=event_id, token=token, fields=["gender"]
+        )
+        for player in players:
+            reg_number = player.get("reg_number")
+            if reg_number in player_genders and player.get("gender"):
+                player_genders[reg_number] = player.get("gender")
+
+    updates: Dict[str, str] = {}
+    for key, reg_number in pending.items():
+        gender = player_genders.get(reg_number)
+        resolved[key] = gender
+        if gender:
+            updates[key] = gender
+            updates[_player_key(reg_number)] = gender
+    if updates:
+        await asyncio.gather(*(cache.set(key, gender) for key, gender in updates.items()))
+    return [resolved.get(lookup[0]) if lookup else None for lookup in lookups]
+
+
+async def get_matches_gender(
+    matches: List[Dict[str, Any]],
+    sport_doc: Optional[Dict[str, Any]],
+    token: str = "",
+) -> List[Optional[str]]:
+    if not sport_doc or not matches:
+        return [match.get("gender") for match in matches]
+    is_team = sport_doc.get("type") in {"dual_team", "multi_team"}
+    lookups = []
+    for match in matches:
+        participants = (match.get("teams") if is_team else match.get("players")) or []
+        lookups.append(
+            None
+            if match.get("gender")
+            else _participant_lookup(
+                participants[0] if participants else None, is_team, sport_doc, match.get("event_id")
+            )
+        )
+    genders = await _resolve_genders(lookups, matches[0].get("event_id"), token=token)
+    return [match.get("gender") or gender for match, gender in zip(matches, genders)]
+
+
+async def get_points_entries_gender(
+    points_entries: List[Dict[str, Any]],
     sport_doc: Optional[Dict[str, Any]],
-    event_id: str,
     token: str = "",
-) -> Dict[str, Optional[str]]:
-    gender_map: Dict[str, Optional[str]] = {}
-    if not participants:
-        return gender_map
-    if participant_type == "team":
-        for team_name in participants:
-            gender_map[team_name] = await get_team_gender(team_name, sport_doc or {}, event_id, token=token)
-        return gender_map
-    players = await fetch_players_by_reg_numbers(participants, event_id=event_id, token=token)
-    for player in players:
-        reg = player.get("reg_number")
-        if reg:
-            gender_map[reg] = player.get("gender")
-    return gender_map
-
-
-def clear_team_gender_cache(team_name: str, sport_name: str, event_id: str) -> None:
-    normalized_event_id = str(event_id).strip().lower()
-    key = _cache_key("team", sport_name.strip().lower(), normalized_event_id, team_name.strip())
-    _gender_cache.pop(key, None)
-
-
-def clear_sport_gender_cache(sport_name: str, event_id: str) -> None:
-    normalized_event_id = str(event_id).strip().lower()
-    prefix = _cache_key("team", sport_name.strip().lower(), normalized_event_id, "")
-    for key in list(_gender_cache.keys()):
-        if key.startswith(prefix):
-            _gender_cache.pop(key, None)
+) -> List[Optional[str]]:
+    if not sport_doc or not points_entries:
+        return [entry.get("gender") for entry in points_entries]
+    lookups = [
+        None
+        if entry.get("gender")
+        else _participant_lookup(
+            entry.get("participant"),
+            entry.get("participant_type") == "team",
+            sport_doc,
+            entry.get("event_id"),
+        )
+        for entry in points_entries
+    ]
+    genders = await _resolve_genders(lookups, points_entries[0].get("event_id"), token=token)
+    return [entry.get("gender") or gender for entry, gender in zip(points_entries, genders)]
+
+
+async def clear_sport_gender_cache(sport_name: Optional[str], event_id: str) -> None:
+    tag = event_tag(_teams_path(sport_name), _event_key(event_id))
+    await cache.invalidate_tags(tag)
+
+
+async def clear_player_gender_cache(reg_numbers: List[str]) -> None:
+    tags = {_player_key(reg_number) for reg_number in reg_numbers if reg_number}
+    if not tags:
+        return None
+    await cache.invalidate_tags(*tags)
@@ -0,0 +1,56 @@
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+from .cache import cache
+
+
+NO_STORE = "no-store, no-cache, must-revalidate, private"
+REVALIDATE = "private, no-cache"
+
+CACHE_CONTROL: Dict[str, str] = {
+    "/schedulings/event-schedule/{sport}": REVALIDATE,
+    "default": NO_STORE,
+}
+
+
+def cache_control_for(method: str, route_path: Optional[str], has_etag: bool) -> str:
+    if method not in {"GET", "HEAD"} or not has_etag:
+        return CACHE_CONTROL["default"]
+    return CACHE_CONTROL.get(route_path or "", CACHE_CONTROL["default"])
+
+
+def apply_cache_headers(request: Request, response: Response) -> Response:
+    if "cache-control" not in response.headers:
+        route = request.scope.get("route")
+        response.headers["Cache-Control"] = (
+            NO_STORE
+            if response.status_code >= 400
+            else cache_control_for(request.method, getattr(route, "path", None), "etag" in response.headers)
+        )
+    if response.headers["cache-control"] == NO_STORE:
+        response.headers["Pragma"] = "no-cache"
+        response.headers["Expires"] = "0"
+    return response
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in {value.strip().removeprefix("W/") for value in if_none_match.split(",")}
+
+
+async def conditional_etag(request: Request, cache_key: str) -> Tuple[Optional[str], Optional[Response]]:
+    etag = await cache.etag(cache_key)
+    if etag and _etag_matches(request.headers.get("if-none-match"), etag):
+        return etag, Response(status_code=304, headers={"ETag": etag, "Vary": "Authorization"})
+    return etag, None
+
+
+def with_etag(response: Response, etag: Optional[str]) -> Response:
+    if etag and response.status_code == 200:
+        response.headers["ETag"] = etag
+        response.headers["Vary"] = "Authorization"
+    return response
@@ -0,0 +1,67 @@
+import json
+import logging
+from typing import Any, Dict
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from .config import get_settings
+from .sport_helpers import normalize_sport_name
+
+
+logger = logging.getLogger("scheduling-service.live-updates")
+settings = get_settings()
+
+
+def live_key(event_id: Any, sport_name: str) -> str:
+    return f"{settings.live_updates_stream_prefix}{str(event_id).strip().lower()}:{normalize_sport_name(sport_name)}"
+
+
+def match_update_payload(match: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "match_id": match.get("_id"),
+        "match_number": match.get("match_number"),
+        "match_type": match.get("match_type"),
+        "gender": match.get("gender"),
+        "status": match.get("status"),
+        "winner": match.get("winner"),
+        "qualifiers": match.get("qualifiers"),
+        "teams": match.get("teams"),
+        "players": match.get("players"),
+        "version": match.get("version"),
+    }
+
+
+class InMemoryLiveUpdates:
+    async def publish(self, event_id: Any, sport_name: str, kind: str, data: Dict[str, Any]) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+
+class RedisLiveUpdates:
+    def __init__(self, redis_url: str, maxlen: int) -> None:
+        self._client = Redis.from_url(redis_url, decode_responses=True)
+        self._maxlen = maxlen
+
+    async def publish(self, event_id: Any, sport_name: str, kind: str, data: Dict[str, Any]) -> None:
+        try:
+            await self._client.xadd(
+                live_key(event_id, sport_name),
+                {"type": kind, "data": json.dumps(data, default=str)},
+                maxlen=self._maxlen,
+                approximate=True,
+            )
+        except RedisError as exc:
+            logger.warning("Failed to publish live %s update for %s (%s): %s", kind, sport_name, event_id, exc)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+live_updates: Any = (
+    RedisLiveUpdates(settings.results_stream_redis_url, settings.live_updates_maxlen)
+    if settings.live_updates_backend == "redis"
+    else InMemoryLiveUpdates()
+)
@@ -1,12 +1,67 @@
 import logging
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+from pymongo import UpdateOne
+
+from .auth import create_access_token
+from .cache import cache
+from .config import get_settings
 from .db import event_schedule_collection
-from .gender_helpers import get_match_gender
+from .external_services import fetch_sport
+from .gender_helpers import get_matches_gender
 from .sport_helpers import normalize_sport_name
 
 
 logger = logging.getLogger("scheduling-service.match-validation")
+settings = get_settings()
+
+MISSING_GENDER_QUERY = {"$or": [{"gender": {"$exists": False}}, {"gender": None}]}
+
+
+async def count_matches_missing_gender() -> int:
+    return await event_schedule_collection().count_documents(MISSING_GENDER_QUERY)
+
+
+async def find_matches_for_gender(
+    query_filter: Dict[str, Any],
+    gender: Optional[str],
+    sport_doc: Optional[Dict[str, Any]],
+    sort: Optional[List[Tuple[str, int]]] = None,
+) -> List[Dict[str, Any]]:
+    query = {**query_filter, "gender": {"$in": [gender, None]}} if gender else query_filter
+    cursor = event_schedule_collection().find(query)
+    if sort:
+        cursor = cursor.sort(sort)
+    matches = await cursor.to_list(length=None)
+    missing = [match for match in matches if not match.get("gender")]
+    if missing:
+        logger.warning(
+            "%s match(es) for %s (%s) have no stored gender; deriving it now. "
+            "Run python -m app.gender_backfill to store it for every match.",
+            len(missing),
+            query_filter.get("sports_name"),
+            query_filter.get("event_id"),
+        )
+        token = create_access_token({"reg_number": settings.admin_reg_number})
+        if sport_doc is None:
+            try:
+                sport_doc = await fetch_sport(
+                    query_filter.get("sports_name"), event_id=query_filter.get("event_id"), token=token
+                )
+            except Exception:
+                sport_doc = None
+        genders = await get_matches_gender(missing, sport_doc, token=token)
+        operations = []
+        for match, match_gender in zip(missing, genders):
+            match["gender"] = match_gender
+            if match_gender:
+                operations.append(UpdateOne({"_id": match["_id"]}, {"$set": {"gender": match_gender}}))
+        if operations:
+            await event_schedule_collection().bulk_write(operations, ordered=False)
+            await cache.invalidate_tags("/schedulings/event-schedule")
+    if not gender:
+        return matches
+    return [match for match in matches if match.get("gender") == gender]
 
 
 async def get_knocked_out_participants(
@@ -14,7 +69,6 @@ async def get_knocked_out_participants(
     event_id: str,
     gender: str,
     sport_doc: Dict[str, Any],
-    token: str = "",
 ) -> Set[str]:
     if not sport_doc:
         logger.warning("get_knocked_out_participants: sport_doc is null for %s (%s)", sports_name, event_id)
@@ -25,16 +79,7 @@ async def get_knocked_out_participants(
         "event_id": str(event_id).strip().lower(),
         "status": "completed",
     }
-    all_completed = await event_schedule_collection().find(query_filter).to_list(length=None)
-
-    completed_matches: List[Dict[str, Any]] = []
-    for match in all_completed:
-        try:
-            match_gender = await get_match_gender(match, sport_doc, token=token)
-            if match_gender == gender:
-                completed_matches.append(match)
-        except Exception as exc:
-            logger.error("Error deriving gender for match %s: %s", match.get("_id"), exc)
+    completed_matches = await find_matches_for_gender(query_filter, gender, sport_doc)
 
     knocked_out: Set[str] = set()
     for match in completed_matches:
@@ -84,7 +129,6 @@ async def get_participants_in_scheduled_matches(
     event_id: str,
     gender: str,
     sport_doc: Dict[str, Any],
-    token: str = "",
 ) -> Set[str]:
     if not sport_doc:
         logger.warning(
@@ -100,16 +144,7 @@ async def get_participants_in_scheduled_matches(
         "match_type": {"$in": ["knockout", "final"]},
         "status": "scheduled",
     }
-    all_scheduled = await event_schedule_collection().find(query_filter).to_list(length=None)
-
-    scheduled_matches: List[Dict[str, Any]] = []
-    for match in all_scheduled:
-        try:
-            match_gender = await get_match_gender(match, sport_doc, token=token)
-            if match_gender == gender:
-                scheduled_matches.append(match)
-        except Exception as exc:
-            logger.error("Error deriving gender for scheduled match %s: %s", match.get("_id"), exc)
+    scheduled_matches = await find_matches_for_gender(query_filter, gender, sport_doc)
 
     participants: Set[str] = set()
     for match in scheduled_matches:
@@ -193,10 +228,8 @@ async def validate_final_match_requirement(
 ) -> Optional[Dict[str, Any]]:
     if sport_doc.get("type") not in {"dual_team", "dual_player"}:
         return None
-    knocked_out = await get_knocked_out_participants(sports_name, event_id, derived_gender, sport_doc, token=token)
-    in_scheduled = await get_participants_in_scheduled_matches(
-        sports_name, event_id, derived_gender, sport_doc, token=token
-    )
+    knocked_out = await get_knocked_out_participants(sports_name, event_id, derived_gender, sport_doc)
+    in_scheduled = await get_participants_in_scheduled_matches(sports_name, event_id, derived_gender, sport_doc)
     active_participants = await get_active_participants(sport_doc, derived_gender, knocked_out, in_scheduled, token=token)
     participants_in_match = teams if sport_doc.get("type") == "dual_team" else players
     if len(active_participants) == 2 and len(participants_in_match) == 2:
@@ -220,7 +253,6 @@ async def validate_all_matches_completed_before_final(
     match_type: str,
     derived_gender: str,
     sport_doc: Dict[str, Any],
-    token: str = "",
 ) -> Optional[Dict[str, Any]]:
     if match_type != "final":
         return None
@@ -229,15 +261,7 @@ async def validate_all_matches_completed_before_final(
         "event_id": str(event_id).strip().lower(),
         "match_type": {"$in": ["league", "knockout"]},
     }
-    all_matches = await event_schedule_collection().find(query_filter).to_list(length=None)
-    matches: List[Dict[str, Any]] = []
-    for match in all_matches:
-        try:
-            match_gender = await get_match_gender(match, sport_doc, token=token)
-            if match_gender == derived_gender:
-                matches.append(match)
-        except Exception as exc:
-            logger.error("Error deriving gender for match %s: %s", match.get("_id"), exc)
+    matches = await find_matches_for_gender(query_filter, derived_gender, sport_doc)
 
     scheduled = [match for match in matches if match.get("status") == "scheduled"]
     if scheduled:
@@ -282,7 +306,6 @@ async def validate_all_league_matches_completed_before_knockout(
     match_type: str,
     derived_gender: str,
     sport_doc: Dict[str, Any],
-    token: str = "",
 ) -> Optional[Dict[str, Any]]:
     if match_type != "knockout":
         return None
@@ -291,15 +314,7 @@ async def validate_all_league_matches_completed_before_knockout(
         "event_id": str(event_id).strip().lower(),
         "match_type": "league",
     }
-    all_matches = await event_schedule_collection().find(query_filter).to_list(length=None)
-    matches: List[Dict[str, Any]] = []
-    for match in all_matches:
-        try:
-            match_gender = await get_match_gender(match, sport_doc, token=token)
-            if match_gender == derived_gender:
-                matches.append(match)
-        except Exception as exc:
-            logger.error("Error deriving gender for match %s: %s", match.get("_id"), exc)
+    matches = await find_matches_for_gender(query_filter, derived_gender, sport_doc)
 
     scheduled = [match for match in matches if match.get("status") == "scheduled"]
     if scheduled:
@@ -0,0 +1,229 @@
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from pymongo import ReturnDocument
+from redis.asyncio import Redis
+
+from .auth import create_access_token
+from .config import get_settings
+from .db import points_outbox_collection, supports_transactions
+from .external_services import update_points_table
+
+
+logger = logging.getLogger("scheduling-service.result-outbox")
+settings = get_settings()
+
+CLAIM_CANDIDATES = 10
+
+
+class InMemoryResultPublisher:
+    async def publish(self, entry: Dict[str, Any]) -> None:
+        payload = entry.get("payload") or {}
+        await update_points_table(
+            payload.get("match"),
+            payload.get("previous_status"),
+            payload.get("previous_winner"),
+            payload.get("user_reg_number"),
+            token=create_access_token({"reg_number": settings.admin_reg_number}),
+        )
+
+    async def close(self) -> None:
+        return None
+
+
+class RedisStreamResultPublisher:
+    def __init__(self, redis_url: str, stream: str, maxlen: int) -> None:
+        self._client = Redis.from_url(redis_url, decode_responses=True)
+        self._stream = stream
+        self._maxlen = maxlen
+
+    async def publish(self, entry: Dict[str, Any]) -> None:
+        await self._client.xadd(
+            self._stream,
+            {
+                "id": str(entry["_id"]),
+                "event_id": entry.get("event_id") or "",
+                "sports_name": entry.get("sports_name") or "",
+                "payload": json.dumps(entry.get("payload") or {}, default=str),
+            },
+            maxlen=self._maxlen,
+            approximate=True,
+        )
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class ResultOutbox:
+    def __init__(
+        self,
+        publisher: Any,
+        poll_interval_ms: int,
+        max_attempts: int,
+        lease_ms: int,
+        transactions_mode: str,
+    ) -> None:
+        self._publisher = publisher
+        self._transactions_mode = transactions_mode
+        self.transactions = False
+        self._poll_interval_ms = poll_interval_ms
+        self._max_attempts = max_attempts
+        self._lease_ms = lease_ms
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"enqueued": 0, "published": 0, "retries": 0, "failed": 0}
+
+    async def enqueue(
+        self,
+        match: Dict[str, Any],
+        previous_status: str,
+        previous_winner: Optional[str],
+        user_reg_number: Optional[str],
+        session: Any = None,
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        await points_outbox_collection().insert_one(
+            {
+                "match_id": str(match.get("_id")),
+                "event_id": match.get("event_id"),
+                "sports_name": match.get("sports_name"),
+                "payload": {
+                    "match": match,
+                    "previous_status": previous_status,
+                    "previous_winner": previous_winner,
+                    "user_reg_number": user_reg_number,
+                },
+                "status": "pending",
+                "attempts": 0,
+                "next_attempt_at": now,
+                "createdAt": now,
+            },
+            session=session,
+        )
+        self._stats["enqueued"] += 1
+        self._wakeup.set()
+
+    async def _claim(self) -> Optional[Dict[str, Any]]:
+        now = datetime.now(timezone.utc)
+        heads = await points_outbox_collection().aggregate(
+            [
+                {"$match": {"status": "pending"}},
+                {"$sort": {"_id": 1}},
+                {
+                    "$group": {
+                        "_id": {"event_id": "$event_id", "sports_name": "$sports_name"},
+                        "entry_id": {"$first": "$_id"},
+                        "next_attempt_at": {"$first": "$next_attempt_at"},
+                    }
+                },
+                {"$match": {"next_attempt_at": {"$lte": now}}},
+                {"$sort": {"entry_id": 1}},
+                {"$limit": CLAIM_CANDIDATES},
+            ]
+        ).to_list(length=None)
+        for head in heads:
+            entry = await points_outbox_collection().find_one_and_update(
+                {"_id": head["entry_id"], "status": "pending", "next_attempt_at": {"$lte": now}},
+                {
+                    "$set": {"next_attempt_at": now + timedelta(milliseconds=self._lease_ms)},
+                    "$inc": {"attempts": 1},
+                },
+                return_document=ReturnDocument.AFTER,
+            )
+            if entry is not None:
+                return entry
+        return None
+
+    async def _fail(self, entry: Dict[str, Any], exc: Exception) -> None:
+        attempts = entry.get("attempts") or 1
+        update: Dict[str, Any] = {"last_error": str(exc)}
+        if attempts >= self._max_attempts:
+            update["status"] = "failed"
+            self._stats["failed"] += 1
+            logger.error("Giving up on match result %s after %s attempts: %s", entry["_id"], attempts, exc)
+        else:
+            delay_ms = min(self._poll_interval_ms * 2**attempts, 60000)
+            update["next_attempt_at"] = datetime.now(timezone.utc) + timedelta(milliseconds=delay_ms)
+            self._stats["retries"] += 1
+            logger.warning("Publishing match result %s failed (attempt %s): %s", entry["_id"], attempts, exc)
+        await points_outbox_collection().update_one({"_id": entry["_id"]}, {"$set": update})
+
+    async def flush(self) -> int:
+        published = 0
+        while True:
+            entry = await self._claim()
+            if entry is None:
+                return published
+            try:
+                await self._publisher.publish(entry)
+            except Exception as exc:
+                await self._fail(entry, exc)
+                return published
+            await points_outbox_collection().update_one(
+                {"_id": entry["_id"]},
+                {"$set": {"status": "published", "publishedAt": datetime.now(timezone.utc)}},
+            )
+            published += 1
+            self._stats["published"] += 1
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.flush()
+            except Exception as exc:
+                logger.warning("Result outbox relay failed: %s", exc)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._poll_interval_ms / 1000)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def start(self) -> None:
+        if self._transactions_mode == "auto":
+            self.transactions = await supports_transactions()
+        else:
+            self.transactions = self._transactions_mode == "true"
+        if not self.transactions:
+            logger.warning(
+                "MongoDB transactions are off; match updates and outbox entries are written separately"
+            )
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def get_stats(self) -> Dict[str, Any]:
+        pending = await points_outbox_collection().count_documents({"status": "pending"})
+        failed = await points_outbox_collection().count_documents({"status": "failed"})
+        oldest = await points_outbox_collection().find_one({"status": "pending"}, sort=[("_id", 1)])
+        lag_ms = 0
+        if oldest is not None:
+            lag_ms = int((datetime.now(timezone.utc) - oldest["_id"].generation_time).total_seconds() * 1000)
+        return {**self._stats, "pending": pending, "failed_total": failed, "lag_ms": lag_ms}
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._publisher.close()
+
+
+_publisher: Any = (
+    RedisStreamResultPublisher(
+        settings.results_stream_redis_url, settings.results_stream, settings.results_stream_maxlen
+    )
+    if settings.results_stream_backend == "redis"
+    else InMemoryResultPublisher()
+)
+result_outbox = ResultOutbox(
+    _publisher,
+    settings.results_outbox_poll_ms,
+    settings.results_outbox_max_attempts,
+    settings.results_outbox_lease_ms,
+    settings.results_outbox_transactions,
+)
@@ -1,11 +1,12 @@
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 from urllib.parse import quote, unquote
 
 from bson import ObjectId
 from bson.errors import InvalidId
 from fastapi import APIRouter, Depends, Request
+from pymongo import ReturnDocument
 
 from ..auth import auth_dependency
 from ..cache import cache
@@ -16,16 +17,17 @@ from ..date_restrictions import (
     require_event_period,
     require_event_status_update_period,
 )
-from ..db import event_schedule_collection
+from ..db import client, event_schedule_collection
 from ..errors import handle_not_found_error, send_error_response, send_success_response
 from ..external_services import (
     fetch_players_by_reg_numbers,
     fetch_sport,
     get_event_year,
-    update_points_table,
 )
-from ..gender_helpers import get_match_gender
+from ..http_cache import conditional_etag, with_etag
+from ..live_updates import live_updates, match_update_payload
 from ..match_validation import (
+    find_matches_for_gender,
     get_knocked_out_participants,
     get_participants_in_scheduled_matches,
     validate_all_league_matches_completed_before_knockout,
@@ -33,12 +35,14 @@ from ..match_validation import (
     validate_final_match_requirement,
     validate_match_type_for_sport,
 )
+from ..result_outbox import result_outbox
 from ..sport_helpers import normalize_sport_name
 from ..validators import trim_object_fields
 
 
 logger = logging.getLogger("scheduling-service.event-schedule")
 router = APIRouter()
+MAX_LOOKUP_SPORTS = 100
 
 
 def _parse_object_id(value: str) -> Optional[ObjectId]:
@@ -85,6 +89,20 @@ def _serialize_match(match: Dict[str, Any]) -> Dict[str, Any]:
     return data
 
 
+async def _load_event_schedule(sport: str, event_id: Any, gender: Optional[str]) -> Dict[str, Any]:
+    if gender and gender not in {"Male", "Female"}:
+        return {"matches": []}
+    all_matches = await find_matches_for_gender(
+        {"sports_name": normalize_sport_name(sport), "event_id": event_id},
+        gender,
+        None,
+        sort=[("match_number", 1)],
+    )
+    return {
+        "matches": [{**_serialize_match(match), "gender": match.get("gender")} for match in all_matches]
+    }
+
+
 @router.get("/event-schedule/{sport}")
 async def get_event_schedule(
     sport: str,
@@ -102,37 +120,56 @@ async def get_event_schedule(
     gender = request.query_params.get("gender")
 
     cache_key = (
-        f"/schedulings/event-schedule/{sport}?event_id={quote(str(event_id))}&gender={gender}"
+        f"/schedulings/event-schedule/{normalize_sport_name(sport)}?event_id={quote(str(event_id))}&gender={gender}"
         if gender
-        else f"/schedulings/event-schedule/{sport}?event_id={quote(str(event_id))}"
+        else f"/schedulings/event-schedule/{normalize_sport_name(sport)}?event_id={quote(str(event_id))}"
     )
-    cached = cache.get(cache_key)
-    if cached:
-        return send_success_response(cached)
-
-    cursor = (
-        event_schedule_collection()
-        .find({"sports_name": normalize_sport_name(sport), "event_id": event_id})
-        .sort("match_number", 1)
+    etag, not_modified = await conditional_etag(request, cache_key)
+    if not_modified is not None:
+        return not_modified
+    result = await cache.get_or_load(
+        cache_key, lambda: _load_event_schedule(sport, event_id, gender)
     )
-    all_matches = await cursor.to_list(length=None)
+    return with_etag(send_success_response(result), etag)
 
-    try:
-        sport_doc = await fetch_sport(sport, event_id=event_id, token=request.state.token)
-    except Exception:
-        sport_doc = None
 
-    matches_with_gender: List[Dict[str, Any]] = []
-    for match in all_matches:
-        match_gender = await get_match_gender(match, sport_doc, token=request.state.token)
-        match_with_gender = {**_serialize_match(match), "gender": match_gender}
-        if not gender or gender in {"Male", "Female"}:
-            if not gender or match_gender == gender:
-                matches_with_gender.append(match_with_gender)
+@router.post("/event-schedule/lookup")
+async def lookup_event_schedules(
+    request: Request,
+    _: None = Depends(auth_dependency),
+):
+    body = trim_object_fields(await request.json())
+    sports = body.get("sports")
+    reg_numbers = body.get("reg_numbers")
+    if not isinstance(sports, list) or len(sports) == 0:
+        return send_error_response(400, "sports must be a non-empty array")
+    if len(sports) > MAX_LOOKUP_SPORTS:
+        return send_error_response(400, f"Maximum {MAX_LOOKUP_SPORTS} sports can be looked up at a time")
+    if reg_numbers is not None and not isinstance(reg_numbers, list):
+        return send_error_response(400, "reg_numbers must be an array")
 
-    result = {"matches": matches_with_gender}
-    cache.set(cache_key, result)
-    return send_success_response(result)
+    event_year_data = await get_event_year(
+        body.get("event_id"),
+        return_doc=True,
+        token=request.state.token,
+    )
+    event_id = event_year_data.get("doc", {}).get("event_id")
+
+    query: Dict[str, Any] = {
+        "event_id": event_id,
+        "sports_name": {"$in": list({normalize_sport_name(sport) for sport in sports})},
+    }
+    if reg_numbers:
+        query["players"] = {"$in": reg_numbers}
+    matches = (
+        await event_schedule_collection()
+        .find(query)
+        .sort([("sports_name", 1), ("match_number", 1)])
+        .to_list(length=None)
+    )
+    return send_success_response(
+        {"matches": [{**_serialize_match(match), "gender": match.get("gender")} for match in matches]}
+    )
 
 
 @router.get("/event-schedule/{sport}/teams-players")
@@ -175,12 +212,8 @@ async def get_teams_players(
         )
 
     try:
-        knocked_out = await get_knocked_out_participants(
-            decoded_sport, event_id, gender, sport_doc, token=request.state.token
-        )
-        in_scheduled = await get_participants_in_scheduled_matches(
-            decoded_sport, event_id, gender, sport_doc, token=request.state.token
-        )
+        knocked_out = await get_knocked_out_participants(decoded_sport, event_id, gender, sport_doc)
+        in_scheduled = await get_participants_in_scheduled_matches(decoded_sport, event_id, gender, sport_doc)
     except Exception as exc:
         logger.error("Error getting knocked out or scheduled participants: %s", exc)
         return send_error_response(500, "Error retrieving participant eligibility data")
@@ -422,13 +455,13 @@ async def create_match(
         )
 
     all_league_error = await validate_all_league_matches_completed_before_knockout(
-        sports_name, event_year_doc.get("event_id"), match_type, derived_gender, sport_doc, token=request.state.token
+        sports_name, event_year_doc.get("event_id"), match_type, derived_gender, sport_doc
     )
     if all_league_error:
         return send_error_response(all_league_error["statusCode"], all_league_error["message"])
 
     all_matches_error = await validate_all_matches_completed_before_final(
-        sports_name, event_year_doc.get("event_id"), match_type, derived_gender, sport_doc, token=request.state.token
+        sports_name, event_year_doc.get("event_id"), match_type, derived_gender, sport_doc
     )
     if all_matches_error:
         return send_error_response(all_matches_error["statusCode"], all_matches_error["message"])
@@ -440,10 +473,10 @@ async def create_match(
             else unique_players or [p.strip() for p in players if p and str(p).strip()]
         )
         knocked_out = await get_knocked_out_participants(
-            sports_name, event_year_doc.get("event_id"), derived_gender, sport_doc, token=request.state.token
+            sports_name, event_year_doc.get("event_id"), derived_gender, sport_doc
         )
         in_scheduled = await get_participants_in_scheduled_matches(
-            sports_name, event_year_doc.get("event_id"), derived_gender, sport_doc, token=request.state.token
+            sports_name, event_year_doc.get("event_id"), derived_gender, sport_doc
         )
         conflicting = [
             participant
@@ -481,34 +514,32 @@ async def create_match(
             return send_error_response(400, error_message)
 
     if match_type == "league":
-        all_knockout = await event_schedule_collection().find(
+        existing_knockout = await find_matches_for_gender(
             {
                 "sports_name": normalize_sport_name(sports_name),
                 "event_id": event_year_doc.get("event_id"),
                 "match_type": {"$in": ["knockout", "final"]},
                 "status": {"$in": ["scheduled", "completed", "draw", "cancelled"]},
-            }
-        ).to_list(length=None)
-        for match in all_knockout:
-            match_gender = await get_match_gender(match, sport_doc, token=request.state.token)
-            if match_gender == derived_gender:
-                return send_error_response(
-                    400,
-                    f"Cannot schedule league matches. Knockout matches already exist for this sport and gender ({derived_gender}).",
-                )
+            },
+            derived_gender,
+            sport_doc,
+        )
+        if existing_knockout:
+            return send_error_response(
+                400,
+                f"Cannot schedule league matches. Knockout matches already exist for this sport and gender ({derived_gender}).",
+            )
     elif match_type in {"knockout", "final"}:
-        all_league = await event_schedule_collection().find(
+        league_matches = await find_matches_for_gender(
             {
                 "sports_name": normalize_sport_name(sports_name),
                 "event_id": event_year_doc.get("event_id"),
                 "match_type": "league",
-            }
-        ).sort("match_date", -1).to_list(length=None)
-        league_matches: List[Dict[str, Any]] = []
-        for match in all_league:
-            match_gender = await get_match_gender(match, sport_doc, token=request.state.token)
-            if match_gender == derived_gender:
-                league_matches.append(match)
+            },
+            derived_gender,
+            sport_doc,
+            sort=[("match_date", -1)],
+        )
         if league_matches:
             latest_league_date = league_matches[0].get("match_date")
             match_date_obj = _parse_match_date(match_date)
@@ -520,18 +551,16 @@ async def create_match(
                         f"Latest league match date: {latest_league_date.date()}",
                     )
         if match_type == "final":
-            all_knockout = await event_schedule_collection().find(
+            knockout_matches = await find_matches_for_gender(
                 {
                     "sports_name": normalize_sport_name(sports_name),
                     "event_id": event_year_doc.get("event_id"),
                     "match_type": "knockout",
-                }
-            ).sort("match_date", -1).to_list(length=None)
-            knockout_matches: List[Dict[str, Any]] = []
-            for match in all_knockout:
-                match_gender = await get_match_gender(match, sport_doc, token=request.state.token)
-                if match_gender == derived_gender:
-                    knockout_matches.append(match)
+                },
+                derived_gender,
+                sport_doc,
+                sort=[("match_date", -1)],
+            )
             if knockout_matches:
                 latest_knockout_date = knockout_matches[0].get("match_date")
                 match_date_obj = _parse_match_date(match_date)
@@ -556,21 +585,21 @@ async def create_match(
     if final_error:
         return send_error_response(final_error["statusCode"], final_error["message"])
 
-    all_final = await event_schedule_collection().find(
+    existing_final = await find_matches_for_gender(
         {
             "sports_name": normalize_sport_name(sports_name),
             "event_id": event_year_doc.get("event_id"),
             "match_type": "final",
             "status": {"$in": ["scheduled", "completed"]},
-        }
-    ).to_list(length=None)
-    for match in all_final:
-        match_gender = await get_match_gender(match, sport_doc, token=request.state.token)
-        if match_gender == derived_gender:
-            return send_error_response(
-                400,
-                f"Cannot schedule new matches. A final match already exists for this sport and gender ({derived_gender}).",
-            )
+        },
+        derived_gender,
+        sport_doc,
+    )
+    if existing_final:
+        return send_error_response(
+            400,
+            f"Cannot schedule new matches. A final match already exists for this sport and gender ({derived_gender}).",
+        )
 
     match_date_obj = _parse_match_date(match_date)
     if not match_date_obj:
@@ -593,6 +622,7 @@ async def create_match(
         "match_number": match_number,
         "match_type": match_type,
         "sports_name": normalize_sport_name(sports_name),
+        "gender": derived_gender,
         "match_date": match_date_obj,
         "status": "scheduled",
         "createdBy": request.state.user.get("reg_number"),
@@ -615,7 +645,7 @@ async def create_match(
     match_data["_id"] = insert_result.inserted_id
 
     try:
-        clear_new_match_caches(sports_name, event_year_doc.get("event_id"), derived_gender, match_type)
+        await clear_new_match_caches(sports_name, event_year_doc.get("event_id"), derived_gender, match_type)
     except Exception as exc:
         logger.error("Error clearing caches after match creation: %s", exc)
 
@@ -795,21 +825,38 @@ async def update_match(
 
     update_data["updatedBy"] = request.state.user.get("reg_number")
 
-    await event_schedule_collection().update_one({"_id": object_id}, {"$set": update_data})
-    updated_match = await event_schedule_collection().find_one({"_id": object_id})
+    async def apply_update(session=None):
+        updated = await event_schedule_collection().find_one_and_update(
+            {"_id": object_id},
+            {"$set": update_data, "$inc": {"version": 1}},
+            return_document=ReturnDocument.AFTER,
+            session=session,
+        )
+        if updated and match.get("match_type") == "league":
+            await result_outbox.enqueue(
+                _serialize_match(updated),
+                previous_status,
+                previous_winner,
+                request.state.user.get("reg_number"),
+                session=session,
+            )
+        return updated
+
+    if match.get("match_type") == "league" and result_outbox.transactions:
+        async with await client.start_session() as session:
+            updated_match = await session.with_transaction(apply_update)
+    else:
+        updated_match = await apply_update()
     if not updated_match:
         return handle_not_found_error("Match")
 
-    if match.get("match_type") == "league":
-        await update_points_table(
-            updated_match,
-            previous_status,
-            previous_winner,
-            request.state.user.get("reg_number"),
-            token=request.state.token,
-        )
-
     await clear_match_caches(updated_match, None, sport_doc)
+    await live_updates.publish(
+        updated_match.get("event_id"),
+        updated_match.get("sports_name"),
+        "match",
+        match_update_payload(_serialize_match(updated_match)),
+    )
     return send_success_response(
         {"match": _serialize_match(updated_match)}, "Match updated successfully"
     )
@@ -1,4 +1,5 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from .config import get_settings
 
@@ -10,3 +11,24 @@ db = client[settings.database_name]
 
 def points_table_collection():
     return db["points_tables"]
+
+
+INDEXES = {
+    "points_tables": [
+        IndexModel(
+            [("event_id", ASCENDING), ("sports_name", ASCENDING), ("participant", ASCENDING)],
+            name="event_id_sports_name_participant_unique",
+            unique=True,
+        ),
+        IndexModel(
+            [
+                ("event_id", ASCENDING),
+                ("sports_name", ASCENDING),
+                ("gender", ASCENDING),
+                ("points", DESCENDING),
+                ("matches_won", DESCENDING),
+            ],
+            name="event_id_sports_name_gender_standings",
+        ),
+    ],
+}
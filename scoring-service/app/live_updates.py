@@ -0,0 +1,254 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, ResponseError
+
+from .config import get_settings
+from .sport_helpers import normalize_sport_name
+from .standings import standings
+
+
+logger = logging.getLogger("scoring-service.live-updates")
+settings = get_settings()
+
+LIVE_STANDINGS_LIMIT = 10
+
+LiveMessage = Tuple[str, str, Dict[str, Any]]
+
+
+def live_key(event_id: Any, sport_name: str) -> str:
+    return f"{settings.live_updates_stream_prefix}{str(event_id).strip().lower()}:{normalize_sport_name(sport_name)}"
+
+
+def _stream_id(value: str) -> Tuple[int, int]:
+    millis, _, sequence = str(value).partition("-")
+    return int(millis), int(sequence or 0)
+
+
+def _is_stream_id(value: Optional[str]) -> bool:
+    try:
+        _stream_id(value or "")
+    except ValueError:
+        return False
+    return bool(value)
+
+
+def _decode(message_id: str, fields: Dict[str, str]) -> LiveMessage:
+    try:
+        data = json.loads(fields.get("data") or "{}")
+    except ValueError:
+        data = {}
+    return message_id, fields.get("type") or "message", data
+
+
+class _Subscriber:
+    def __init__(self, queue_size: int) -> None:
+        self.queue: "asyncio.Queue[LiveMessage]" = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+
+class _LiveHub:
+    def __init__(self, queue_size: int) -> None:
+        self._queue_size = queue_size
+        self._subscribers: Dict[str, Set[_Subscriber]] = {}
+        self._stats = {"published": 0, "delivered": 0, "overflowed": 0}
+
+    def _fan_out(self, key: str, message: LiveMessage) -> None:
+        for subscriber in list(self._subscribers.get(key, ())):
+            if subscriber.overflowed:
+                continue
+            try:
+                subscriber.queue.put_nowait(message)
+                self._stats["delivered"] += 1
+            except asyncio.QueueFull:
+                subscriber.overflowed = True
+                self._stats["overflowed"] += 1
+
+    async def _attach(self, key: str) -> None:
+        return None
+
+    def _detach(self, key: str) -> None:
+        return None
+
+    async def _replay(self, key: str, last_event_id: str) -> Tuple[bool, List[LiveMessage]]:
+        return False, []
+
+    async def subscribe(
+        self,
+        event_id: Any,
+        sport_name: str,
+        last_event_id: Optional[str] = None,
+        idle_ms: int = 15000,
+    ) -> AsyncIterator[Optional[LiveMessage]]:
+        key = live_key(event_id, sport_name)
+        subscriber = _Subscriber(self._queue_size)
+        self._subscribers.setdefault(key, set()).add(subscriber)
+        try:
+            await self._attach(key)
+            replayed = (0, 0)
+            if _is_stream_id(last_event_id):
+                truncated, messages = await self._replay(key, last_event_id)
+                if truncated:
+                    yield "", "reset", {}
+                for message in messages:
+                    replayed = _stream_id(message[0])
+                    yield message
+            while not subscriber.overflowed:
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), timeout=idle_ms / 1000)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if _stream_id(message[0]) <= replayed:
+                    continue
+                yield message
+        finally:
+            subscribers = self._subscribers.get(key)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[key]
+                    self._detach(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "topics": len(self._subscribers),
+            "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values()),
+        }
+
+
+class InMemoryLiveUpdates(_LiveHub):
+    def __init__(self, queue_size: int, maxlen: int) -> None:
+        super().__init__(queue_size)
+        self._maxlen = maxlen
+        self._history: Dict[str, Deque[LiveMessage]] = {}
+        self._last_id = (0, 0)
+
+    def _next_id(self) -> str:
+        millis = int(time.time() * 1000)
+        sequence = self._last_id[1] + 1 if millis <= self._last_id[0] else 0
+        self._last_id = (max(millis, self._last_id[0]), sequence)
+        return f"{self._last_id[0]}-{self._last_id[1]}"
+
+    async def publish(self, event_id: Any, sport_name: str, kind: str, data: Dict[str, Any]) -> None:
+        key = live_key(event_id, sport_name)
+        message = (self._next_id(), kind, json.loads(json.dumps(data, default=str)))
+        self._history.setdefault(key, deque(maxlen=self._maxlen)).append(message)
+        self._stats["published"] += 1
+        self._fan_out(key, message)
+
+    async def _replay(self, key: str, last_event_id: str) -> Tuple[bool, List[LiveMessage]]:
+        history = self._history.get(key) or deque()
+        last = _stream_id(last_event_id)
+        truncated = bool(history) and _stream_id(history[0][0]) > last and len(history) == self._maxlen
+        return truncated, [message for message in history if _stream_id(message[0]) > last]
+
+    async def close(self) -> None:
+        return None
+
+
+class RedisLiveUpdates(_LiveHub):
+    def __init__(self, redis_url: str, queue_size: int, maxlen: int, block_ms: int) -> None:
+        super().__init__(queue_size)
+        self._client = Redis.from_url(redis_url, decode_responses=True)
+        self._maxlen = maxlen
+        self._block_ms = block_ms
+        self._cursors: Dict[str, str] = {}
+        self._topics_changed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def publish(self, event_id: Any, sport_name: str, kind: str, data: Dict[str, Any]) -> None:
+        await self._client.xadd(
+            live_key(event_id, sport_name),
+            {"type": kind, "data": json.dumps(data, default=str)},
+            maxlen=self._maxlen,
+            approximate=True,
+        )
+        self._stats["published"] += 1
+
+    async def _attach(self, key: str) -> None:
+        if key in self._cursors:
+            return None
+        latest = await self._client.xrevrange(key, count=1)
+        if key not in self._subscribers:
+            return None
+        self._cursors.setdefault(key, latest[0][0] if latest else "0-0")
+        self._topics_changed.set()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def _detach(self, key: str) -> None:
+        self._cursors.pop(key, None)
+
+    async def _replay(self, key: str, last_event_id: str) -> Tuple[bool, List[LiveMessage]]:
+        try:
+            oldest = await self._client.xrange(key, count=1)
+            entries = await self._client.xrange(key, min=f"({last_event_id}", count=self._maxlen)
+        except ResponseError:
+            return True, []
+        truncated = bool(oldest) and _stream_id(oldest[0][0]) > _stream_id(last_event_id)
+        return truncated, [_decode(message_id, fields) for message_id, fields in entries]
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if not self._cursors:
+                    self._topics_changed.clear()
+                    await self._topics_changed.wait()
+                    continue
+                response = await self._client.xread(
+                    dict(self._cursors), count=100, block=self._block_ms
+                )
+                for key, messages in response or []:
+                    for message_id, fields in messages:
+                        if key in self._cursors:
+                            self._cursors[key] = message_id
+                        self._fan_out(key, _decode(message_id, fields))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Live update reader error: %s", exc)
+                await asyncio.sleep(1)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._client.aclose()
+
+
+async def publish_standings(event_id: Any, sport_name: str, gender: Optional[str]) -> None:
+    if gender not in {"Male", "Female"}:
+        return None
+    try:
+        result = await standings.top(event_id, sport_name, gender, LIVE_STANDINGS_LIMIT)
+        await live_updates.publish(
+            event_id,
+            sport_name,
+            "standings",
+            {"sport": normalize_sport_name(sport_name), "gender": gender, **result},
+        )
+    except (RedisError, OSError) as exc:
+        logger.warning("Failed to publish standings for %s (%s): %s", sport_name, event_id, exc)
+
+
+live_updates: Any = (
+    RedisLiveUpdates(
+        settings.results_stream_redis_url,
+        settings.live_updates_queue_size,
+        settings.live_updates_maxlen,
+        settings.live_updates_block_ms,
+    )
+    if settings.live_updates_backend == "redis"
+    else InMemoryLiveUpdates(settings.live_updates_queue_size, settings.live_updates_maxlen)
+)
@@ -1,113 +1,108 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
 
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from .config import get_settings
 from .db import points_table_collection
-from .external_services import fetch_matches_for_sport, fetch_sport
-from .gender_helpers import get_match_gender
+from .external_services import fetch_matches_for_sport, fetch_sport, fetch_sports
+from .gender_helpers import get_matches_gender
 from .sport_helpers import normalize_sport_name
+from .standings import ENTRY_PROJECTION, standings
+
+
+logger = logging.getLogger("scoring-service.points-table")
+settings = get_settings()
+
+DUPLICATE_KEY_ERROR = 11000
+APPLIED_RESULTS_LIMIT = 100
+POINTS_FIELDS = (
+    "points",
+    "matches_played",
+    "matches_won",
+    "matches_lost",
+    "matches_draw",
+    "matches_cancelled",
+)
 
 
-async def recalculate_points_table_for_gender(
+async def recalculate_points_table(
     sport_name: str,
     event_id: str,
-    gender: str,
     token: str = "",
-) -> None:
-    sport_doc = await fetch_sport(sport_name, event_id=event_id, token=token)
+    sport_doc: Optional[Dict[str, Any]] = None,
+) -> Dict[str, int]:
+    if sport_doc is None:
+        sport_doc = await fetch_sport(sport_name, event_id=event_id, token=token)
     if not sport_doc or sport_doc.get("type") not in {"dual_team", "dual_player"}:
-        return
+        return {"processed": 0, "updated": 0}
 
     normalized_sport = normalize_sport_name(sport_name)
     participant_type = "team" if sport_doc.get("type") == "dual_team" else "player"
 
     all_matches = await fetch_matches_for_sport(sport_name, event_id, token=token)
-    league_matches: List[Dict[str, Any]] = []
-    for match in all_matches:
-        if match.get("match_type") != "league":
-            continue
-        if match.get("status") not in {"completed", "draw", "cancelled"}:
-            continue
-        match_gender = await get_match_gender(match, sport_doc, token=token)
-        if match_gender == gender:
-            league_matches.append(match)
-
-    participants_set = set()
-    for match in league_matches:
-        participants = match.get("teams") if participant_type == "team" else match.get("players")
-        for participant in participants or []:
-            trimmed = (participant or "").strip()
-            if trimmed:
-                participants_set.add(trimmed)
-
-    points_map: Dict[str, Dict[str, int]] = {}
-    for participant in participants_set:
-        points_map[participant] = {
-            "points": 0,
-            "matches_played": 0,
-            "matches_won": 0,
-            "matches_lost": 0,
-            "matches_draw": 0,
-            "matches_cancelled": 0,
-        }
+    league_matches = [
+        match
+        for match in all_matches
+        if match.get("match_type") == "league"
+        and match.get("status") in {"completed", "draw", "cancelled"}
+    ]
+    match_genders = await get_matches_gender(league_matches, sport_doc, token=token)
 
-    for match in league_matches:
-        participants = match.get("teams") if participant_type == "team" else match.get("players")
-        if not participants:
+    totals: Dict[Tuple[str, str], Dict[str, int]] = {}
+    for match, gender in zip(league_matches, match_genders):
+        if gender not in {"Male", "Female"}:
             continue
+        participants = match.get("teams") if participant_type == "team" else match.get("players")
         trimmed_winner = match.get("winner")
         trimmed_winner = trimmed_winner.strip() if trimmed_winner else None
-        for participant in participants:
+        for participant in participants or []:
             trimmed_participant = (participant or "").strip()
             if not trimmed_participant:
                 continue
-            entry = points_map.get(trimmed_participant)
-            if not entry:
-                continue
-            entry["matches_played"] += 1
-            if match.get("status") == "completed" and trimmed_winner:
-                if trimmed_winner == trimmed_participant:
-                    entry["points"] += 2
-                    entry["matches_won"] += 1
-                else:
-                    entry["matches_lost"] += 1
-            elif match.get("status") == "draw":
-                entry["points"] += 1
-                entry["matches_draw"] += 1
-            elif match.get("status") == "cancelled":
-                entry["points"] += 1
-                entry["matches_cancelled"] += 1
-
-    for participant, stats in points_map.items():
-        existing = await points_table_collection().find_one(
-            {"event_id": event_id, "sports_name": normalized_sport, "participant": participant}
-        )
-        update_doc = {
-            "event_id": event_id,
-            "sports_name": normalized_sport,
-            "participant": participant,
-            "participant_type": participant_type,
-            "points": stats["points"],
-            "matches_played": stats["matches_played"],
-            "matches_won": stats["matches_won"],
-            "matches_lost": stats["matches_lost"],
-            "matches_draw": stats["matches_draw"],
-            "matches_cancelled": stats["matches_cancelled"],
-        }
-        if existing:
-            update_doc["updatedBy"] = existing.get("updatedBy")
-        await points_table_collection().update_one(
+            entry = totals.setdefault((gender, trimmed_participant), dict.fromkeys(POINTS_FIELDS, 0))
+            result = _result_stats(match.get("status"), trimmed_winner, trimmed_participant)
+            result["matches_played"] = 1
+            for field in POINTS_FIELDS:
+                entry[field] += result[field]
+
+    operations = [
+        UpdateOne(
             {"event_id": event_id, "sports_name": normalized_sport, "participant": participant},
-            {"$set": update_doc},
+            {
+                "$set": {
+                    "event_id": event_id,
+                    "sports_name": normalized_sport,
+                    "participant": participant,
+                    "participant_type": participant_type,
+                    "gender": gender,
+                    **stats,
+                }
+            },
             upsert=True,
         )
+        for (gender, participant), stats in totals.items()
+    ]
+    if operations:
+        await points_table_collection().bulk_write(operations, ordered=False)
+    entries = await points_table_collection().find(
+        {"event_id": event_id, "sports_name": normalized_sport}, ENTRY_PROJECTION
+    ).to_list(length=None)
+    await standings.replace(event_id, normalized_sport, entries)
+    return {"processed": len(league_matches), "updated": len(operations)}
 
 
 async def backfill_points_table_for_sport(
     sport_name: str,
     event_id: str,
     token: str = "",
+    sport_doc: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     try:
-        sport_doc = await fetch_sport(sport_name, event_id=event_id, token=token)
+        if sport_doc is None:
+            sport_doc = await fetch_sport(sport_name, event_id=event_id, token=token)
         if not sport_doc or sport_doc.get("type") not in {"dual_team", "dual_player"}:
             return {
                 "processed": 0,
@@ -115,34 +110,15 @@ async def backfill_points_table_for_sport(
                 "errors": 0,
                 "message": "Sport not found or not applicable for points table (must be dual_team or dual_player)",
             }
-        errors = 0
-        created = 0
-        try:
-            await recalculate_points_table_for_gender(sport_name, event_id, "Male", token=token)
-            created += 1
-        except Exception:
-            errors += 1
-        try:
-            await recalculate_points_table_for_gender(sport_name, event_id, "Female", token=token)
-            created += 1
-        except Exception:
-            errors += 1
-
-        matches = await fetch_matches_for_sport(sport_name, event_id, token=token)
-        completed_matches = [
-            match
-            for match in matches
-            if match.get("match_type") == "league"
-            and match.get("status") in {"completed", "draw", "cancelled"}
-        ]
-        processed = len(completed_matches)
+        result = await recalculate_points_table(sport_name, event_id, token=token, sport_doc=sport_doc)
         return {
-            "processed": processed,
-            "created": created * 2,
-            "errors": errors,
-            "message": f"Recalculated points table for {processed} matches (both genders), {errors} errors",
+            "processed": result["processed"],
+            "created": result["updated"],
+            "errors": 0,
+            "message": f"Recalculated points table for {result['processed']} matches (both genders), 0 errors",
         }
     except Exception as exc:
+        logger.exception("Points table backfill failed for %s (%s)", sport_name, event_id)
         return {
             "processed": 0,
             "created": 0,
@@ -151,6 +127,60 @@ async def backfill_points_table_for_sport(
         }
 
 
+async def backfill_points_tables_for_event(event_id: str, token: str = "") -> Dict[str, Any]:
+    sports = [
+        sport
+        for sport in await fetch_sports(event_id, token=token)
+        if sport.get("type") in {"dual_team", "dual_player"} and sport.get("name")
+    ]
+    semaphore = asyncio.Semaphore(max(1, settings.points_backfill_concurrency))
+
+    async def _backfill(sport_doc: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            result = await backfill_points_table_for_sport(
+                sport_doc.get("name"), event_id, token=token, sport_doc=sport_doc
+            )
+        return {"sport": sport_doc.get("name"), **result}
+
+    results = await asyncio.gather(*(_backfill(sport_doc) for sport_doc in sports))
+    return {
+        "sports": len(results),
+        "processed": sum(result["processed"] for result in results),
+        "created": sum(result["created"] for result in results),
+        "errors": sum(result["errors"] for result in results),
+        "results": results,
+    }
+
+
+def _result_stats(status: Optional[str], winner: Optional[str], participant: str) -> Dict[str, int]:
+    stats = dict.fromkeys(POINTS_FIELDS, 0)
+    if status == "completed" and winner:
+        if winner == participant:
+            stats["points"] = 2
+            stats["matches_won"] = 1
+        else:
+            stats["matches_lost"] = 1
+        stats["matches_played"] = 1
+    elif status == "draw":
+        stats["points"] = 1
+        stats["matches_draw"] = 1
+        stats["matches_played"] = 1
+    elif status == "cancelled":
+        stats["points"] = 1
+        stats["matches_cancelled"] = 1
+        stats["matches_played"] = 1
+    return stats
+
+
+def _result_key(match: Dict[str, Any], previous_status: str, previous_winner: Optional[str]) -> str:
+    if match.get("version") is not None:
+        return f"{match.get('_id')}:{match.get('version')}:{previous_status}->{match.get('status')}"
+    return (
+        f"{match.get('_id')}:{previous_status}:{previous_winner or ''}"
+        f"->{match.get('status')}:{match.get('winner') or ''}"
+    )
+
+
 async def update_points_table_for_match(
     match: Dict[str, Any],
     previous_status: str,
@@ -172,79 +202,80 @@ async def update_points_table_for_match(
 
     normalized_sport = normalize_sport_name(match.get("sports_name"))
     event_id = match.get("event_id")
+    gender = (await get_matches_gender([match], sport_doc, token=token))[0]
     trimmed_previous_winner = previous_winner.strip() if previous_winner else None
     trimmed_winner = match.get("winner").strip() if match.get("winner") else None
+    result_key = _result_key(match, previous_status, previous_winner)
 
-    for participant in participants:
-        trimmed_participant = (participant or "").strip()
-        if not trimmed_participant:
-            continue
+    names = list(dict.fromkeys((participant or "").strip() for participant in participants))
+    names = [name for name in names if name]
+    if not names:
+        return
+    row_filter = {"event_id": event_id, "sports_name": normalized_sport}
+    already_applied = {
+        row["participant"]
+        for row in await points_table_collection()
+        .find(
+            {**row_filter, "participant": {"$in": names}, "applied_results": result_key},
+            {"_id": 0, "participant": 1},
+        )
+        .to_list(length=None)
+    }
+    if already_applied:
+        logger.info("Points update %s already applied for %s participant(s)", result_key, len(already_applied))
 
-        existing = await points_table_collection().find_one(
-            {
-                "event_id": event_id,
-                "sports_name": normalized_sport,
-                "participant": trimmed_participant,
+    operations: List[UpdateOne] = []
+    for name in names:
+        if name in already_applied:
+            continue
+        previous = _result_stats(previous_status, trimmed_previous_winner, name)
+        current = _result_stats(match.get("status"), trimmed_winner, name)
+        set_fields: Dict[str, Any] = {
+            field: {
+                "$add": [
+                    {"$max": [0, {"$subtract": [{"$ifNull": [f"${field}", 0]}, previous[field]]}]},
+                    current[field],
+                ]
             }
+            for field in POINTS_FIELDS
+        }
+        set_fields["applied_results"] = {
+            "$slice": [
+                {"$concatArrays": [{"$ifNull": ["$applied_results", []]}, [{"$literal": result_key}]]},
+                -APPLIED_RESULTS_LIMIT,
+            ]
+        }
+        set_fields["participant_type"] = {"$ifNull": ["$participant_type", {"$literal": participant_type}]}
+        set_fields["createdBy"] = {"$ifNull": ["$createdBy", {"$literal": user_reg_number}]}
+        set_fields["updatedBy"] = (
+            {"$literal": user_reg_number} if user_reg_number else {"$ifNull": ["$updatedBy", None]}
         )
-        if not existing:
-            existing = {
-                "event_id": event_id,
-                "sports_name": normalized_sport,
-                "participant": trimmed_participant,
-                "participant_type": participant_type,
-                "points": 0,
-                "matches_played": 0,
-                "matches_won": 0,
-                "matches_lost": 0,
-                "matches_draw": 0,
-                "matches_cancelled": 0,
-                "createdBy": user_reg_number,
-                "updatedBy": None,
-            }
-        else:
-            if user_reg_number:
-                existing["updatedBy"] = user_reg_number
-
-        if previous_status == "completed" and trimmed_previous_winner:
-            if trimmed_previous_winner == trimmed_participant:
-                existing["points"] = max(0, existing["points"] - 2)
-                existing["matches_won"] = max(0, existing["matches_won"] - 1)
-            else:
-                existing["matches_lost"] = max(0, existing["matches_lost"] - 1)
-            existing["matches_played"] = max(0, existing["matches_played"] - 1)
-        elif previous_status == "draw":
-            existing["points"] = max(0, existing["points"] - 1)
-            existing["matches_draw"] = max(0, existing["matches_draw"] - 1)
-            existing["matches_played"] = max(0, existing["matches_played"] - 1)
-        elif previous_status == "cancelled":
-            existing["points"] = max(0, existing["points"] - 1)
-            existing["matches_cancelled"] = max(0, existing["matches_cancelled"] - 1)
-            existing["matches_played"] = max(0, existing["matches_played"] - 1)
-
-        if match.get("status") == "completed" and trimmed_winner:
-            if trimmed_winner == trimmed_participant:
-                existing["points"] += 2
-                existing["matches_won"] += 1
-            else:
-                existing["matches_lost"] += 1
-            existing["matches_played"] += 1
-        elif match.get("status") == "draw":
-            existing["points"] += 1
-            existing["matches_draw"] += 1
-            existing["matches_played"] += 1
-        elif match.get("status") == "cancelled":
-            existing["points"] += 1
-            existing["matches_cancelled"] += 1
-            existing["matches_played"] += 1
-
-        update_doc = {key: value for key, value in existing.items() if key != "_id"}
-        await points_table_collection().update_one(
-            {
-                "event_id": event_id,
-                "sports_name": normalized_sport,
-                "participant": trimmed_participant,
-            },
-            {"$set": update_doc},
-            upsert=True,
+        if gender:
+            set_fields["gender"] = {"$literal": gender}
+        operations.append(
+            UpdateOne(
+                {**row_filter, "participant": name, "applied_results": {"$ne": result_key}},
+                [{"$set": set_fields}],
+                upsert=True,
+            )
         )
+    if not operations:
+        return
+
+    try:
+        await points_table_collection().bulk_write(operations, ordered=False)
+    except BulkWriteError as exc:
+        errors = exc.details.get("writeErrors", [])
+        if any(error.get("code") != DUPLICATE_KEY_ERROR for error in errors):
+            raise
+        logger.info("Points update %s already applied for %s participant(s)", result_key, len(errors))
+
+    entries = await points_table_collection().find(
+        {
+            "event_id": event_id,
+            "sports_name": normalized_sport,
+            "participant": {"$in": names},
+        },
+        ENTRY_PROJECTION,
+    ).to_list(length=None)
+    await standings.update(event_id, normalized_sport, entries)
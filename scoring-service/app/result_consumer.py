@@ -0,0 +1,260 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import uuid4
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, ResponseError
+
+from .auth import create_access_token
+from .cache import cache, event_tag
+from .config import get_settings
+from .live_updates import publish_standings
+from .points_table import update_points_table_for_match
+from .sport_helpers import normalize_sport_name
+
+
+logger = logging.getLogger("scoring-service.result-consumer")
+settings = get_settings()
+
+DEDUPE_KEY_PREFIX = "results:applied:"
+PENDING_SCAN_LIMIT = 1000
+
+StreamMessage = Tuple[str, Optional[Dict[str, str]]]
+
+
+def _partition(fields: Optional[Dict[str, str]]) -> Tuple[str, str]:
+    return ((fields or {}).get("event_id", ""), (fields or {}).get("sports_name", ""))
+
+
+def _stream_id(message_id: str) -> Tuple[int, int]:
+    millis, _, sequence = message_id.partition("-")
+    return int(millis), int(sequence or 0)
+
+
+async def apply_match_result(payload: Dict[str, Any], token: str = "") -> None:
+    match = payload.get("match") or {}
+    await update_points_table_for_match(
+        match,
+        payload.get("previous_status"),
+        payload.get("previous_winner"),
+        payload.get("user_reg_number"),
+        token=token,
+    )
+    await cache.invalidate_tags(
+        event_tag(
+            f"/scorings/points-table/{normalize_sport_name(match.get('sports_name'))}",
+            match.get("event_id"),
+        )
+    )
+    await publish_standings(match.get("event_id"), match.get("sports_name"), match.get("gender"))
+
+
+class InMemoryResultConsumer:
+    async def start(self) -> None:
+        return None
+
+    async def get_stats(self) -> Dict[str, Any]:
+        return {"backend": "memory"}
+
+    async def close(self) -> None:
+        return None
+
+
+class RedisStreamResultConsumer:
+    def __init__(
+        self,
+        redis_url: str,
+        stream: str,
+        group: str,
+        batch_size: int,
+        block_ms: int,
+        max_attempts: int,
+        retry_idle_ms: int,
+        dedupe_ttl_s: int,
+    ) -> None:
+        self._client = Redis.from_url(redis_url, decode_responses=True)
+        self._stream = stream
+        self._group = group
+        self._consumer = uuid4().hex
+        self._batch_size = batch_size
+        self._block_ms = block_ms
+        self._max_attempts = max_attempts
+        self._retry_idle_ms = retry_idle_ms
+        self._dedupe_ttl_s = dedupe_ttl_s
+        self._group_ready = False
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"applied": 0, "duplicates": 0, "failures": 0, "dead_lettered": 0}
+
+    async def _ensure_group(self) -> None:
+        try:
+            await self._client.xgroup_create(self._stream, self._group, id="0", mkstream=True)
+        except ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+        self._group_ready = True
+
+    async def _dead_letter_or_retry(self, message_id: str, fields: Dict[str, str], exc: Exception) -> None:
+        pending = await self._client.xpending_range(
+            self._stream, self._group, min=message_id, max=message_id, count=1
+        )
+        deliveries = pending[0].get("times_delivered", 1) if pending else 1
+        if deliveries < self._max_attempts:
+            logger.warning("Applying match result %s failed (delivery %s): %s", message_id, deliveries, exc)
+            return
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.xadd(f"{self._stream}:dead", {**fields, "message_id": message_id, "error": str(exc)})
+            pipe.xack(self._stream, self._group, message_id)
+            await pipe.execute()
+        self._stats["dead_lettered"] += 1
+        logger.error("Dead-lettered match result %s after %s deliveries: %s", message_id, deliveries, exc)
+
+    async def _handle(self, message_id: str, fields: Optional[Dict[str, str]]) -> bool:
+        if not fields:
+            await self._client.xack(self._stream, self._group, message_id)
+            return True
+        dedupe_key = DEDUPE_KEY_PREFIX + (fields.get("id") or message_id)
+        if await self._client.exists(dedupe_key):
+            self._stats["duplicates"] += 1
+            await self._client.xack(self._stream, self._group, message_id)
+            return True
+        try:
+            await apply_match_result(
+                json.loads(fields.get("payload") or "{}"),
+                token=create_access_token({"reg_number": settings.admin_reg_number}),
+            )
+        except Exception as exc:
+            self._stats["failures"] += 1
+            await self._dead_letter_or_retry(message_id, fields, exc)
+            return False
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.set(dedupe_key, message_id, ex=self._dedupe_ttl_s)
+            pipe.xack(self._stream, self._group, message_id)
+            await pipe.execute()
+        self._stats["applied"] += 1
+        return True
+
+    async def _blocked_partitions(self, messages: List[StreamMessage]) -> Set[Tuple[str, str]]:
+        batch_ids = {message_id for message_id, _ in messages}
+        first_ids: Dict[Tuple[str, str], str] = {}
+        for message_id, fields in messages:
+            first_ids.setdefault(_partition(fields), message_id)
+        newest = max(first_ids.values(), key=_stream_id)
+        pending = await self._client.xpending_range(
+            self._stream, self._group, min="-", max=newest, count=PENDING_SCAN_LIMIT
+        )
+        older = [entry["message_id"] for entry in pending if entry["message_id"] not in batch_ids]
+        if not older:
+            return set()
+        async with self._client.pipeline(transaction=False) as pipe:
+            for message_id in older:
+                pipe.xrange(self._stream, min=message_id, max=message_id, count=1)
+            results = await pipe.execute()
+        blocked: Set[Tuple[str, str]] = set()
+        for message_id, entries in zip(older, results):
+            if not entries:
+                continue
+            key = _partition(entries[0][1])
+            if key in first_ids and _stream_id(message_id) < _stream_id(first_ids[key]):
+                blocked.add(key)
+        return blocked
+
+    async def _process(self, messages: List[StreamMessage]) -> None:
+        partitions: Dict[Tuple[str, str], List[StreamMessage]] = {}
+        for message_id, fields in messages:
+            partitions.setdefault(_partition(fields), []).append((message_id, fields))
+        for key in await self._blocked_partitions(messages):
+            logger.info(
+                "Deferring %s match results for %s (%s) behind an older pending result",
+                len(partitions.pop(key)),
+                key[1],
+                key[0],
+            )
+
+        async def _apply_in_order(entries: List[StreamMessage]) -> None:
+            for message_id, fields in entries:
+                if not await self._handle(message_id, fields):
+                    return
+
+        await asyncio.gather(*(_apply_in_order(entries) for entries in partitions.values()))
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if not self._group_ready:
+                    await self._ensure_group()
+                claimed = await self._client.xautoclaim(
+                    self._stream,
+                    self._group,
+                    self._consumer,
+                    min_idle_time=self._retry_idle_ms,
+                    start_id="0-0",
+                    count=self._batch_size,
+                )
+                if claimed[1]:
+                    await self._process(claimed[1])
+                response = await self._client.xreadgroup(
+                    self._group,
+                    self._consumer,
+                    {self._stream: ">"},
+                    count=self._batch_size,
+                    block=self._block_ms,
+                )
+                for _, messages in response or []:
+                    await self._process(messages)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                if isinstance(exc, ResponseError) and "NOGROUP" in str(exc):
+                    self._group_ready = False
+                logger.warning("Match result consumer error: %s", exc)
+                await asyncio.sleep(1)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def get_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {**self._stats, "consumer": self._consumer}
+        try:
+            for group in await self._client.xinfo_groups(self._stream):
+                if group.get("name") == self._group:
+                    stats["pending"] = group.get("pending")
+                    stats["lag"] = group.get("lag")
+            summary = await self._client.xpending(self._stream, self._group)
+        except RedisError as exc:
+            stats["error"] = str(exc)
+            return stats
+        oldest = summary.get("min") if summary else None
+        stats["oldest_pending_ms"] = (
+            int(time.time() * 1000) - int(str(oldest).split("-")[0]) if oldest else 0
+        )
+        return stats
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._client.aclose()
+
+
+result_consumer: Any = (
+    RedisStreamResultConsumer(
+        settings.results_stream_redis_url,
+        settings.results_stream,
+        settings.results_consumer_group,
+        settings.results_consumer_batch_size,
+        settings.results_consumer_block_ms,
+        settings.results_max_attempts,
+        settings.results_retry_idle_ms,
+        settings.results_dedupe_ttl_s,
+    )
+    if settings.results_stream_backend == "redis"
+    else InMemoryResultConsumer()
+)
@@ -0,0 +1,56 @@
+import json
+from typing import Any, AsyncIterator, Optional
+from urllib.parse import unquote
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from ..auth import auth_dependency
+from ..config import get_settings
+from ..external_services import get_event_year
+from ..live_updates import LiveMessage, live_updates
+
+
+router = APIRouter()
+settings = get_settings()
+
+RECONNECT_MS = 3000
+
+
+def _format_event(message: LiveMessage) -> str:
+    message_id, kind, data = message
+    lines = [f"id: {message_id}"] if message_id else []
+    lines.append(f"event: {kind}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def _event_stream(messages: AsyncIterator[Optional[LiveMessage]]) -> AsyncIterator[str]:
+    yield f"retry: {RECONNECT_MS}\n\n"
+    async for message in messages:
+        yield ": keep-alive\n\n" if message is None else _format_event(message)
+
+
+@router.get("/live/{sport}")
+async def stream_live_updates(
+    sport: str,
+    request: Request,
+    _: None = Depends(auth_dependency),
+):
+    sport = unquote(sport or "")
+    event_year_data = await get_event_year(
+        request.query_params.get("event_id"),
+        return_doc=True,
+        token=request.state.token,
+    )
+    event_id: Any = event_year_data.get("doc", {}).get("event_id")
+    last_event_id = request.headers.get("last-event-id") or request.query_params.get("last_event_id")
+
+    messages = live_updates.subscribe(
+        event_id, sport, last_event_id, idle_ms=settings.live_updates_heartbeat_ms
+    )
+    return StreamingResponse(
+        _event_stream(messages),
+        media_type="text/event-stream",
+        headers={"X-Accel-Buffering": "no"},
+    )
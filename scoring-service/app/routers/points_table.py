@@ -1,23 +1,29 @@
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, Optional, Tuple
 from urllib.parse import quote, unquote
 
 from fastapi import APIRouter, Depends, Request
 
-from ..auth import auth_dependency
-from ..cache import cache
+from ..auth import admin_dependency, auth_dependency
+from ..cache import cache, event_tag
 from ..coordinator_helpers import require_admin_or_coordinator
 from ..db import points_table_collection
 from ..errors import send_error_response, send_success_response
-from ..external_services import fetch_matches_for_sport, fetch_sport, get_event_year
-from ..gender_helpers import get_match_gender, get_points_entry_gender
-from ..points_table import backfill_points_table_for_sport, update_points_table_for_match
+from ..external_services import fetch_matches_for_sport, get_event_year
+from ..http_cache import conditional_etag, with_etag
+from ..live_updates import publish_standings
+from ..points_table import backfill_points_table_for_sport, backfill_points_tables_for_event
+from ..result_consumer import apply_match_result
 from ..sport_helpers import normalize_sport_name
+from ..standings import standings
 
 
 logger = logging.getLogger("scoring-service.points-table")
 router = APIRouter()
 
+DEFAULT_STANDINGS_LIMIT = 10
+MAX_STANDINGS_LIMIT = 100
+
 
 def _serialize_points_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
     data = dict(entry)
@@ -26,6 +32,45 @@ def _serialize_points_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
     return data
 
 
+async def _load_points_table(sport: str, event_id: Any, gender: str, token: str) -> Dict[str, Any]:
+    cursor = (
+        points_table_collection()
+        .find(
+            {"sports_name": normalize_sport_name(sport), "event_id": event_id, "gender": gender},
+            {"applied_results": 0},
+        )
+        .sort([("points", -1), ("matches_won", -1)])
+    )
+    points_entries = [_serialize_points_entry(entry) for entry in await cursor.to_list(length=None)]
+
+    has_league_matches = False
+    if not points_entries:
+        matches = await fetch_matches_for_sport(sport, event_id, token=token, gender=gender)
+        league_matches = [match for match in matches if match.get("match_type") == "league"]
+        has_league_matches = bool(league_matches)
+        if any(match.get("status") in {"completed", "draw", "cancelled"} for match in league_matches):
+            logger.warning(
+                "No points table entries found for %s (%s, %s) but completed matches exist.",
+                sport,
+                event_id,
+                gender,
+            )
+        elif not league_matches:
+            logger.info(
+                "No league matches found for %s (%s, %s).",
+                sport,
+                event_id,
+                gender,
+            )
+
+    return {
+        "sport": sport,
+        "points_table": points_entries,
+        "total_participants": len(points_entries),
+        "has_league_matches": has_league_matches,
+    }
+
+
 @router.get("/points-table/{sport}")
 async def get_points_table(
     sport: str,
@@ -55,94 +100,91 @@ async def get_points_table(
             400, 'Gender parameter is required and must be "Male" or "Female"'
         )
 
-    cache_key = f"/scorings/points-table/{sport}?event_id={quote(str(event_id))}&gender={gender}"
-    cached = cache.get(cache_key)
-    if cached:
-        return send_success_response(cached)
+    cache_key = f"/scorings/points-table/{normalize_sport_name(sport)}?event_id={quote(str(event_id))}&gender={gender}"
+    etag, not_modified = await conditional_etag(request, cache_key)
+    if not_modified is not None:
+        return not_modified
+    result = await cache.get_or_load(
+        cache_key, lambda: _load_points_table(sport, event_id, gender, request.state.token)
+    )
+    return with_etag(send_success_response(result), etag)
 
-    cursor = (
-        points_table_collection()
-        .find({"sports_name": normalize_sport_name(sport), "event_id": event_id})
-        .sort([("points", -1), ("matches_won", -1)])
+
+async def _standings_params(request: Request) -> Tuple[Any, Optional[str]]:
+    event_year_data = await get_event_year(
+        request.query_params.get("event_id"),
+        return_doc=True,
+        token=request.state.token,
     )
-    all_points_entries = await cursor.to_list(length=None)
+    event_id = event_year_data.get("doc", {}).get("event_id")
+    gender = request.query_params.get("gender")
+    if not gender or gender not in {"Male", "Female"}:
+        return None, None
+    return event_id, gender
 
+
+@router.get("/points-table/{sport}/standings")
+async def get_standings(
+    sport: str,
+    request: Request,
+    _: None = Depends(auth_dependency),
+):
+    sport = unquote(sport or "")
+    event_id, gender = await _standings_params(request)
+    if not gender:
+        return send_error_response(
+            400, 'Gender parameter is required and must be "Male" or "Female"'
+        )
     try:
-        sport_doc = await fetch_sport(sport, event_id=event_id, token=request.state.token)
-    except Exception:
-        sport_doc = None
-
-    if not all_points_entries:
-        matches = await fetch_matches_for_sport(sport, event_id, token=request.state.token)
-        completed_league_matches = [
-            match
-            for match in matches
-            if match.get("match_type") == "league"
-            and match.get("status") in {"completed", "draw", "cancelled"}
-        ]
-        league_matches_for_gender = 0
-        for match in matches:
-            if match.get("match_type") != "league":
-                continue
-            match_gender = await get_match_gender(match, sport_doc, token=request.state.token)
-            if match_gender == gender:
-                league_matches_for_gender += 1
-        if completed_league_matches and league_matches_for_gender == 0:
-            logger.warning(
-                "No points table entries found for %s (%s, %s) but completed matches exist.",
-                sport,
-                event_id,
-                gender,
-            )
-        elif league_matches_for_gender == 0:
-            logger.info(
-                "No league matches found for %s (%s, %s).",
-                sport,
-                event_id,
-                gender,
-            )
+        limit = int(request.query_params.get("limit") or DEFAULT_STANDINGS_LIMIT)
+    except ValueError:
+        return send_error_response(400, "limit must be a number")
+    limit = max(1, min(limit, MAX_STANDINGS_LIMIT))
 
-    points_entries: List[Dict[str, Any]] = []
-    entries_with_null_gender: List[Dict[str, Any]] = []
-    for entry in all_points_entries:
-        entry_gender = await get_points_entry_gender(entry, sport_doc, token=request.state.token)
-        if entry_gender == gender:
-            points_entries.append(_serialize_points_entry(entry))
-        elif entry_gender is None:
-            entries_with_null_gender.append(
-                {
-                    "participant": entry.get("participant"),
-                    "participant_type": entry.get("participant_type"),
-                }
-            )
-    if entries_with_null_gender:
-        logger.warning(
-            "Could not derive gender for %s entries in %s (%s): %s",
-            len(entries_with_null_gender),
-            sport,
-            event_id,
-            entries_with_null_gender[:5],
+    result = await standings.top(event_id, sport, gender, limit)
+    return send_success_response({"sport": sport, "gender": gender, **result})
+
+
+@router.get("/points-table/{sport}/standings/{participant}")
+async def get_participant_standing(
+    sport: str,
+    participant: str,
+    request: Request,
+    _: None = Depends(auth_dependency),
+):
+    sport = unquote(sport or "")
+    participant = unquote(participant or "").strip()
+    event_id, gender = await _standings_params(request)
+    if not gender:
+        return send_error_response(
+            400, 'Gender parameter is required and must be "Male" or "Female"'
         )
 
-    has_league_matches = False
-    if not points_entries:
-        matches = await fetch_matches_for_sport(sport, event_id, token=request.state.token)
-        for match in matches:
-            if match.get("match_type") != "league":
-                continue
-            match_gender = await get_match_gender(match, sport_doc, token=request.state.token)
-            if match_gender == gender:
-                has_league_matches = True
-                break
-
-    result = {
-        "sport": sport,
-        "points_table": points_entries,
-        "total_participants": len(points_entries),
-        "has_league_matches": has_league_matches,
-    }
-    cache.set(cache_key, result)
-    return send_success_response(result)
+    result = await standings.rank(event_id, sport, gender, participant)
+    if result is None:
+        return send_error_response(404, f'"{participant}" has no points table entry for this sport')
+    return send_success_response({"sport": sport, "gender": gender, **result})
+
+
+@router.post("/points-table/backfill")
+async def backfill_all_points_tables(
+    request: Request,
+    _: None = Depends(auth_dependency),
+    __: None = Depends(admin_dependency),
+):
+    event_year_data = await get_event_year(
+        request.query_params.get("event_id"),
+        return_doc=True,
+        token=request.state.token,
+    )
+    event_id = event_year_data.get("doc", {}).get("event_id")
+
+    result = await backfill_points_tables_for_event(event_id, token=request.state.token)
+    await cache.invalidate_tags(event_tag("/scorings/points-table", event_id))
+    return send_success_response(
+        result,
+        f"Recalculated points tables for {result['sports']} sports, {result['errors']} errors",
+    )
 
 
 @router.post("/points-table/backfill/{sport}")
@@ -168,8 +210,10 @@ async def backfill_points_table(
     if result.get("errors", 0) > 0 and result.get("processed", 0) == 0:
         return send_error_response(500, result.get("message", "Error backfilling points table"))
 
-    cache.clear(f"/scorings/points-table/{sport}?event_id={quote(str(event_id))}&gender=Male")
-    cache.clear(f"/scorings/points-table/{sport}?event_id={quote(str(event_id))}&gender=Female")
+    await cache.clear(f"/scorings/points-table/{normalize_sport_name(sport)}?event_id={quote(str(event_id))}&gender=Male")
+    await cache.clear(f"/scorings/points-table/{normalize_sport_name(sport)}?event_id={quote(str(event_id))}&gender=Female")
+    await publish_standings(event_id, sport, "Male")
+    await publish_standings(event_id, sport, "Female")
     return send_success_response(result, result.get("message") or "Points table backfilled successfully")
 
 
@@ -187,11 +231,13 @@ async def internal_points_table_update(
     if not match or not previous_status:
         return send_error_response(400, "match and previous_status are required")
 
-    await update_points_table_for_match(
-        match,
-        previous_status,
-        previous_winner,
-        user_reg_number,
+    await apply_match_result(
+        {
+            "match": match,
+            "previous_status": previous_status,
+            "previous_winner": previous_winner,
+            "user_reg_number": user_reg_number,
+        },
         token=request.state.token,
     )
     return send_success_response({"updated": True})
@@ -0,0 +1,176 @@
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from .config import get_settings
+from .db import points_table_collection
+from .sport_helpers import normalize_sport_name
+
+
+logger = logging.getLogger("scoring-service.standings")
+settings = get_settings()
+
+STANDINGS_KEY_PREFIX = "standings:"
+SCORE_SCALE = 1_000_000
+GENDERS = ("Male", "Female")
+ENTRY_PROJECTION = {"_id": 0, "participant": 1, "gender": 1, "points": 1, "matches_won": 1}
+UPDATE_IF_EXISTS_SCRIPT = """
+if redis.call("exists", KEYS[1]) == 1 then
+    return redis.call("zadd", KEYS[1], unpack(ARGV))
+end
+return 0
+"""
+
+
+def standings_key(event_id: Any, sport_name: str, gender: str) -> str:
+    return f"{STANDINGS_KEY_PREFIX}{event_id}:{normalize_sport_name(sport_name)}:{gender}"
+
+
+def standings_score(points: int, matches_won: int) -> int:
+    return int(points or 0) * SCORE_SCALE + int(matches_won or 0)
+
+
+def _decode_score(score: float) -> Tuple[int, int]:
+    points, matches_won = divmod(int(score), SCORE_SCALE)
+    return points, matches_won
+
+
+def _ranked(rows: List[Tuple[str, int, int]]) -> List[Dict[str, Any]]:
+    ranked: List[Dict[str, Any]] = []
+    for index, (participant, points, matches_won) in enumerate(rows):
+        rank = index + 1
+        if ranked and (ranked[-1]["points"], ranked[-1]["matches_won"]) == (points, matches_won):
+            rank = ranked[-1]["rank"]
+        ranked.append(
+            {"rank": rank, "participant": participant, "points": points, "matches_won": matches_won}
+        )
+    return ranked
+
+
+class StandingsStore:
+    def __init__(self, redis_url: str) -> None:
+        self._client = Redis.from_url(redis_url, decode_responses=True)
+
+    def _mapping(self, entries: List[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+        mappings: Dict[str, Dict[str, int]] = {}
+        for entry in entries:
+            if entry.get("gender") in GENDERS and entry.get("participant"):
+                mappings.setdefault(entry["gender"], {})[entry["participant"]] = standings_score(
+                    entry.get("points"), entry.get("matches_won")
+                )
+        return mappings
+
+    async def update(self, event_id: Any, sport_name: str, entries: List[Dict[str, Any]]) -> None:
+        mappings = self._mapping(entries)
+        if not mappings:
+            return None
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for gender, mapping in mappings.items():
+                    args = [value for member, score in mapping.items() for value in (score, member)]
+                    pipe.eval(UPDATE_IF_EXISTS_SCRIPT, 1, standings_key(event_id, sport_name, gender), *args)
+                await pipe.execute()
+        except RedisError as exc:
+            logger.warning("Failed to update standings for %s (%s): %s", sport_name, event_id, exc)
+            await self.drop(event_id, sport_name)
+
+    async def replace(self, event_id: Any, sport_name: str, entries: List[Dict[str, Any]]) -> None:
+        mappings = self._mapping(entries)
+        try:
+            async with self._client.pipeline(transaction=True) as pipe:
+                for gender in GENDERS:
+                    key = standings_key(event_id, sport_name, gender)
+                    pipe.delete(key)
+                    if mappings.get(gender):
+                        pipe.zadd(key, mappings[gender])
+                await pipe.execute()
+        except RedisError as exc:
+            logger.warning("Failed to rebuild standings for %s (%s): %s", sport_name, event_id, exc)
+
+    async def drop(self, event_id: Any, sport_name: str) -> None:
+        try:
+            await self._client.delete(*(standings_key(event_id, sport_name, gender) for gender in GENDERS))
+        except RedisError:
+            return None
+
+    async def _ensure(self, event_id: Any, sport_name: str, gender: str) -> str:
+        key = standings_key(event_id, sport_name, gender)
+        if not await self._client.exists(key):
+            entries = await points_table_collection().find(
+                {"event_id": event_id, "sports_name": normalize_sport_name(sport_name), "gender": gender},
+                ENTRY_PROJECTION,
+            ).to_list(length=None)
+            mapping = self._mapping(entries).get(gender)
+            if mapping:
+                await self._client.zadd(key, mapping, nx=True)
+        return key
+
+    async def top(self, event_id: Any, sport_name: str, gender: str, limit: int) -> Dict[str, Any]:
+        try:
+            key = await self._ensure(event_id, sport_name, gender)
+            async with self._client.pipeline(transaction=False) as pipe:
+                pipe.zrevrange(key, 0, limit - 1, withscores=True)
+                pipe.zcard(key)
+                members, total = await pipe.execute()
+            rows = [(member, *_decode_score(score)) for member, score in members]
+        except RedisError as exc:
+            logger.warning("Standings unavailable for %s (%s), reading Mongo: %s", sport_name, event_id, exc)
+            query = {"event_id": event_id, "sports_name": normalize_sport_name(sport_name), "gender": gender}
+            entries = (
+                await points_table_collection()
+                .find(query, ENTRY_PROJECTION)
+                .sort([("points", -1), ("matches_won", -1), ("participant", -1)])
+                .to_list(length=limit)
+            )
+            total = await points_table_collection().count_documents(query)
+            rows = [
+                (entry.get("participant"), entry.get("points") or 0, entry.get("matches_won") or 0)
+                for entry in entries
+            ]
+        return {"standings": _ranked(rows), "total_participants": total}
+
+    async def rank(
+        self, event_id: Any, sport_name: str, gender: str, participant: str
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            key = await self._ensure(event_id, sport_name, gender)
+            score = await self._client.zscore(key, participant)
+            if score is None:
+                return None
+            async with self._client.pipeline(transaction=False) as pipe:
+                pipe.zcount(key, f"({int(score)}", "+inf")
+                pipe.zcard(key)
+                higher, total = await pipe.execute()
+            points, matches_won = _decode_score(score)
+        except RedisError as exc:
+            logger.warning("Standings unavailable for %s (%s), reading Mongo: %s", sport_name, event_id, exc)
+            query = {"event_id": event_id, "sports_name": normalize_sport_name(sport_name), "gender": gender}
+            entry = await points_table_collection().find_one({**query, "participant": participant})
+            if not entry:
+                return None
+            points, matches_won = entry.get("points") or 0, entry.get("matches_won") or 0
+            higher = await points_table_collection().count_documents(
+                {
+                    **query,
+                    "$or": [
+                        {"points": {"$gt": points}},
+                        {"points": points, "matches_won": {"$gt": matches_won}},
+                    ],
+                }
+            )
+            total = await points_table_collection().count_documents(query)
+        return {
+            "participant": participant,
+            "rank": higher + 1,
+            "points": points,
+            "matches_won": matches_won,
+            "total_participants": total,
+        }
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+standings = StandingsStore(settings.redis_url)
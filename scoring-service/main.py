@@ -1,6 +1,7 @@
 import logging
 import logging.config
 import time
+from contextlib import asynccontextmanager
 from pathlib import Path
 from uuid import uuid4
 
@@ -11,10 +12,20 @@ from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.responses import FileResponse, HTMLResponse, Response
 
 from app.auth import _ResponseException
+from app.cache import cache
+from app.cache_events import register_cache_event_handlers
 from app.config import get_settings
 from app.date_restrictions import check_registration_deadline
 from app.errors import send_error_response
+from app.event_bus import event_bus
+from app.http_cache import apply_cache_headers
+from app.http_client import close_http_clients, get_pool_stats
+from app.indexes import ensure_indexes
+from app.live_updates import live_updates
+from app.result_consumer import result_consumer
+from app.routers import live as live_router
 from app.routers import points_table as points_table_router
+from app.standings import standings
 
 
 settings = get_settings()
@@ -46,7 +57,31 @@ structlog.configure(
     cache_logger_on_first_use=True,
 )
 
-app = FastAPI(title="Scoring Service", version="0.1.0", docs_url=None, redoc_url=None)
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    if settings.mongodb_ensure_indexes:
+        await ensure_indexes()
+    register_cache_event_handlers()
+    await cache.start()
+    await event_bus.start()
+    await result_consumer.start()
+    yield
+    await result_consumer.close()
+    await close_http_clients()
+    await event_bus.close()
+    await cache.close()
+    await live_updates.close()
+    await standings.close()
+
+
+app = FastAPI(
+    title="Scoring Service",
+    version="0.1.0",
+    docs_url=None,
+    redoc_url=None,
+    lifespan=lifespan,
+)
 logger = structlog.get_logger("scoring-service")
 swagger_path = Path(__file__).with_name("swagger.yaml")
 app.add_middleware(
@@ -64,12 +99,9 @@ async def response_exception_handler(_: Request, exc: _ResponseException):
 
 
 @app.middleware("http")
-async def no_cache_headers(request: Request, call_next):
+async def cache_headers(request: Request, call_next):
     response = await call_next(request)
-    response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, private"
-    response.headers["Pragma"] = "no-cache"
-    response.headers["Expires"] = "0"
-    return response
+    return apply_cache_headers(request, response)
 
 
 @app.middleware("http")
@@ -124,6 +156,7 @@ async def preflight_middleware(request: Request, call_next):
 
 
 app.include_router(points_table_router.router, prefix="/scorings")
+app.include_router(live_router.router, prefix="/scorings")
 
 
 @app.get("/scorings/swagger.yaml", include_in_schema=False)
@@ -161,6 +194,26 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/health/http-pool")
+async def health_http_pool():
+    return {"pools": get_pool_stats()}
+
+
+@app.get("/health/cache")
+async def health_cache():
+    return {"cache": cache.get_stats()}
+
+
+@app.get("/health/results")
+async def health_results():
+    return {"consumer": await result_consumer.get_stats()}
+
+
+@app.get("/health/live")
+async def health_live():
+    return {"live": live_updates.get_stats()}
+
+
 @app.exception_handler(Exception)
 async def unhandled_exception_handler(_: Request, exc: Exception):
     logging.exception("Unhandled error: %s", exc)
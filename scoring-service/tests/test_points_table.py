@@ -0,0 +1,39 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app import points_table
+
+
+SPORT_DOC = {"name": "chess", "type": "dual_player"}
+MATCHES = [
+    {"match_type": "league", "status": "completed", "winner": "P1", "players": ["P1", "P2"]},
+    {"match_type": "league", "status": "draw", "players": ["P1", "P3"]},
+]
+ENTRIES = [{"participant": "P1", "gender": "Male", "points": 3, "matches_won": 1}]
+
+
+class RecalculatePointsTableTest(unittest.IsolatedAsyncioTestCase):
+    async def test_recalculation_rebuilds_standings(self) -> None:
+        collection = MagicMock()
+        collection.bulk_write = AsyncMock()
+        collection.find.return_value.to_list = AsyncMock(return_value=ENTRIES)
+        store = MagicMock()
+        store.replace = AsyncMock()
+
+        with patch.object(points_table, "fetch_matches_for_sport", AsyncMock(return_value=MATCHES)), patch.object(
+            points_table, "get_matches_gender", AsyncMock(return_value=["Male", "Male"])
+        ), patch.object(points_table, "points_table_collection", return_value=collection), patch.object(
+            points_table, "standings", store
+        ):
+            result = await points_table.backfill_points_table_for_sport(
+                "chess", "2026-sports", sport_doc=SPORT_DOC
+            )
+
+        self.assertEqual(result["errors"], 0, result["message"])
+        self.assertEqual(result["processed"], 2)
+        self.assertEqual(result["created"], 3)
+        store.replace.assert_awaited_once_with("2026-sports", "chess", ENTRIES)
+
+
+if __name__ == "__main__":
+    unittest.main()
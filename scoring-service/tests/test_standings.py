@@ -0,0 +1,104 @@
+import unittest
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+
+from app import standings as standings_module
+from app.standings import UPDATE_IF_EXISTS_SCRIPT, StandingsStore, standings_score
+
+
+ENTRIES = [
+    {"participant": "P1", "gender": "Male", "points": 6, "matches_won": 2},
+    {"participant": "P2", "gender": "Male", "points": 3, "matches_won": 1},
+    {"participant": "P3", "gender": "Male", "points": 0, "matches_won": 0},
+]
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.zsets: Dict[str, Dict[str, float]] = {}
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+    async def delete(self, *keys: str) -> int:
+        return sum(self.zsets.pop(key, None) is not None for key in keys)
+
+    async def exists(self, key: str) -> int:
+        return int(key in self.zsets)
+
+    async def zadd(self, key: str, mapping: Dict[str, float], nx: bool = False) -> int:
+        zset = self.zsets.setdefault(key, {})
+        for member, score in mapping.items():
+            if not (nx and member in zset):
+                zset[member] = score
+        return len(mapping)
+
+    async def eval(self, script: str, numkeys: int, key: str, *args: Any) -> int:
+        assert script == UPDATE_IF_EXISTS_SCRIPT
+        if key not in self.zsets:
+            return 0
+        return await self.zadd(key, dict(zip(args[1::2], args[0::2])))
+
+    async def zrevrange(self, key: str, start: int, end: int, withscores: bool = False) -> List[Any]:
+        ordered = sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1], reverse=True)
+        return ordered[start : end + 1]
+
+    async def zcard(self, key: str) -> int:
+        return len(self.zsets.get(key, {}))
+
+
+class FakePipeline:
+    def __init__(self, client: FakeRedis) -> None:
+        self._client = client
+        self._calls: List[Any] = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    def __getattr__(self, name: str) -> Any:
+        return lambda *args, **kwargs: self._calls.append(getattr(self._client, name)(*args, **kwargs))
+
+    async def execute(self) -> List[Any]:
+        return [await call for call in self._calls]
+
+
+class StandingsUpdateTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.store = StandingsStore.__new__(StandingsStore)
+        self.store._client = FakeRedis()
+        self.collection = MagicMock()
+        self.collection.return_value.find.return_value.to_list = self._load_entries
+
+    async def _load_entries(self, length: Any = None) -> List[Dict[str, Any]]:
+        return ENTRIES
+
+    async def test_update_skips_missing_standings(self) -> None:
+        await self.store.update("2026-sports", "chess", [{**ENTRIES[2], "points": 3, "matches_won": 1}])
+
+        self.assertEqual(self.store._client.zsets, {})
+        with patch.object(standings_module, "points_table_collection", self.collection):
+            result = await self.store.top("2026-sports", "chess", "Male", 10)
+
+        self.assertEqual(result["total_participants"], 3)
+        self.assertEqual([row["participant"] for row in result["standings"]], ["P1", "P2", "P3"])
+
+    async def test_update_applies_to_existing_standings(self) -> None:
+        await self.store.replace("2026-sports", "chess", ENTRIES)
+        await self.store.update("2026-sports", "chess", [{**ENTRIES[2], "points": 9, "matches_won": 3}])
+
+        with patch.object(standings_module, "points_table_collection", self.collection):
+            result = await self.store.top("2026-sports", "chess", "Male", 10)
+
+        self.assertEqual(result["standings"][0]["participant"], "P3")
+        self.assertEqual(result["total_participants"], 3)
+        self.collection.assert_not_called()
+        self.assertEqual(
+            self.store._client.zsets["standings:2026-sports:chess:Male"]["P3"], standings_score(9, 3)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,22 @@
+from typing import Any, Dict
+
+from .cache import cache, event_tag
+from .event_bus import BATCH_CHANGED, EVENT_YEAR_CHANGED, PLAYER_CHANGED, event_bus
+
+
+async def _evict_active_event_year(_: Dict[str, Any]) -> None:
+    await cache.clear("/event-configurations/event-years/active")
+
+
+async def _evict_teams(payload: Dict[str, Any]) -> None:
+    event_id = payload.get("event_id")
+    if event_id:
+        await cache.invalidate_tags(event_tag("/sports-participations/teams", event_id))
+    else:
+        await cache.invalidate_tags("/sports-participations/teams")
+
+
+def register_cache_event_handlers() -> None:
+    event_bus.subscribe(EVENT_YEAR_CHANGED, _evict_active_event_year)
+    event_bus.subscribe(PLAYER_CHANGED, _evict_teams)
+    event_bus.subscribe(BATCH_CHANGED, _evict_teams)
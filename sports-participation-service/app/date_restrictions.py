@@ -105,6 +105,7 @@ async def check_registration_deadline(request: Request) -> Optional[Any]:
         "/identities/login",
         "/identities/change-password",
         "/identities/reset-password",
+        "/sports-participations/participations/lookup",
     }:
         return None
     try:
@@ -1,4 +1,5 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, IndexModel
 
 from .config import get_settings
 
@@ -10,3 +11,30 @@ db = client[settings.database_name]
 
 def sports_collection():
     return db["sports"]
+
+
+def participations_collection():
+    return db["player_participations"]
+
+
+INDEXES = {
+    "sports": [
+        IndexModel(
+            [("event_id", ASCENDING), ("name", ASCENDING)],
+            name="event_id_name_unique",
+            unique=True,
+        ),
+        IndexModel(
+            [("event_id", ASCENDING), ("category", ASCENDING), ("name", ASCENDING)],
+            name="event_id_category_name",
+        ),
+    ],
+    "player_participations": [
+        IndexModel(
+            [("event_id", ASCENDING), ("reg_number", ASCENDING), ("sport_id", ASCENDING)],
+            name="event_id_reg_number_sport_id_unique",
+            unique=True,
+        ),
+        IndexModel([("sport_id", ASCENDING)], name="sport_id"),
+    ],
+}
@@ -2,14 +2,14 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-import httpx
-
 from .cache import cache
 from .config import get_settings
+from .http_client import request_json
 
 
 logger = logging.getLogger("sports-participation.external")
 settings = get_settings()
+PLAYER_LOOKUP_CHUNK_SIZE = 500
 
 
 def _auth_headers(token: str) -> Dict[str, str]:
@@ -22,12 +22,22 @@ async def _get_json(
     url: str,
     params: Optional[Dict[str, Any]] = None,
     token: str = "",
-    timeout: float = 30.0,
+    timeout: Optional[float] = None,
+) -> Any:
+    return await request_json(
+        "GET", url, params=params, headers=_auth_headers(token), timeout=timeout
+    )
+
+
+async def _post_json(
+    url: str,
+    payload: Dict[str, Any],
+    token: str = "",
+    timeout: Optional[float] = None,
 ) -> Any:
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        response = await client.get(url, params=params, headers=_auth_headers(token))
-        response.raise_for_status()
-        return response.json()
+    return await request_json(
+        "POST", url, json=payload, headers=_auth_headers(token), timeout=timeout
+    )
 
 
 def _parse_date(value: Any) -> Optional[datetime]:
@@ -55,11 +65,11 @@ def should_event_year_be_active(event_year_doc: Dict[str, Any]) -> bool:
 
 
 async def get_active_event_year() -> Optional[Dict[str, Any]]:
-    cached = cache.get("/event-configurations/event-years/active")
+    cached = await cache.get("/event-configurations/event-years/active")
     if cached and should_event_year_be_active(cached):
         return cached
     if cached:
-        cache.clear("/event-configurations/event-years/active")
+        await cache.clear("/event-configurations/event-years/active")
     if not settings.event_configuration_url:
         return None
     data = await _get_json(
@@ -67,7 +77,7 @@ async def get_active_event_year() -> Optional[Dict[str, Any]]:
     )
     event_year = data.get("eventYear")
     if event_year:
-        cache.set("/event-configurations/event-years/active", event_year)
+        await cache.set("/event-configurations/event-years/active", event_year)
     return event_year
 
 
@@ -147,41 +157,48 @@ async def fetch_player(
     reg_number: str,
     event_id: Optional[str] = None,
     token: str = "",
+    fields: Optional[List[str]] = None,
+    include_participation: bool = True,
 ) -> Optional[Dict[str, Any]]:
-    if not settings.identity_url:
-        raise RuntimeError("IDENTITY_URL is not configured")
-    params: Dict[str, Any] = {"search": reg_number}
-    if event_id:
-        params["event_id"] = event_id
-    data = await _get_json(
-        f"{settings.identity_url}/identities/players",
-        params=params,
+    players = await fetch_players_by_reg_numbers(
+        [reg_number],
+        event_id,
         token=token,
+        fields=fields,
+        include_participation=include_participation,
     )
-    players = data.get("players", [])
-    for player in players:
-        if player.get("reg_number") == reg_number:
-            return player
-    return None
+    return next((player for player in players if player.get("reg_number") == reg_number), None)
 
 
 async def fetch_players_by_reg_numbers(
     reg_numbers: List[str],
     event_id: Optional[str],
     token: str = "",
+    fields: Optional[List[str]] = None,
+    include_participation: bool = True,
 ) -> List[Dict[str, Any]]:
     if not reg_numbers:
         return []
-    if len(reg_numbers) <= 5:
-        players = []
-        for reg in reg_numbers:
-            player = await fetch_player(reg, event_id=event_id, token=token)
-            if player:
-                players.append(player)
-        return players
-    all_players = await fetch_players(event_id=event_id, token=token)
-    reg_set = set(reg_numbers)
-    return [player for player in all_players if player.get("reg_number") in reg_set]
+    if not settings.identity_url:
+        raise RuntimeError("IDENTITY_URL is not configured")
+    unique_reg_numbers = list(dict.fromkeys(reg_numbers))
+    players: List[Dict[str, Any]] = []
+    for start in range(0, len(unique_reg_numbers), PLAYER_LOOKUP_CHUNK_SIZE):
+        payload: Dict[str, Any] = {
+            "reg_numbers": unique_reg_numbers[start : start + PLAYER_LOOKUP_CHUNK_SIZE],
+            "include_participation": include_participation,
+        }
+        if fields:
+            payload["fields"] = fields
+        if event_id:
+            payload["event_id"] = event_id
+        data = await _post_json(
+            f"{settings.identity_url}/identities/players/lookup",
+            payload,
+            token=token,
+        )
+        players.extend(data.get("players", []))
+    return players
 
 
 async def get_identity_me(token: str) -> Optional[Dict[str, Any]]:
@@ -209,6 +226,27 @@ async def get_matches_for_sport(
     return data.get("matches", [])
 
 
+async def get_matches_for_sports(
+    sport_names: List[str],
+    event_id: str,
+    reg_numbers: Optional[List[str]] = None,
+    token: str = "",
+) -> List[Dict[str, Any]]:
+    if not sport_names:
+        return []
+    if not settings.scheduling_url:
+        raise RuntimeError("SCHEDULING_URL is not configured")
+    payload: Dict[str, Any] = {"sports": sport_names, "event_id": event_id}
+    if reg_numbers:
+        payload["reg_numbers"] = reg_numbers
+    data = await _post_json(
+        f"{settings.scheduling_url}/schedulings/event-schedule/lookup",
+        payload,
+        token=token,
+    )
+    return data.get("matches", [])
+
+
 async def get_points_table_entries(
     sport_name: str,
     event_id: str,
@@ -0,0 +1,148 @@
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from typing import Any, Dict, List, Optional
+
+from pymongo import DeleteMany, UpdateOne
+
+from .db import participations_collection, sports_collection
+
+
+logger = logging.getLogger("sports-participation.participation-index")
+
+MAX_LOOKUP_REG_NUMBERS = 1000
+PLAYER_RULE = "player"
+
+
+def empty_participation() -> Dict[str, List[Any]]:
+    return {"participated_in": [], "captain_in": [], "coordinator_in": []}
+
+
+def participation_rows(sport_doc: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    rows: Dict[str, Dict[str, Any]] = {}
+
+    def _row(reg_number: str) -> Dict[str, Any]:
+        return rows.setdefault(
+            reg_number,
+            {
+                "team_name": None,
+                "participant": False,
+                "captain": False,
+                "team_captain": False,
+                "coordinator": False,
+            },
+        )
+
+    for reg_number in sport_doc.get("eligible_coordinators") or []:
+        _row(reg_number)["coordinator"] = True
+    for reg_number in sport_doc.get("eligible_captains") or []:
+        _row(reg_number)["captain"] = True
+    for team in sport_doc.get("teams_participated") or []:
+        captain = team.get("captain")
+        if captain:
+            row = _row(captain)
+            row.update(
+                {
+                    "captain": True,
+                    "team_captain": True,
+                    "participant": True,
+                    "team_name": team.get("team_name"),
+                }
+            )
+        for member in team.get("players") or []:
+            if member and member != captain:
+                row = _row(member)
+                row.update({"participant": True, "team_name": team.get("team_name")})
+    for reg_number in sport_doc.get("players_participated") or []:
+        _row(reg_number)["participant"] = True
+    return rows
+
+
+async def refresh_sport_participation(sport_doc: Dict[str, Any]) -> None:
+    sport_id = sport_doc.get("_id")
+    rows = participation_rows(sport_doc)
+    operations: List[Any] = [
+        DeleteMany({"sport_id": sport_id, "reg_number": {"$nin": list(rows)}})
+    ]
+    for reg_number, row in rows.items():
+        operations.append(
+            UpdateOne(
+                {"event_id": sport_doc.get("event_id"), "reg_number": reg_number, "sport_id": sport_id},
+                {"$set": {**row, "sport": sport_doc.get("name"), "category": sport_doc.get("category")}},
+                upsert=True,
+            )
+        )
+    await participations_collection().bulk_write(operations, ordered=False)
+
+
+async def drop_sport_participation(sport_id: Any) -> None:
+    await participations_collection().delete_many({"sport_id": sport_id})
+
+
+async def lookup_participation(
+    reg_numbers: List[str],
+    event_id: str,
+    rule: Optional[str] = None,
+) -> Dict[str, Dict[str, List[Any]]]:
+    result = {reg_number: empty_participation() for reg_number in reg_numbers}
+    if not result:
+        return result
+
+    rows = (
+        await participations_collection()
+        .find(
+            {"event_id": str(event_id).strip().lower(), "reg_number": {"$in": list(result)}},
+            {"_id": 0, "sport_id": 0},
+        )
+        .sort([("reg_number", 1), ("category", 1), ("sport", 1)])
+        .to_list(length=None)
+    )
+    for row in rows:
+        participation = result[row["reg_number"]]
+        participant = row.get("participant")
+        if rule == PLAYER_RULE and row.get("captain") and not row.get("team_captain"):
+            participant = False
+        if participant:
+            participation["participated_in"].append(
+                {"sport": row.get("sport"), "team_name": row.get("team_name")}
+            )
+        if row.get("captain"):
+            participation["captain_in"].append(row.get("sport"))
+        if row.get("coordinator"):
+            participation["coordinator_in"].append(row.get("sport"))
+    return result
+
+
+async def rebuild_participation_index(event_ids: List[str]) -> Dict[str, int]:
+    query: Dict[str, Any] = {}
+    if event_ids:
+        query["event_id"] = {"$in": [str(event_id).strip().lower() for event_id in event_ids]}
+    sports = await sports_collection().find(query).to_list(length=None)
+    for sport_doc in sports:
+        await refresh_sport_participation(sport_doc)
+
+    sport_ids = [sport_doc["_id"] for sport_doc in sports]
+    orphan_query: Dict[str, Any] = {"sport_id": {"$nin": sport_ids}}
+    if event_ids:
+        orphan_query["event_id"] = query["event_id"]
+    removed = await participations_collection().delete_many(orphan_query)
+    return {"sports": len(sports), "orphans_removed": removed.deleted_count}
+
+
+async def _run(event_ids: List[str]) -> int:
+    result = await rebuild_participation_index(event_ids)
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the reg_number participation index from sports")
+    parser.add_argument("event_ids", nargs="*", help="event ids to rebuild (default: all)")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(_run(args.event_ids)))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,11 +9,13 @@ from ..cache import cache
 from ..date_restrictions import require_registration_period
 from ..db import sports_collection
 from ..errors import handle_not_found_error, send_error_response, send_success_response
+from ..event_bus import PARTICIPATION_CHANGED, event_bus
 from ..external_services import (
     fetch_player,
     fetch_players_by_reg_numbers,
     get_event_year,
 )
+from ..participation_index import refresh_sport_participation
 from ..player_helpers import compute_players_participation_batch, serialize_player
 from ..sport_helpers import find_sport_by_name_and_id
 from ..validators import trim_object_fields, validate_captain_assignment
@@ -80,11 +82,11 @@ async def add_coordinator(
     sport_doc["eligible_coordinators"] = eligible_coordinators
     update_doc = {key: value for key, value in sport_doc.items() if key != "_id"}
     await sports_collection().update_one({"_id": sport_doc.get("_id")}, {"$set": update_doc})
+    await refresh_sport_participation(sport_doc)
 
-    cache.clear(f"/sports-participations/sports?event_id={quote(str(resolved_event_id))}")
-    cache.clear(f"/sports-participations/sports/{sport}?event_id={quote(str(resolved_event_id))}")
-    cache.clear_pattern("/identities/players")
-    cache.clear_pattern("/identities/me")
+    await cache.clear(f"/sports-participations/sports?event_id={quote(str(resolved_event_id))}")
+    await cache.clear(f"/sports-participations/sports/{sport}?event_id={quote(str(resolved_event_id))}")
+    await event_bus.publish(PARTICIPATION_CHANGED, {"event_id": resolved_event_id, "sport": sport})
 
     return send_success_response(
         {"sport": _serialize_sport(sport_doc)},
@@ -124,11 +126,11 @@ async def remove_coordinator(
     ]
     update_doc = {key: value for key, value in sport_doc.items() if key != "_id"}
     await sports_collection().update_one({"_id": sport_doc.get("_id")}, {"$set": update_doc})
+    await refresh_sport_participation(sport_doc)
 
-    cache.clear(f"/sports-participations/sports?event_id={quote(str(resolved_event_id))}")
-    cache.clear(f"/sports-participations/sports/{sport}?event_id={quote(str(resolved_event_id))}")
-    cache.clear_pattern("/identities/players")
-    cache.clear_pattern("/identities/me")
+    await cache.clear(f"/sports-participations/sports?event_id={quote(str(resolved_event_id))}")
+    await cache.clear(f"/sports-participations/sports/{sport}?event_id={quote(str(resolved_event_id))}")
+    await event_bus.publish(PARTICIPATION_CHANGED, {"event_id": resolved_event_id, "sport": sport})
 
     return send_success_response(
         {"sport": _serialize_sport(sport_doc)},
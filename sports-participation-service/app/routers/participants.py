@@ -1,8 +1,11 @@
+import asyncio
 import logging
-from typing import List
+from typing import Any, Dict, List, Optional
 from urllib.parse import quote, unquote
 
 from fastapi import APIRouter, Depends, Request
+from fastapi.responses import JSONResponse
+from pymongo import UpdateOne
 
 from ..auth import admin_dependency, auth_dependency, get_request_token
 from ..cache import cache
@@ -10,11 +13,18 @@ from ..coordinator_helpers import require_admin_or_coordinator
 from ..date_restrictions import require_registration_period
 from ..db import sports_collection
 from ..errors import handle_not_found_error, send_error_response, send_success_response
+from ..event_bus import PARTICIPATION_CHANGED, event_bus
 from ..external_services import (
     fetch_player,
     fetch_players_by_reg_numbers,
     get_event_year,
     get_matches_for_sport,
+    get_matches_for_sports,
+)
+from ..participation_index import (
+    MAX_LOOKUP_REG_NUMBERS,
+    lookup_participation,
+    refresh_sport_participation,
 )
 from ..player_helpers import serialize_player
 from ..sport_helpers import find_sport_by_name_and_id, normalize_sport_name
@@ -23,6 +33,7 @@ from ..validators import trim_object_fields
 
 logger = logging.getLogger("sports-participation.participants")
 router = APIRouter()
+MAX_BULK_REMOVALS = 500
 
 
 def serialize_sport(sport: dict) -> dict:
@@ -32,6 +43,36 @@ def serialize_sport(sport: dict) -> dict:
     return data
 
 
+def _remove_player_from_sport(
+    sport_doc: Dict[str, Any],
+    reg_number: str,
+    matches: List[Dict[str, Any]],
+) -> Optional[str]:
+    teams = sport_doc.get("teams_participated") or []
+    team_index = next(
+        (index for index, team in enumerate(teams) if reg_number in (team.get("players") or [])),
+        -1,
+    )
+    if team_index != -1:
+        team = teams[team_index]
+        if team.get("captain") == reg_number:
+            return f'Player is the captain of team "{team.get("team_name")}"'
+        if any(team.get("team_name") in (match.get("teams") or []) for match in matches):
+            return f'Team "{team.get("team_name")}" has match history'
+        team["players"] = [player for player in team.get("players") or [] if player != reg_number]
+        if not team.get("players"):
+            teams.pop(team_index)
+        return None
+    if reg_number in (sport_doc.get("players_participated") or []):
+        if any(reg_number in (match.get("players") or []) for match in matches):
+            return "Player has match history"
+        sport_doc["players_participated"] = [
+            player for player in sport_doc.get("players_participated") or [] if player != reg_number
+        ]
+        return None
+    return "Player is not registered for this sport"
+
+
 @router.get("/participants/{sport}")
 async def get_participants(
     sport: str,
@@ -99,6 +140,34 @@ async def get_participants_count(
     return send_success_response({"sport": sport, "count": count})
 
 
+@router.post("/participations/lookup")
+async def lookup_participations(request: Request):
+    body = await request.json()
+    reg_numbers = body.get("reg_numbers")
+    if not isinstance(reg_numbers, list):
+        return send_error_response(400, "reg_numbers must be an array")
+    reg_numbers = list(
+        dict.fromkeys(str(reg).strip() for reg in reg_numbers if str(reg or "").strip())
+    )
+    if len(reg_numbers) > MAX_LOOKUP_REG_NUMBERS:
+        return send_error_response(
+            400, f"reg_numbers cannot contain more than {MAX_LOOKUP_REG_NUMBERS} entries"
+        )
+
+    try:
+        event_year_data = await get_event_year(
+            body.get("event_id"), return_doc=True, token=get_request_token(request)
+        )
+    except Exception as exc:
+        if str(exc) in {"Event year not found", "No active event year found"}:
+            return send_success_response({"participations": {}})
+        raise
+
+    event_id = event_year_data.get("doc", {}).get("event_id")
+    participations = await lookup_participation(reg_numbers, event_id, body.get("rule"))
+    return send_success_response({"participations": participations})
+
+
 @router.get("/player-enrollments/{reg_number}")
 async def player_enrollments(
     reg_number: str,
@@ -152,21 +221,12 @@ async def player_enrollments(
                 {"sport": sport.get("name"), "category": sport.get("category")}
             )
 
-    non_team_event_names = [event["sport"] for event in non_team_events]
-    matches = []
-    for sport_name in non_team_event_names:
-        sport_matches = await get_matches_for_sport(
-            sport_name,
-            resolved_event_id,
-            token=request.state.token,
-        )
-        matches.extend(
-            [
-                match
-                for match in sport_matches
-                if reg_number in (match.get("players") or [])
-            ]
-        )
+    matches = await get_matches_for_sports(
+        [event["sport"] for event in non_team_events],
+        resolved_event_id,
+        reg_numbers=[reg_number],
+        token=request.state.token,
+    )
 
     all_matches = [
         {
@@ -206,7 +266,7 @@ async def update_participation(
     if not event_id or not str(event_id).strip():
         return send_error_response(400, "event_id is required")
 
-    event_year_data = await get_event_year(str(event_id).trim(), return_doc=True, token=token)
+    event_year_data = await get_event_year(str(event_id).strip(), return_doc=True, token=token)
     resolved_event_id = event_year_data.get("doc", {}).get("event_id")
 
     if not reg_number or not sport:
@@ -247,18 +307,18 @@ async def update_participation(
     sport_doc["players_participated"].append(reg_number)
     update_doc = {key: value for key, value in sport_doc.items() if key != "_id"}
     await sports_collection().update_one({"_id": sport_doc.get("_id")}, {"$set": update_doc})
+    await refresh_sport_participation(sport_doc)
 
-    cache.clear(f"/sports-participations/sports?event_id={quote(str(resolved_event_id))}")
-    cache.clear(f"/sports-participations/sports/{sport}?event_id={quote(str(resolved_event_id))}")
-    cache.clear(
+    await cache.clear(f"/sports-participations/sports?event_id={quote(str(resolved_event_id))}")
+    await cache.clear(f"/sports-participations/sports/{sport}?event_id={quote(str(resolved_event_id))}")
+    await cache.clear(
         f"/sports-participations/participants/{sport}?event_id={quote(str(resolved_event_id))}"
     )
-    cache.clear(
+    await cache.clear(
         f"/sports-participations/participants-count/{sport}?event_id={quote(str(resolved_event_id))}"
     )
-    cache.clear(f"/sports-participations/sports-counts?event_id={quote(str(resolved_event_id))}")
-    cache.clear_pattern("/identities/players")
-    cache.clear_pattern("/identities/me")
+    await cache.clear(f"/sports-participations/sports-counts?event_id={quote(str(resolved_event_id))}")
+    await event_bus.publish(PARTICIPATION_CHANGED, {"event_id": resolved_event_id, "sport": sport})
 
     return send_success_response(
         {"sport": serialize_sport(sport_doc)},
@@ -281,7 +341,7 @@ async def remove_participation(
     if not event_id or not str(event_id).strip():
         return send_error_response(400, "event_id is required")
 
-    event_year_data = await get_event_year(str(event_id).trim(), return_doc=True, token=token)
+    event_year_data = await get_event_year(str(event_id).strip(), return_doc=True, token=token)
     resolved_event_id = event_year_data.get("doc", {}).get("event_id")
 
     try:
@@ -364,22 +424,131 @@ async def remove_participation(
 
     update_doc = {key: value for key, value in sport_doc.items() if key != "_id"}
     await sports_collection().update_one({"_id": sport_doc.get("_id")}, {"$set": update_doc})
+    await refresh_sport_participation(sport_doc)
 
-    cache.clear(f"/sports-participations/sports?event_id={quote(str(resolved_event_id))}")
-    cache.clear(f"/sports-participations/sports/{sport}?event_id={quote(str(resolved_event_id))}")
-    cache.clear(
-        f"/sports-participations/teams/{sport}?event_id={quote(str(resolved_event_id))}"
+    await cache.clear(f"/sports-participations/sports?event_id={quote(str(resolved_event_id))}")
+    await cache.clear(f"/sports-participations/sports/{sport}?event_id={quote(str(resolved_event_id))}")
+    await cache.clear(
+        f"/sports-participations/teams/{normalize_sport_name(sport)}?event_id={quote(str(resolved_event_id))}"
     )
-    cache.clear(
+    await cache.clear(
         f"/sports-participations/participants/{sport}?event_id={quote(str(resolved_event_id))}"
     )
-    cache.clear(
+    await cache.clear(
         f"/sports-participations/participants-count/{sport}?event_id={quote(str(resolved_event_id))}"
     )
-    cache.clear(f"/sports-participations/sports-counts?event_id={quote(str(resolved_event_id))}")
-    cache.clear_pattern("/identities/players")
-    cache.clear_pattern("/identities/me")
+    await cache.clear(f"/sports-participations/sports-counts?event_id={quote(str(resolved_event_id))}")
+    await event_bus.publish(PARTICIPATION_CHANGED, {"event_id": resolved_event_id, "sport": sport})
 
     return send_success_response(
         {"sport": serialize_sport(sport_doc)}, f"Participation removed successfully for {sport}"
     )
+
+
+@router.post("/bulk-remove-participation")
+async def bulk_remove_participation(
+    request: Request,
+    _: None = Depends(auth_dependency),
+    __: None = Depends(admin_dependency),
+    ___: None = Depends(require_registration_period),
+):
+    body = trim_object_fields(await request.json())
+    removals = body.get("removals")
+    event_id = body.get("event_id")
+    token = get_request_token(request)
+
+    if not event_id or not str(event_id).strip():
+        return send_error_response(400, "event_id is required")
+    if not isinstance(removals, list) or len(removals) == 0:
+        return send_error_response(400, "removals must be a non-empty array")
+    if len(removals) > MAX_BULK_REMOVALS:
+        return send_error_response(400, f"Maximum {MAX_BULK_REMOVALS} removals can be processed at a time")
+    if any(
+        not isinstance(item, dict) or not str(item.get("reg_number") or "").strip() or not item.get("sport")
+        for item in removals
+    ):
+        return send_error_response(400, "Registration number and sport are required for every removal")
+
+    event_year_data = await get_event_year(str(event_id).strip(), return_doc=True, token=token)
+    resolved_event_id = event_year_data.get("doc", {}).get("event_id")
+
+    reg_numbers_by_sport: Dict[str, List[str]] = {}
+    for item in removals:
+        reg_number = str(item["reg_number"]).strip()
+        reg_numbers = reg_numbers_by_sport.setdefault(normalize_sport_name(item["sport"]), [])
+        if reg_number not in reg_numbers:
+            reg_numbers.append(reg_number)
+
+    sport_docs = {
+        sport_doc.get("name"): sport_doc
+        for sport_doc in await sports_collection()
+        .find({"event_id": resolved_event_id, "name": {"$in": list(reg_numbers_by_sport)}})
+        .to_list(length=None)
+    }
+    matches_by_sport: Dict[str, List[Dict[str, Any]]] = {}
+    for match in await get_matches_for_sports(list(sport_docs), resolved_event_id, token=token):
+        matches_by_sport.setdefault(match.get("sports_name"), []).append(match)
+
+    failures = []
+    for sport, reg_numbers in reg_numbers_by_sport.items():
+        sport_doc = sport_docs.get(sport)
+        for reg_number in reg_numbers:
+            error = (
+                _remove_player_from_sport(sport_doc, reg_number, matches_by_sport.get(sport, []))
+                if sport_doc
+                else "Sport not found"
+            )
+            if error:
+                failures.append({"reg_number": reg_number, "sport": sport, "error": error})
+
+    if failures:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "success": False,
+                "error": "Some participations cannot be removed",
+                "failures": failures,
+                "totalFailed": len(failures),
+                "totalRequested": sum(len(reg_numbers) for reg_numbers in reg_numbers_by_sport.values()),
+            },
+        )
+
+    operations: List[Any] = []
+    for sport, sport_doc in sport_docs.items():
+        reg_numbers = reg_numbers_by_sport[sport]
+        operations.extend(
+            [
+                UpdateOne(
+                    {"_id": sport_doc.get("_id"), "players_participated": {"$in": reg_numbers}},
+                    {"$pull": {"players_participated": {"$in": reg_numbers}}},
+                ),
+                UpdateOne(
+                    {"_id": sport_doc.get("_id"), "teams_participated.players": {"$in": reg_numbers}},
+                    {"$pull": {"teams_participated.$[].players": {"$in": reg_numbers}}},
+                ),
+                UpdateOne(
+                    {"_id": sport_doc.get("_id"), "teams_participated.players": {"$size": 0}},
+                    {"$pull": {"teams_participated": {"players": {"$size": 0}}}},
+                ),
+            ]
+        )
+    await sports_collection().bulk_write(operations)
+    updated_sport_docs = await sports_collection().find(
+        {"_id": {"$in": [sport_doc.get("_id") for sport_doc in sport_docs.values()]}}
+    ).to_list(length=None)
+    await asyncio.gather(*(refresh_sport_participation(sport_doc) for sport_doc in updated_sport_docs))
+
+    encoded_event_id = quote(str(resolved_event_id))
+    await cache.clear(f"/sports-participations/sports?event_id={encoded_event_id}")
+    await cache.clear(f"/sports-participations/sports-counts?event_id={encoded_event_id}")
+    for sport in sport_docs:
+        await cache.clear(f"/sports-participations/sports/{sport}?event_id={encoded_event_id}")
+        await cache.clear(f"/sports-participations/teams/{sport}?event_id={encoded_event_id}")
+        await cache.clear(f"/sports-participations/participants/{sport}?event_id={encoded_event_id}")
+        await cache.clear(f"/sports-participations/participants-count/{sport}?event_id={encoded_event_id}")
+        await event_bus.publish(PARTICIPATION_CHANGED, {"event_id": resolved_event_id, "sport": sport})
+
+    return send_success_response(
+        {"removed": {sport: reg_numbers for sport, reg_numbers in reg_numbers_by_sport.items()}},
+        "Participations removed successfully",
+    )
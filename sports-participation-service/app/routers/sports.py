@@ -12,11 +12,14 @@ from ..cache import cache
 from ..date_restrictions import require_registration_period
 from ..db import sports_collection
 from ..errors import send_error_response, send_success_response
+from ..event_bus import SPORT_CHANGED, event_bus
 from ..external_services import (
     get_event_year,
     get_matches_for_sport,
     get_points_table_entries,
 )
+from ..http_cache import conditional_etag, with_etag
+from ..participation_index import drop_sport_participation, refresh_sport_participation
 from ..sport_helpers import (
     find_sport_by_name_and_id,
     is_team_sport_type,
@@ -44,6 +47,12 @@ def _parse_object_id(value: str) -> Optional[ObjectId]:
         return None
 
 
+async def _load_sports(event_id: Any) -> List[Dict[str, Any]]:
+    cursor = sports_collection().find({"event_id": event_id}).sort([("category", 1), ("name", 1)])
+    sports = await cursor.to_list(length=None)
+    return [_serialize_sport(sport) for sport in sports]
+
+
 @router.get("/sports")
 async def get_sports(request: Request):
     event_id_query = request.query_params.get("event_id")
@@ -57,15 +66,11 @@ async def get_sports(request: Request):
 
     event_id = event_year_data.get("doc", {}).get("event_id")
     cache_key = f"/sports-participations/sports?event_id={quote(str(event_id))}"
-    cached = cache.get(cache_key)
-    if cached:
-        return JSONResponse(content=cached)
-
-    cursor = sports_collection().find({"event_id": event_id}).sort([("category", 1), ("name", 1)])
-    sports = await cursor.to_list(length=None)
-    serialized = [_serialize_sport(sport) for sport in sports]
-    cache.set(cache_key, serialized)
-    return JSONResponse(content=serialized)
+    etag, not_modified = await conditional_etag(request, cache_key)
+    if not_modified is not None:
+        return not_modified
+    serialized = await cache.get_or_load(cache_key, lambda: _load_sports(event_id))
+    return with_etag(JSONResponse(content=serialized), etag)
 
 
 @router.post("/sports")
@@ -142,8 +147,7 @@ async def create_sport(
     insert_result = await sports_collection().insert_one(sport_doc)
     sport_doc["_id"] = insert_result.inserted_id
 
-    cache.clear_pattern("/sports-participations/sports")
-    cache.clear_pattern("/sports-participations/sports-counts")
+    await cache.invalidate_tags("/sports-participations/sports", "/sports-participations/sports-counts")
 
     return send_success_response(
         {"sport": _serialize_sport(sport_doc)},
@@ -247,9 +251,13 @@ async def update_sport(
     update_doc = {key: value for key, value in sport_doc.items() if key != "_id"}
     await sports_collection().update_one({"_id": object_id}, {"$set": update_doc})
     updated = await sports_collection().find_one({"_id": object_id})
+    if updated:
+        await refresh_sport_participation(updated)
 
-    cache.clear_pattern("/sports-participations/sports")
-    cache.clear_pattern("/sports-participations/sports-counts")
+    await cache.invalidate_tags("/sports-participations/sports", "/sports-participations/sports-counts")
+    await event_bus.publish(
+        SPORT_CHANGED, {"event_id": sport_doc.get("event_id"), "sport": sport_doc.get("name")}
+    )
 
     return send_success_response(
         {"sport": _serialize_sport(updated)},
@@ -330,13 +338,31 @@ async def delete_sport(
         )
 
     await sports_collection().delete_one({"_id": object_id})
+    await drop_sport_participation(object_id)
 
-    cache.clear_pattern("/sports-participations/sports")
-    cache.clear_pattern("/sports-participations/sports-counts")
+    await cache.invalidate_tags("/sports-participations/sports", "/sports-participations/sports-counts")
+    await event_bus.publish(
+        SPORT_CHANGED, {"event_id": sport_doc.get("event_id"), "sport": sport_doc.get("name")}
+    )
 
     return send_success_response({}, "Sport deleted successfully")
 
 
+async def _load_sports_counts(event_id: Any) -> Dict[str, Any]:
+    sports = await sports_collection().find({"event_id": event_id}).to_list(length=None)
+    teams_counts: Dict[str, int] = {}
+    participants_counts: Dict[str, int] = {}
+    for sport in sports:
+        if sport.get("type") in {"dual_team", "multi_team"}:
+            teams_counts[sport.get("name")] = len(sport.get("teams_participated") or [])
+        else:
+            participants_counts[sport.get("name")] = len(
+                sport.get("players_participated") or []
+            )
+
+    return {"teams_counts": teams_counts, "participants_counts": participants_counts}
+
+
 @router.get("/sports-counts")
 async def get_sports_counts(
     request: Request,
@@ -353,24 +379,11 @@ async def get_sports_counts(
 
     event_id = event_year_data.get("doc", {}).get("event_id")
     cache_key = f"/sports-participations/sports-counts?event_id={quote(str(event_id))}"
-    cached = cache.get(cache_key)
-    if cached:
-        return JSONResponse(content=cached)
-
-    sports = await sports_collection().find({"event_id": event_id}).to_list(length=None)
-    teams_counts: Dict[str, int] = {}
-    participants_counts: Dict[str, int] = {}
-    for sport in sports:
-        if sport.get("type") in {"dual_team", "multi_team"}:
-            teams_counts[sport.get("name")] = len(sport.get("teams_participated") or [])
-        else:
-            participants_counts[sport.get("name")] = len(
-                sport.get("players_participated") or []
-            )
-
-    result = {"teams_counts": teams_counts, "participants_counts": participants_counts}
-    cache.set(cache_key, result)
-    return JSONResponse(content=result)
+    etag, not_modified = await conditional_etag(request, cache_key)
+    if not_modified is not None:
+        return not_modified
+    result = await cache.get_or_load(cache_key, lambda: _load_sports_counts(event_id))
+    return with_etag(JSONResponse(content=result), etag)
 
 
 @router.get("/sports/{name}")
@@ -1,5 +1,5 @@
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from urllib.parse import quote, unquote
 
 from fastapi import APIRouter, Depends, Request
@@ -16,6 +16,7 @@ from ..errors import (
     send_error_response,
     send_success_response,
 )
+from ..event_bus import PARTICIPATION_CHANGED, event_bus
 from ..external_services import (
     fetch_player,
     fetch_players_by_reg_numbers,
@@ -23,6 +24,8 @@ from ..external_services import (
     get_matches_for_sport,
 )
 from ..gender_helpers import clear_team_gender_cache
+from ..http_cache import conditional_etag, with_etag
+from ..participation_index import refresh_sport_participation
 from ..player_helpers import serialize_player
 from ..sport_helpers import find_sport_by_name_and_id, normalize_sport_name
 from ..validators import trim_object_fields
@@ -235,15 +238,15 @@ async def update_team_participation(
     sport_doc["teams_participated"] = teams_participated
     update_doc = {key: value for key, value in sport_doc.items() if key != "_id"}
     await sports_collection().update_one({"_id": sport_doc.get("_id")}, {"$set": update_doc})
+    await refresh_sport_participation(sport_doc)
 
-    cache.clear(f"/sports-participations/sports?event_id={quote(str(resolved_event_id))}")
-    cache.clear(f"/sports-participations/sports/{sport}?event_id={quote(str(resolved_event_id))}")
-    cache.clear(f"/sports-participations/teams/{sport}?event_id={quote(str(resolved_event_id))}")
-    cache.clear(
+    await cache.clear(f"/sports-participations/sports?event_id={quote(str(resolved_event_id))}")
+    await cache.clear(f"/sports-participations/sports/{sport}?event_id={quote(str(resolved_event_id))}")
+    await cache.clear(f"/sports-participations/teams/{normalize_sport_name(sport)}?event_id={quote(str(resolved_event_id))}")
+    await cache.clear(
         f"/sports-participations/sports-counts?event_id={quote(str(resolved_event_id))}"
     )
-    cache.clear_pattern("/identities/players")
-    cache.clear_pattern("/identities/me")
+    await event_bus.publish(PARTICIPATION_CHANGED, {"event_id": resolved_event_id, "sport": sport})
     clear_team_gender_cache(team_name, sport, resolved_event_id)
 
     return send_success_response(
@@ -252,36 +255,12 @@ async def update_team_participation(
     )
 
 
-@router.get("/teams/{sport}")
-async def get_teams(
-    sport: str,
-    request: Request,
-    _: None = Depends(auth_dependency),
-):
-    sport = unquote(sport or "")
-    if not sport:
-        return send_error_response(400, "Sport name is required")
-
-    event_id_query = request.query_params.get("event_id")
-    try:
-        token = get_request_token(request)
-        event_year_data = await get_event_year(event_id_query, return_doc=True, token=token)
-    except Exception as exc:
-        if str(exc) in {"Event year not found", "No active event year found"}:
-            return send_success_response({"sport": sport, "teams": [], "total_teams": 0})
-        raise
-
-    resolved_event_id = event_year_data.get("doc", {}).get("event_id")
-    cache_key = f"/sports-participations/teams/{sport}?event_id={quote(str(resolved_event_id))}"
-    cached = cache.get(cache_key)
-    if cached:
-        return send_success_response(cached)
-
+async def _load_teams(sport: str, resolved_event_id: Any, token: str) -> Optional[Dict[str, Any]]:
     try:
         sport_doc = await find_sport_by_name_and_id(sport, resolved_event_id)
     except Exception as exc:
         if "not found" in str(exc):
-            return send_success_response({"sport": sport, "teams": [], "total_teams": 0})
+            return None
         raise
 
     all_reg_numbers = set()
@@ -292,7 +271,7 @@ async def get_teams(
     players_list = await fetch_players_by_reg_numbers(
         list(all_reg_numbers),
         event_id=resolved_event_id,
-        token=request.state.token,
+        token=token,
     )
     players_map = {player.get("reg_number"): player for player in players_list}
 
@@ -333,9 +312,39 @@ async def get_teams(
 
     teams.sort(key=lambda item: (item.get("team_name") or "").lower())
 
-    result = {"sport": sport, "teams": teams, "total_teams": len(teams)}
-    cache.set(cache_key, result)
-    return send_success_response(result)
+    return {"sport": sport, "teams": teams, "total_teams": len(teams)}
+
+
+@router.get("/teams/{sport}")
+async def get_teams(
+    sport: str,
+    request: Request,
+    _: None = Depends(auth_dependency),
+):
+    sport = unquote(sport or "")
+    if not sport:
+        return send_error_response(400, "Sport name is required")
+
+    event_id_query = request.query_params.get("event_id")
+    try:
+        token = get_request_token(request)
+        event_year_data = await get_event_year(event_id_query, return_doc=True, token=token)
+    except Exception as exc:
+        if str(exc) in {"Event year not found", "No active event year found"}:
+            return send_success_response({"sport": sport, "teams": [], "total_teams": 0})
+        raise
+
+    resolved_event_id = event_year_data.get("doc", {}).get("event_id")
+    cache_key = f"/sports-participations/teams/{normalize_sport_name(sport)}?event_id={quote(str(resolved_event_id))}"
+    etag, not_modified = await conditional_etag(request, cache_key)
+    if not_modified is not None:
+        return not_modified
+    result = await cache.get_or_load(
+        cache_key, lambda: _load_teams(sport, resolved_event_id, token)
+    )
+    if result is None:
+        return send_success_response({"sport": sport, "teams": [], "total_teams": 0})
+    return with_etag(send_success_response(result), etag)
 
 
 @router.post("/update-team-player")
@@ -493,15 +502,15 @@ async def update_team_player(
     team["players"][player_index] = new_reg_number
     update_doc = {key: value for key, value in sport_doc.items() if key != "_id"}
     await sports_collection().update_one({"_id": sport_doc.get("_id")}, {"$set": update_doc})
+    await refresh_sport_participation(sport_doc)
 
-    cache.clear(f"/sports-participations/sports?event_id={quote(str(resolved_event_id))}")
-    cache.clear(f"/sports-participations/sports/{sport}?event_id={quote(str(resolved_event_id))}")
-    cache.clear(f"/sports-participations/teams/{sport}?event_id={quote(str(resolved_event_id))}")
-    cache.clear(
+    await cache.clear(f"/sports-participations/sports?event_id={quote(str(resolved_event_id))}")
+    await cache.clear(f"/sports-participations/sports/{sport}?event_id={quote(str(resolved_event_id))}")
+    await cache.clear(f"/sports-participations/teams/{normalize_sport_name(sport)}?event_id={quote(str(resolved_event_id))}")
+    await cache.clear(
         f"/sports-participations/sports-counts?event_id={quote(str(resolved_event_id))}"
     )
-    cache.clear_pattern("/identities/players")
-    cache.clear_pattern("/identities/me")
+    await event_bus.publish(PARTICIPATION_CHANGED, {"event_id": resolved_event_id, "sport": sport})
     clear_team_gender_cache(team_name, sport, resolved_event_id)
 
     new_player_data = serialize_player(new_player)
@@ -596,15 +605,15 @@ async def delete_team(
     sport_doc["teams_participated"].pop(team_index)
     update_doc = {key: value for key, value in sport_doc.items() if key != "_id"}
     await sports_collection().update_one({"_id": sport_doc.get("_id")}, {"$set": update_doc})
+    await refresh_sport_participation(sport_doc)
 
-    cache.clear(f"/sports-participations/sports?event_id={quote(str(resolved_event_id))}")
-    cache.clear(f"/sports-participations/sports/{sport}?event_id={quote(str(resolved_event_id))}")
-    cache.clear(f"/sports-participations/teams/{sport}?event_id={quote(str(resolved_event_id))}")
-    cache.clear(
+    await cache.clear(f"/sports-participations/sports?event_id={quote(str(resolved_event_id))}")
+    await cache.clear(f"/sports-participations/sports/{sport}?event_id={quote(str(resolved_event_id))}")
+    await cache.clear(f"/sports-participations/teams/{normalize_sport_name(sport)}?event_id={quote(str(resolved_event_id))}")
+    await cache.clear(
         f"/sports-participations/sports-counts?event_id={quote(str(resolved_event_id))}"
     )
-    cache.clear_pattern("/identities/players")
-    cache.clear_pattern("/identities/me")
+    await event_bus.publish(PARTICIPATION_CHANGED, {"event_id": resolved_event_id, "sport": sport})
     clear_team_gender_cache(team_name, sport, resolved_event_id)
 
     return send_success_response(